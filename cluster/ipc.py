@@ -0,0 +1,455 @@
+import asyncio
+
+import hmac
+
+import itertools
+
+import json
+
+import logging
+
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from settings.settings import (
+    IPC_HOST,
+    IPC_PORT,
+    IPC_SECRET,
+    IPC_TIMEOUT_SECONDS,
+)
+
+STREAM_LIMIT = 2 ** 20
+
+Handler = Callable[[Dict[str, Any]], Awaitable[Any]]
+
+
+async def send_message(
+    writer: asyncio.StreamWriter,
+    message: Dict[str, Any]
+) -> None:
+    """
+    Send a JSON message as a single line.
+
+    Args:
+        writer (asyncio.StreamWriter): The stream to write to.
+        message (Dict[str, Any]): The message.
+    """
+    writer.write(json.dumps(message).encode() + b'\n')
+    await writer.drain()
+
+
+async def read_message(
+    reader: asyncio.StreamReader
+) -> Optional[Dict[str, Any]]:
+    """
+    Read a JSON message sent by `send_message`.
+
+    Args:
+        reader (asyncio.StreamReader): The stream to read from.
+
+    Returns:
+        Optional[Dict[str, Any]]: The message, None if the stream
+        is closed.
+    """
+    line = await reader.readline()
+    if not line:
+        return None
+    return json.loads(line)
+
+
+class IPCHub:
+    """
+    Local IPC server run by the cluster launcher.
+
+    A request of one cluster is forwarded to every connected cluster,
+    including the sender, and their replies are returned together.
+
+    Protocol, one JSON object per line:
+        hello: {"type": "hello", "cluster_id", "secret"}, sent first.
+        request: {"type": "request", "id", "action", "payload",
+        "timeout"}, answered with {"type": "response", "id", "results"},
+        results are keyed by cluster ID. The optional timeout
+        overrides the hub's for the calls of this request.
+        call: {"type": "call", "id", "action", "payload"},
+        sent by the hub, answered with {"type": "reply", "id", "data"}
+        or {"type": "reply", "id", "error"}.
+
+    Attributes:
+        secret (str): Secret the clusters authenticate with.
+        timeout (float): Seconds to wait for the clusters' replies.
+        _clusters (Dict[int, asyncio.StreamWriter]): Connected clusters.
+        _calls (Dict[int, asyncio.Future]): Replies awaited
+        by the hub, keyed by call ID.
+        _call_ids (itertools.count): Call ID generator.
+        _server (Optional[asyncio.AbstractServer]): The server.
+    """
+
+    def __init__(
+        self,
+        secret: str,
+        timeout: float = IPC_TIMEOUT_SECONDS
+    ) -> None:
+        """
+        Initialize the IPCHub.
+
+        Args:
+            secret (str): Secret the clusters authenticate with.
+            timeout (float): Seconds to wait for the clusters' replies.
+        """
+        self.secret = secret
+        self.timeout = timeout
+        self._clusters: Dict[int, asyncio.StreamWriter] = {}
+        self._calls: Dict[int, asyncio.Future] = {}
+        self._call_ids = itertools.count()
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    async def start(self, host: str = IPC_HOST, port: int = IPC_PORT) -> None:
+        """
+        Start listening for clusters.
+
+        Args:
+            host (str): Host to listen on, a loopback address.
+            port (int): Port to listen on.
+        """
+        self._server = await asyncio.start_server(
+            self._handle_cluster,
+            host=host,
+            port=port,
+            limit=STREAM_LIMIT
+        )
+        logging.info(f'[IPC] Hub is listening on {host}:{port}')
+
+    async def close(self) -> None:
+        """
+        Disconnect the clusters and stop the server.
+        """
+        for writer in self._clusters.values():
+            writer.close()
+        if self._server:
+            self._server.close()
+            await self._server.wait_closed()
+
+    async def _call(
+        self,
+        cluster_id: int,
+        writer: asyncio.StreamWriter,
+        action: str,
+        payload: Dict[str, Any],
+        timeout: float
+    ) -> Dict[str, Any]:
+        """
+        Call an action on a cluster and wait for its reply.
+
+        Args:
+            cluster_id (int): ID of the cluster.
+            writer (asyncio.StreamWriter): Stream of the cluster.
+            action (str): The action.
+            payload (Dict[str, Any]): The action's arguments.
+            timeout (float): Seconds to wait for the reply.
+
+        Returns:
+            Dict[str, Any]: The reply, with an error if the cluster
+            did not answer in time.
+        """
+        call_id = next(self._call_ids)
+        future = asyncio.get_running_loop().create_future()
+        self._calls[call_id] = future
+        try:
+            await send_message(writer, {
+                'type': 'call',
+                'id': call_id,
+                'action': action,
+                'payload': payload,
+            })
+            return await asyncio.wait_for(future, timeout=timeout)
+        except (asyncio.TimeoutError, ConnectionError) as error:
+            logging.warning(
+                f'[IPC] Cluster {cluster_id} did not answer {action}: '
+                f'{error!r}'
+            )
+            return {'error': repr(error)}
+        finally:
+            self._calls.pop(call_id, None)
+
+    async def _handle_request(
+        self,
+        writer: asyncio.StreamWriter,
+        message: Dict[str, Any]
+    ) -> None:
+        """
+        Forward a request to every cluster and return their replies.
+
+        Args:
+            writer (asyncio.StreamWriter): Stream of the requesting
+            cluster.
+            message (Dict[str, Any]): The request.
+        """
+        clusters = dict(self._clusters)
+        replies = await asyncio.gather(*(
+            self._call(
+                cluster_id=cluster_id,
+                writer=cluster_writer,
+                action=message['action'],
+                payload=message.get('payload') or {},
+                timeout=message.get('timeout') or self.timeout
+            )
+            for cluster_id, cluster_writer in clusters.items()
+        ))
+        try:
+            await send_message(writer, {
+                'type': 'response',
+                'id': message['id'],
+                'results': dict(zip(clusters, replies)),
+            })
+        except ConnectionError:
+            pass
+
+    async def _handle_cluster(
+        self,
+        reader: asyncio.StreamReader,
+        writer: asyncio.StreamWriter
+    ) -> None:
+        """
+        Serve a connected cluster.
+
+        Args:
+            reader (asyncio.StreamReader): Stream from the cluster.
+            writer (asyncio.StreamWriter): Stream to the cluster.
+        """
+        try:
+            hello = await asyncio.wait_for(
+                read_message(reader),
+                timeout=self.timeout
+            )
+        except (asyncio.TimeoutError, ValueError, ConnectionError):
+            hello = None
+        if (
+            not hello
+            or hello.get('type') != 'hello'
+            or not hmac.compare_digest(
+                str(hello.get('secret')),
+                self.secret
+            )
+        ):
+            logging.warning('[IPC] Rejected a connection')
+            writer.close()
+            return
+
+        cluster_id = int(hello['cluster_id'])
+        self._clusters[cluster_id] = writer
+        logging.info(f'[IPC] Cluster {cluster_id} connected')
+
+        tasks = set()
+        try:
+            while message := await read_message(reader):
+                if message['type'] == 'reply':
+                    future = self._calls.get(message['id'])
+                    if future and not future.done():
+                        future.set_result({
+                            key: message[key]
+                            for key in ('data', 'error')
+                            if key in message
+                        })
+                elif message['type'] == 'request':
+                    task = asyncio.create_task(
+                        self._handle_request(writer, message)
+                    )
+                    tasks.add(task)
+                    task.add_done_callback(tasks.discard)
+        except (ConnectionError, ValueError) as error:
+            logging.warning(f'[IPC] Cluster {cluster_id} failed: {error!r}')
+        finally:
+            if self._clusters.get(cluster_id) is writer:
+                del self._clusters[cluster_id]
+            writer.close()
+            logging.info(f'[IPC] Cluster {cluster_id} disconnected')
+
+
+class IPCClient:
+    """
+    Connection of a cluster to the launcher's IPC hub.
+
+    Attributes:
+        cluster_id (int): ID of this cluster.
+        host (str): Host of the hub.
+        port (int): Port of the hub.
+        secret (str): Secret to authenticate with.
+        timeout (float): Seconds to wait for a response.
+        _handlers (Dict[str, Handler]): Action handlers.
+        _requests (Dict[int, asyncio.Future]): Awaited responses
+        keyed by request ID.
+        _request_ids (itertools.count): Request ID generator.
+        _reader (Optional[asyncio.StreamReader]): Stream from the hub.
+        _writer (Optional[asyncio.StreamWriter]): Stream to the hub.
+        _read_task (Optional[asyncio.Task]): Task reading from the hub.
+        _tasks (set): Running action handlers.
+    """
+
+    def __init__(
+        self,
+        cluster_id: int,
+        host: str = IPC_HOST,
+        port: int = IPC_PORT,
+        secret: Optional[str] = IPC_SECRET,
+        timeout: float = IPC_TIMEOUT_SECONDS
+    ) -> None:
+        """
+        Initialize the IPCClient.
+
+        Args:
+            cluster_id (int): ID of this cluster.
+            host (str): Host of the hub.
+            port (int): Port of the hub.
+            secret (Optional[str]): Secret to authenticate with.
+            timeout (float): Seconds to wait for a response.
+        """
+        self.cluster_id = cluster_id
+        self.host = host
+        self.port = port
+        self.secret = secret
+        self.timeout = timeout
+        self._handlers: Dict[str, Handler] = {}
+        self._requests: Dict[int, asyncio.Future] = {}
+        self._request_ids = itertools.count()
+        self._reader: Optional[asyncio.StreamReader] = None
+        self._writer: Optional[asyncio.StreamWriter] = None
+        self._read_task: Optional[asyncio.Task] = None
+        self._tasks = set()
+
+    def register(self, action: str, handler: Handler) -> None:
+        """
+        Register the handler of an action called by other clusters.
+
+        Args:
+            action (str): The action.
+            handler (Handler): Coroutine function receiving
+            the payload and returning JSON serializable data.
+        """
+        self._handlers[action] = handler
+
+    async def connect(self) -> None:
+        """
+        Connect to the hub and start serving the calls.
+
+        Raises:
+            OSError: If the hub is not reachable.
+        """
+        self._reader, self._writer = await asyncio.open_connection(
+            host=self.host,
+            port=self.port,
+            limit=STREAM_LIMIT
+        )
+        await send_message(self._writer, {
+            'type': 'hello',
+            'cluster_id': self.cluster_id,
+            'secret': self.secret,
+        })
+        self._read_task = asyncio.create_task(self._read())
+        logging.info(f'[IPC] Connected to {self.host}:{self.port}')
+
+    async def close(self) -> None:
+        """
+        Disconnect from the hub.
+        """
+        if self._read_task:
+            self._read_task.cancel()
+        if self._writer:
+            self._writer.close()
+
+    async def request(
+        self,
+        action: str,
+        payload: Optional[Dict[str, Any]] = None,
+        timeout: Optional[float] = None
+    ) -> Dict[int, Dict[str, Any]]:
+        """
+        Call an action on every cluster, including this one.
+
+        Args:
+            action (str): The action.
+            payload (Optional[Dict[str, Any]]): The action's arguments.
+            timeout (Optional[float]): Seconds the clusters have
+            to reply, the client's timeout if not given.
+
+        Returns:
+            Dict[int, Dict[str, Any]]: Replies keyed by cluster ID,
+            each with either data or an error.
+
+        Raises:
+            ConnectionError: If the client is not connected.
+            asyncio.TimeoutError: If the hub did not respond in time.
+        """
+        if self._writer is None or self._writer.is_closing():
+            raise ConnectionError('IPC client is not connected')
+
+        timeout = timeout or self.timeout
+        request_id = next(self._request_ids)
+        future = asyncio.get_running_loop().create_future()
+        self._requests[request_id] = future
+        try:
+            await send_message(self._writer, {
+                'type': 'request',
+                'id': request_id,
+                'action': action,
+                'payload': payload or {},
+                'timeout': timeout,
+            })
+            response = await asyncio.wait_for(future, timeout=timeout * 2)
+        finally:
+            self._requests.pop(request_id, None)
+
+        return {
+            int(cluster_id): result
+            for cluster_id, result in response['results'].items()
+        }
+
+    async def _handle_call(self, message: Dict[str, Any]) -> None:
+        """
+        Run a handler called by the hub and send its reply.
+
+        Args:
+            message (Dict[str, Any]): The call.
+        """
+        handler = self._handlers.get(message['action'])
+        if handler is None:
+            reply = {'error': f'Unknown action {message["action"]}'}
+        else:
+            try:
+                reply = {
+                    'data': await handler(message.get('payload') or {})
+                }
+            except Exception as error:
+                logging.exception(error)
+                reply = {'error': repr(error)}
+
+        try:
+            await send_message(self._writer, {
+                'type': 'reply',
+                'id': message['id'],
+                **reply,
+            })
+        except ConnectionError as error:
+            logging.warning(f'[IPC] Failed to reply: {error!r}')
+
+    async def _read(self) -> None:
+        """
+        Dispatch the messages sent by the hub.
+        """
+        try:
+            while message := await read_message(self._reader):
+                if message['type'] == 'response':
+                    future = self._requests.get(message['id'])
+                    if future and not future.done():
+                        future.set_result(message)
+                elif message['type'] == 'call':
+                    task = asyncio.create_task(self._handle_call(message))
+                    self._tasks.add(task)
+                    task.add_done_callback(self._tasks.discard)
+        except (ConnectionError, ValueError) as error:
+            logging.warning(f'[IPC] Connection to the hub failed: {error!r}')
+        finally:
+            logging.warning('[IPC] Disconnected from the hub')
+            for future in self._requests.values():
+                if not future.done():
+                    future.set_exception(
+                        ConnectionError('IPC hub disconnected')
+                    )
@@ -0,0 +1,268 @@
+"""
+Cluster launcher running the bot in several processes.
+
+Splits the shards into contiguous ranges, starts one worker process
+per range and runs the local IPC hub the workers talk through.
+Workers that exit unexpectedly are restarted.
+
+Usage (from the repository root):
+    python -m cluster.launcher
+    python -m cluster.launcher --clusters 4 --shards 16
+"""
+import argparse
+
+import asyncio
+
+import logging
+
+import os
+
+import secrets
+
+import signal
+
+import sys
+
+from typing import Dict, List, Optional
+
+import discord
+
+from tortoise import Tortoise
+
+from cluster.ipc import IPCHub
+
+from database.init import init
+
+from settings.settings import (
+    BOT_TOKEN,
+    SHARD_COUNT,
+    CLUSTER_COUNT,
+    IPC_HOST,
+    IPC_PORT,
+)
+
+RESTART_DELAY_SECONDS = 5
+
+
+def shard_ranges(shard_count: int, cluster_count: int) -> List[List[int]]:
+    """
+    Split the shards into contiguous ranges of nearly equal size.
+
+    Args:
+        shard_count (int): Total number of shards.
+        cluster_count (int): Number of clusters.
+
+    Returns:
+        List[List[int]]: Shard IDs of every cluster, clusters without
+        shards are left out.
+    """
+    cluster_count = max(1, min(cluster_count, shard_count))
+    size, extra = divmod(shard_count, cluster_count)
+    ranges = []
+    start = 0
+    for cluster_id in range(cluster_count):
+        end = start + size + (1 if cluster_id < extra else 0)
+        ranges.append(list(range(start, end)))
+        start = end
+    return ranges
+
+
+async def get_recommended_shard_count(token: str) -> int:
+    """
+    Ask Discord how many shards the bot should use.
+
+    Args:
+        token (str): The bot token.
+
+    Returns:
+        int: The recommended shard count.
+    """
+    http = discord.http.HTTPClient(asyncio.get_running_loop())
+    try:
+        await http.static_login(token)
+        shard_count, _ = await http.get_bot_gateway()
+    finally:
+        await http.close()
+    return shard_count
+
+
+async def prepare_database() -> None:
+    """
+    Check the schema version once before the workers start,
+    so an outdated database fails fast instead of in every worker.
+
+    Note:
+        The migrations are applied by the entrypoint
+        with `python -m database.init`, not by the launcher.
+
+    Raises:
+        SchemaVersionError: If the database is behind
+        the shipped migrations.
+    """
+    await init()
+    await Tortoise.close_connections()
+
+
+class ClusterLauncher:
+    """
+    Starts and supervises the worker processes.
+
+    Attributes:
+        shard_count (int): Total number of shards.
+        ranges (List[List[int]]): Shard IDs of every cluster.
+        secret (str): IPC secret shared with the workers.
+        hub (IPCHub): The IPC hub.
+        _processes (Dict[int, asyncio.subprocess.Process]): Running
+        workers keyed by cluster ID.
+        _stopping (asyncio.Event): Set when the launcher shuts down.
+    """
+
+    def __init__(self, shard_count: int, cluster_count: int) -> None:
+        """
+        Initialize the ClusterLauncher.
+
+        Args:
+            shard_count (int): Total number of shards.
+            cluster_count (int): Number of worker processes.
+        """
+        self.shard_count = shard_count
+        self.ranges = shard_ranges(shard_count, cluster_count)
+        self.secret = secrets.token_hex(32)
+        self.hub = IPCHub(secret=self.secret)
+        self._processes: Dict[int, asyncio.subprocess.Process] = {}
+        self._stopping = asyncio.Event()
+
+    def worker_env(self, cluster_id: int) -> Dict[str, str]:
+        """
+        Build the environment of a worker process.
+
+        Args:
+            cluster_id (int): ID of the worker's cluster.
+
+        Returns:
+            Dict[str, str]: The environment.
+        """
+        return {
+            **os.environ,
+            'SHARD_COUNT': str(self.shard_count),
+            'SHARD_IDS': ','.join(map(str, self.ranges[cluster_id])),
+            'CLUSTER_ID': str(cluster_id),
+            'CLUSTER_COUNT': str(len(self.ranges)),
+            'IPC_HOST': IPC_HOST,
+            'IPC_PORT': str(IPC_PORT),
+            'IPC_SECRET': self.secret,
+        }
+
+    async def supervise(self, cluster_id: int) -> None:
+        """
+        Run a worker and restart it until the launcher stops.
+
+        Args:
+            cluster_id (int): ID of the worker's cluster.
+        """
+        while not self._stopping.is_set():
+            logging.info(
+                f'[Launcher] Starting cluster {cluster_id} '
+                f'with shards {self.ranges[cluster_id]}'
+            )
+            process = await asyncio.create_subprocess_exec(
+                sys.executable,
+                'main.py',
+                env=self.worker_env(cluster_id)
+            )
+            self._processes[cluster_id] = process
+            return_code = await process.wait()
+            del self._processes[cluster_id]
+
+            if self._stopping.is_set():
+                break
+            logging.error(
+                f'[Launcher] Cluster {cluster_id} exited with '
+                f'{return_code}, restarting in {RESTART_DELAY_SECONDS}s'
+            )
+            try:
+                await asyncio.wait_for(
+                    self._stopping.wait(),
+                    timeout=RESTART_DELAY_SECONDS
+                )
+            except asyncio.TimeoutError:
+                pass
+
+    def stop(self) -> None:
+        """
+        Stop restarting the workers and ask them to shut down.
+        """
+        self._stopping.set()
+        for process in self._processes.values():
+            if process.returncode is None:
+                process.terminate()
+
+    async def run(self) -> None:
+        """
+        Start the IPC hub and the workers, and wait for them to exit.
+        """
+        loop = asyncio.get_running_loop()
+        for signal_number in (signal.SIGTERM, signal.SIGINT):
+            loop.add_signal_handler(signal_number, self.stop)
+
+        await self.hub.start()
+        try:
+            await asyncio.gather(*(
+                self.supervise(cluster_id)
+                for cluster_id in range(len(self.ranges))
+            ))
+        finally:
+            await self.hub.close()
+
+
+def parse_args() -> argparse.Namespace:
+    """
+    Parse the command line arguments.
+
+    Returns:
+        argparse.Namespace: The arguments.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument(
+        '--clusters',
+        type=int,
+        default=CLUSTER_COUNT if CLUSTER_COUNT > 1 else os.cpu_count(),
+        help='Number of worker processes, the CPU count by default'
+    )
+    parser.add_argument(
+        '--shards',
+        type=int,
+        default=SHARD_COUNT,
+        help='Total number of shards, recommended by Discord by default'
+    )
+    return parser.parse_args()
+
+
+async def main() -> None:
+    """
+    Prepare the database and run the clusters.
+    """
+    args = parse_args()
+
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s [%(levelname)s]: %(message)s',
+        datefmt='%Y-%m-%d %H:%M:%S',
+    )
+
+    shard_count: Optional[int] = args.shards
+    if not shard_count:
+        shard_count = await get_recommended_shard_count(BOT_TOKEN)
+        logging.info(f'[Launcher] Discord recommends {shard_count} shards')
+
+    await prepare_database()
+
+    launcher = ClusterLauncher(
+        shard_count=shard_count,
+        cluster_count=args.clusters
+    )
+    await launcher.run()
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
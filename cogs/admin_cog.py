@@ -1,14 +1,27 @@
 import logging
 
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import discord
 from discord import app_commands, Interaction
 from discord.ext import commands
 
+from cogs.broadcast import broadcast, download_attachments, split_report
+from cogs.config import extensions
+from cogs.message_locator import MessageLocator
+
+from database.guild_config import guild_config_cache, parse_ids
+
 from error_handlers.errors import error_handler
 
 
 class AdminCog(commands.Cog):
     """
     A cog containing administrative commands.
+
+    Attributes:
+        bot (commands.Bot): The bot instance.
+        message_locator (MessageLocator): Finds messages by ID.
     """
 
     def __init__(self, bot: commands.Bot) -> None:
@@ -19,6 +32,83 @@ class AdminCog(commands.Cog):
             bot (commands.Bot): The bot instance.
         """
         self.bot = bot
+        self.message_locator = MessageLocator()
+
+    def export_state(self) -> Dict[str, Any]:
+        """
+        Hand off the live state before the cog is reloaded.
+
+        Returns:
+            Dict[str, Any]: The message locator with its cache.
+        """
+        return {'message_locator': self.message_locator}
+
+    def import_state(self, state: Dict[str, Any]) -> None:
+        """
+        Take over the live state of the reloaded cog.
+
+        Args:
+            state (Dict[str, Any]): The state from `export_state`.
+        """
+        self.message_locator = state['message_locator']
+
+    async def cog_load(self) -> None:
+        """
+        Take over the state handed off by a reload.
+        """
+        state = self.bot.handed_off_states.pop(self.qualified_name, None)
+        if state:
+            self.import_state(state)
+
+    async def find_message(
+        self,
+        guild: discord.Guild,
+        message_id: str,
+        search_channel_id: Optional[str] = None
+    ) -> Optional[discord.Message]:
+        """
+        Find a message of the guild by its ID.
+
+        Args:
+            guild (discord.Guild): The guild to search in.
+            message_id (str): The ID of the message.
+            search_channel_id (Optional[str]): The ID of a channel
+            to search first.
+
+        Returns:
+            Optional[discord.Message]: The message if found, else None.
+        """
+        return await self.message_locator.locate(
+            guild=guild,
+            message_id=int(message_id),
+            channel_hint_id=int(search_channel_id) if (
+                search_channel_id
+            ) else None
+        )
+
+    @commands.Cog.listener()
+    async def on_message(self, message: discord.Message) -> None:
+        """
+        Remembers the channel of every new guild message.
+
+        Args:
+            message (discord.Message): The message.
+        """
+        if message.guild:
+            self.message_locator.remember(message)
+
+    @commands.Cog.listener()
+    async def on_raw_message_delete(
+        self,
+        payload: discord.RawMessageDeleteEvent
+    ) -> None:
+        """
+        Forgets the channel of a deleted message.
+
+        Args:
+            payload (discord.RawMessageDeleteEvent): The event payload.
+        """
+        self.message_locator.forget(payload.message_id)
 
     @app_commands.command(
         name='send_message',
@@ -29,12 +119,15 @@ class AdminCog(commands.Cog):
         channel_id='Вставь сюда ID канала, куда отправить сообщение',
         message='[Опционально] Напиши сообщение, которое отправит бот',
         message_id='[Опционально] Вставь сюда ID сообщения, '
-        'которое бот должен переслать'
+        'которое бот должен переслать',
+        search_channel_id='[Опционально] Вставь сюда ID канала, '
+        'в котором находится пересылаемое сообщение'
     )
     @app_commands.rename(
         channel_id='id_канала',
         message='сообщение',
-        message_id='id_сообщения'
+        message_id='id_сообщения',
+        search_channel_id='id_канала_сообщения'
     )
     @commands.guild_only()
     @app_commands.checks.has_permissions(administrator=True)
@@ -43,7 +136,8 @@ class AdminCog(commands.Cog):
         interaction: Interaction,
         channel_id: str,
         message: str = None,
-        message_id: str = None
+        message_id: str = None,
+        search_channel_id: str = None
     ) -> None:
         """
         Command to send a message on behalf of the bot
@@ -56,6 +150,8 @@ class AdminCog(commands.Cog):
             Defaults to None.
             message_id (str, optional): The ID of the message
             to forward. Defaults to None.
+            search_channel_id (str, optional): The ID of the channel
+            to search the forwarded message in first. Defaults to None.
         """
         await interaction.response.defer(ephemeral=True)
 
@@ -71,18 +167,11 @@ class AdminCog(commands.Cog):
             channel = self.bot.get_channel(int(channel_id))
 
             if message_id:
-                found_message = None
-                for search_message in guild.text_channels:
-                    try:
-                        found_message = await search_message.fetch_message(
-                            int(message_id)
-                        )
-                        break
-                    except Exception as error:
-                        logging.info(
-                            f'[Searching message ID] '
-                            f'Nothing was found: {error}'
-                        )
+                found_message = await self.find_message(
+                    guild=guild,
+                    message_id=message_id,
+                    search_channel_id=search_channel_id
+                )
                 if not found_message:
                     await interaction.followup.send(
                         'Не удалось найти сообщение с указанным ID.'
@@ -124,6 +213,497 @@ class AdminCog(commands.Cog):
         """
         await error_handler(interaction, error)
 
+    def resolve_targets(
+        self,
+        guild: discord.Guild,
+        channels_id: Optional[str],
+        category_id: Optional[str]
+    ) -> Tuple[List[discord.TextChannel], List[str]]:
+        """
+        Resolve the broadcast target channels.
+
+        Args:
+            guild (discord.Guild): The guild of the channels.
+            channels_id (Optional[str]): Comma separated channel IDs.
+            category_id (Optional[str]): The ID of a category
+            whose text channels are targeted.
+
+        Returns:
+            Tuple[List[discord.TextChannel], List[str]]: The channels
+            without duplicates and the IDs that were not resolved.
+        """
+        targets = {}
+        unresolved = []
+
+        target_ids = [
+            target_id.strip()
+            for target_id in (channels_id or '').split(',')
+            if target_id.strip()
+        ]
+        for target_id in target_ids:
+            channel = (
+                guild.get_channel(int(target_id))
+                if target_id.isdigit() else None
+            )
+            if isinstance(channel, discord.TextChannel):
+                targets[channel.id] = channel
+            else:
+                unresolved.append(target_id)
+
+        if category_id:
+            category = guild.get_channel(int(category_id))
+            if isinstance(category, discord.CategoryChannel):
+                for channel in category.text_channels:
+                    targets[channel.id] = channel
+            else:
+                unresolved.append(category_id)
+
+        return list(targets.values()), unresolved
+
+    @app_commands.command(
+        name='broadcast_message',
+        description='[Админ-команда] Отправить сообщение '
+        'от имени бота в несколько каналов'
+    )
+    @app_commands.describe(
+        channels_id='[Опционально] Вставь сюда ID каналов через запятую',
+        category_id='[Опционально] Вставь сюда ID категории, '
+        'во все текстовые каналы которой отправить сообщение',
+        message='[Опционально] Напиши сообщение, которое отправит бот',
+        message_id='[Опционально] Вставь сюда ID сообщения, '
+        'которое бот должен переслать',
+        search_channel_id='[Опционально] Вставь сюда ID канала, '
+        'в котором находится пересылаемое сообщение'
+    )
+    @app_commands.rename(
+        channels_id='id_каналов',
+        category_id='id_категории',
+        message='сообщение',
+        message_id='id_сообщения',
+        search_channel_id='id_канала_сообщения'
+    )
+    @commands.guild_only()
+    @app_commands.checks.has_permissions(administrator=True)
+    async def broadcast_message(
+        self,
+        interaction: Interaction,
+        channels_id: str = None,
+        category_id: str = None,
+        message: str = None,
+        message_id: str = None,
+        search_channel_id: str = None
+    ) -> None:
+        """
+        Command to send a message on behalf of the bot
+        to several channels at once.
+
+        Note:
+            Attachments of the forwarded message are downloaded
+            once and sent to all the channels concurrently.
+            A report of the sends is returned to the admin.
+
+        Args:
+            interaction (Interaction): The interaction context.
+            channels_id (str, optional): Comma separated IDs
+            of the channels. Defaults to None.
+            category_id (str, optional): The ID of the category
+            whose text channels receive the message. Defaults to None.
+            message (str, optional): The message content to send.
+            Defaults to None.
+            message_id (str, optional): The ID of the message
+            to forward. Defaults to None.
+            search_channel_id (str, optional): The ID of the channel
+            to search the forwarded message in first. Defaults to None.
+        """
+        await interaction.response.defer(ephemeral=True)
+
+        if not message and not message_id:
+            await interaction.followup.send(
+                'Необходимо ввести сообщение или указать ID сообщения.'
+            )
+            return
+
+        if not channels_id and not category_id:
+            await interaction.followup.send(
+                'Необходимо указать ID каналов или ID категории.'
+            )
+            return
+
+        try:
+            guild = interaction.guild
+            channels, unresolved = self.resolve_targets(
+                guild=guild,
+                channels_id=channels_id,
+                category_id=category_id
+            )
+            if not channels:
+                await interaction.followup.send(
+                    'Не удалось найти ни одного канала для отправки.'
+                )
+                return
+
+            if message_id:
+                found_message = await self.find_message(
+                    guild=guild,
+                    message_id=message_id,
+                    search_channel_id=search_channel_id
+                )
+                if not found_message:
+                    await interaction.followup.send(
+                        'Не удалось найти сообщение с указанным ID.'
+                    )
+                    return
+                message_content = found_message.content
+                attachments = await download_attachments(
+                    found_message.attachments
+                )
+            else:
+                message_content = message
+                attachments = []
+
+            results = await broadcast(
+                channels=channels,
+                content=message_content,
+                attachments=attachments
+            )
+
+            sent = sum(1 for _, error in results if error is None)
+            report = [
+                f'Сообщение отправлено в {sent} из {len(results)} каналов.'
+            ]
+            report.extend(
+                f'✅ {channel.mention}' if error is None
+                else f'❌ {channel.mention}: {error}'
+                for channel, error in results
+            )
+            report.extend(
+                f'❌ {target_id}: канал не найден'
+                for target_id in unresolved
+            )
+            for report_message in split_report(report):
+                await interaction.followup.send(report_message)
+        except Exception as error:
+            logging.error(error)
+            await interaction.followup.send(
+                f'Произошла ошибка при выполнении команды:\n{error}'
+            )
+
+    @broadcast_message.error
+    async def broadcast_message_error(
+        self,
+        interaction: Interaction, error
+    ) -> None:
+        """
+        Error handler for the broadcast_message command.
+
+        Args:
+            interaction (Interaction): The interaction context.
+            error: The error raised.
+        """
+        await error_handler(interaction, error)
+
+    @app_commands.command(
+        name='cluster_stats',
+        description='[Админ-команда] Показать состояние всех кластеров бота'
+    )
+    @commands.guild_only()
+    @app_commands.checks.has_permissions(administrator=True)
+    async def cluster_stats(self, interaction: Interaction) -> None:
+        """
+        Command to show the metrics aggregated from every cluster.
+
+        Args:
+            interaction (Interaction): The interaction context.
+        """
+        await interaction.response.defer(ephemeral=True)
+
+        try:
+            results = await self.bot.collect_metrics()
+        except Exception as error:
+            logging.error(error)
+            await interaction.followup.send(
+                f'Произошла ошибка при выполнении команды:\n{error}'
+            )
+            return
+
+        report = []
+        totals = {'guilds': 0, 'members': 0, 'players': 0, 'rss_mib': 0}
+        for cluster_id, result in sorted(results.items()):
+            metrics = result.get('data')
+            if metrics is None:
+                report.append(
+                    f'❌ Кластер {cluster_id}: нет ответа '
+                    f'({result.get("error")})'
+                )
+                continue
+            for key in totals:
+                totals[key] += metrics[key]
+            report.append(
+                f'✅ Кластер {cluster_id} (шарды {metrics["shard_ids"]}): '
+                f'серверов {metrics["guilds"]}, '
+                f'участников {metrics["members"]}, '
+                f'плееров {metrics["players"]}, '
+                f'задержка {metrics["latency_ms"]} мс, '
+                f'ожидание команд плеера '
+                f'{metrics.get("player_wait_ms", 0)} мс, '
+                f'память {metrics["rss_mib"]} MiB'
+            )
+        report.append(
+            f'Всего: серверов {totals["guilds"]}, '
+            f'участников {totals["members"]}, '
+            f'плееров {totals["players"]}, '
+            f'память {round(totals["rss_mib"], 1)} MiB'
+        )
+
+        for report_message in split_report(report):
+            await interaction.followup.send(report_message)
+
+    @cluster_stats.error
+    async def cluster_stats_error(
+        self,
+        interaction: Interaction, error
+    ) -> None:
+        """
+        Error handler for the cluster_stats command.
+
+        Args:
+            interaction (Interaction): The interaction context.
+            error: The error raised.
+        """
+        await error_handler(interaction, error)
+
+    @app_commands.command(
+        name='guild_config',
+        description='[Админ-команда] Показать настройки сервера'
+    )
+    @commands.guild_only()
+    @app_commands.checks.has_permissions(administrator=True)
+    async def guild_config(self, interaction: Interaction) -> None:
+        """
+        Command to show the settings of the guild.
+
+        Args:
+            interaction (Interaction): The interaction context.
+        """
+        settings = guild_config_cache.get(interaction.guild.id)
+        greetings_channels_id = (
+            [settings.greetings_channel_id]
+            if settings.greetings_channel_id else []
+        )
+
+        def mentions(channels_id: Iterable[int]) -> str:
+            return ', '.join(
+                f'<#{channel_id}>' for channel_id in channels_id
+            ) or 'не заданы'
+
+        await interaction.response.send_message(
+            f'Голосовые категории: '
+            f'{mentions(settings.voice_categories_id)}\n'
+            f'Текстовые категории: '
+            f'{mentions(settings.text_categories_id)}\n'
+            f'Канал приветствий: '
+            f'{mentions(greetings_channels_id)}\n'
+            f'Каналы без сообщений участников: '
+            f'{mentions(settings.restricted_channels_id)}',
+            ephemeral=True
+        )
+
+    @guild_config.error
+    async def guild_config_error(
+        self,
+        interaction: Interaction, error
+    ) -> None:
+        """
+        Error handler for the guild_config command.
+
+        Args:
+            interaction (Interaction): The interaction context.
+            error: The error raised.
+        """
+        await error_handler(interaction, error)
+
+    @app_commands.command(
+        name='set_guild_config',
+        description='[Админ-команда] Изменить настройки сервера'
+    )
+    @app_commands.describe(
+        voice_categories_id='[Опционально] ID голосовых категорий '
+        'через запятую, "-" для значения по умолчанию',
+        text_categories_id='[Опционально] ID текстовых категорий '
+        'через запятую, "-" для значения по умолчанию',
+        greetings_channel_id='[Опционально] ID канала приветствий, '
+        '"-" для значения по умолчанию',
+        restricted_channels_id='[Опционально] ID каналов без сообщений '
+        'участников через запятую, "-" для значения по умолчанию'
+    )
+    @app_commands.rename(
+        voice_categories_id='id_голосовых_категорий',
+        text_categories_id='id_текстовых_категорий',
+        greetings_channel_id='id_канала_приветствий',
+        restricted_channels_id='id_каналов_без_сообщений'
+    )
+    @commands.guild_only()
+    @app_commands.checks.has_permissions(administrator=True)
+    async def set_guild_config(
+        self,
+        interaction: Interaction,
+        voice_categories_id: str = None,
+        text_categories_id: str = None,
+        greetings_channel_id: str = None,
+        restricted_channels_id: str = None
+    ) -> None:
+        """
+        Command to edit the settings of the guild.
+
+        Note:
+            Only the given settings are changed,
+            "-" resets a setting to the global default.
+
+        Args:
+            interaction (Interaction): The interaction context.
+            voice_categories_id (str, optional): Comma separated IDs
+            of the voice categories. Defaults to None.
+            text_categories_id (str, optional): Comma separated IDs
+            of the text categories. Defaults to None.
+            greetings_channel_id (str, optional): The ID of
+            the greetings channel. Defaults to None.
+            restricted_channels_id (str, optional): Comma separated IDs
+            of the channels where members' messages are deleted.
+            Defaults to None.
+        """
+        await interaction.response.defer(ephemeral=True)
+
+        fields: Dict[str, Any] = {}
+        try:
+            for name, value in (
+                ('voice_categories_id', voice_categories_id),
+                ('text_categories_id', text_categories_id),
+                ('restricted_channels_id', restricted_channels_id),
+            ):
+                if value is None:
+                    continue
+                fields[name] = (
+                    None if value.strip() == '-'
+                    else list(parse_ids(value))
+                )
+            if greetings_channel_id is not None:
+                fields['greetings_channel_id'] = (
+                    None if greetings_channel_id.strip() == '-'
+                    else int(greetings_channel_id)
+                )
+        except ValueError:
+            await interaction.followup.send(
+                'ID должны быть числами, перечисленными через запятую.'
+            )
+            return
+
+        if not fields:
+            await interaction.followup.send(
+                'Необходимо указать хотя бы одну настройку.'
+            )
+            return
+
+        try:
+            await self.bot.update_guild_config(
+                interaction.guild.id,
+                **fields
+            )
+            await interaction.followup.send('Настройки сервера обновлены.')
+        except Exception as error:
+            logging.error(error)
+            await interaction.followup.send(
+                f'Произошла ошибка при выполнении команды:\n{error}'
+            )
+
+    @set_guild_config.error
+    async def set_guild_config_error(
+        self,
+        interaction: Interaction, error
+    ) -> None:
+        """
+        Error handler for the set_guild_config command.
+
+        Args:
+            interaction (Interaction): The interaction context.
+            error: The error raised.
+        """
+        await error_handler(interaction, error)
+
+    @app_commands.command(
+        name='reload_cog',
+        description='[Админ-команда] Перезагрузить модуль бота '
+        'без перезапуска'
+    )
+    @app_commands.describe(
+        extension='Модуль, который нужно перезагрузить',
+        sync='[Опционально] Синхронизировать слеш-команды после '
+        'перезагрузки, если изменились их параметры'
+    )
+    @app_commands.rename(extension='модуль', sync='синхронизировать')
+    @app_commands.choices(extension=[
+        app_commands.Choice(name=name, value=extension)
+        for extension, name in extensions.items()
+    ])
+    @commands.guild_only()
+    @app_commands.checks.has_permissions(administrator=True)
+    async def reload_cog(
+        self,
+        interaction: Interaction,
+        extension: str,
+        sync: bool = False
+    ) -> None:
+        """
+        Command to reload a cog in place, in every cluster.
+
+        Note:
+            The cog hands off its live state to the reloaded one,
+            so players, caches and unfinished tasks survive.
+            If the new code fails to load, the old one keeps running.
+
+        Args:
+            interaction (Interaction): The interaction context.
+            extension (str): The extension to reload.
+            sync (bool, optional): Whether to sync the commands
+            afterwards. Defaults to False.
+        """
+        await interaction.response.defer(ephemeral=True)
+
+        try:
+            results = await self.bot.reload_cog_everywhere(extension)
+            if sync:
+                synced = await self.bot.tree.sync()
+                logging.info(f'Synced {len(synced)} command(s)')
+        except Exception as error:
+            logging.error(error)
+            await interaction.followup.send(
+                f'Произошла ошибка при выполнении команды:\n{error}'
+            )
+            return
+
+        report = [
+            f'✅ Кластер {cluster_id}: перезагружен за '
+            f'{result["data"]} мс'
+            if 'data' in result
+            else f'❌ Кластер {cluster_id}: {result.get("error")}'
+            for cluster_id, result in sorted(results.items())
+        ]
+        for report_message in split_report(report):
+            await interaction.followup.send(report_message)
+
+    @reload_cog.error
+    async def reload_cog_error(
+        self,
+        interaction: Interaction, error
+    ) -> None:
+        """
+        Error handler for the reload_cog command.
+
+        Args:
+            interaction (Interaction): The interaction context.
+            error: The error raised.
+        """
+        await error_handler(interaction, error)
+
     @app_commands.command(
         name='edit_bot_message',
         description='[Админ-команда] Отредактировать сообщение бота'
@@ -134,12 +714,15 @@ class AdminCog(commands.Cog):
         message='[Опционально] Напиши текст, '
         'который заменит текст существубщего сообщения',
         message_id='[Опционально] Вставь сюда ID сообщения, '
-        'из которого бот скопирует текст'
+        'из которого бот скопирует текст',
+        search_channel_id='[Опционально] Вставь сюда ID канала, '
+        'в котором находятся сообщения'
     )
     @app_commands.rename(
         edit_message_id='id_редактируемого_сообщения',
         message='новое_сообщение',
-        message_id='id_сообщения'
+        message_id='id_сообщения',
+        search_channel_id='id_канала_сообщений'
     )
     @commands.guild_only()
     @app_commands.checks.has_permissions(administrator=True)
@@ -148,7 +731,8 @@ class AdminCog(commands.Cog):
         interaction: Interaction,
         edit_message_id: str,
         message: str = None,
-        message_id: str = None
+        message_id: str = None,
+        search_channel_id: str = None
     ) -> None:
         """
         Command to edit a message sent by the bot.
@@ -160,6 +744,8 @@ class AdminCog(commands.Cog):
             message content. Defaults to None.
             message_id (str, optional): The ID of the message
             to copy content from. Defaults to None.
+            search_channel_id (str, optional): The ID of the channel
+            to search the messages in first. Defaults to None.
         """
         await interaction.response.defer(ephemeral=True)
 
@@ -171,18 +757,11 @@ class AdminCog(commands.Cog):
 
         try:
             guild = interaction.guild
-            found_message_to_edit = None
-            for search_message in guild.text_channels:
-                try:
-                    found_message_to_edit = await search_message.fetch_message(
-                        int(edit_message_id)
-                    )
-                    break
-                except Exception as error:
-                    logging.info(
-                        f'[Searching message to edit ID] '
-                        f'Nothing was found: {error}'
-                    )
+            found_message_to_edit = await self.find_message(
+                guild=guild,
+                message_id=edit_message_id,
+                search_channel_id=search_channel_id
+            )
             if not found_message_to_edit:
                 await interaction.followup.send(
                     'Не удалось найти сообщение '
@@ -191,18 +770,11 @@ class AdminCog(commands.Cog):
                 return
 
             if message_id:
-                found_message = None
-                for search_message in guild.text_channels:
-                    try:
-                        found_message = await search_message.fetch_message(
-                            int(message_id)
-                        )
-                        break
-                    except Exception as error:
-                        logging.info(
-                            f'[Searching message ID] '
-                            f'Nothing was found: {error}'
-                        )
+                found_message = await self.find_message(
+                    guild=guild,
+                    message_id=message_id,
+                    search_channel_id=search_channel_id
+                )
                 if not found_message:
                     await interaction.followup.send(
                         'Не удалось найти сообщение с указанным ID.'
@@ -237,3 +809,13 @@ class AdminCog(commands.Cog):
             error: The error raised.
         """
         await error_handler(interaction, error)
+
+
+async def setup(bot: commands.Bot) -> None:
+    """
+    Load the AdminCog extension.
+
+    Args:
+        bot (commands.Bot): The bot instance.
+    """
+    await bot.add_cog(AdminCog(bot=bot))
@@ -53,6 +53,8 @@ USER_INTERACTION_ANSWERS = {
 
     'name_changed': 'Название роли **{old_role_name}** успешно изменено на **{new_role_name}**!',
 
+    'role_provisioning_err': '*Отводит взгляд*\n\nЯ не смогла до конца выдать тебе доступы, Дискорд опять капризничает. Это не моя вина, понял?! Просто вызови **/grant_permission** еще раз, и я продолжу с того места, где остановилась.',
+
 }
 
 WAIFU_RESPONSE = [
@@ -130,3 +132,12 @@ PLAYER_BUTTONS_ERROR = [
     "Ой, ну конечно. Зайди в один голосовой канал со мной, чтобы использовать кнопки плеера.",
     "Да, да, сложно, я понимаю. Зайди в голосовой канал, я уже воспроизвожу музыку. Тогда уже нажимай на кнопки плеера."
 ]
+
+SHUTDOWN_ANSWER = (
+    '*Зевает* Я как раз перезапускаюсь, так что попробуй '
+    'еще раз через минутку.'
+)
+
+PLAYER_BUTTONS_THROTTLED = (
+    'Я уже написала тебе в личку. Сначала зайди в мой голосовой канал!'
+)
@@ -0,0 +1,161 @@
+import asyncio
+
+import io
+
+import os
+
+import time
+
+from typing import Dict, Optional, Tuple
+
+from urllib.parse import parse_qs, urlparse
+
+import discord
+
+HEADPHONES_IMAGE = 'bot_images/player/headphones.png'
+ANGRY_IMAGE = 'bot_images/player/buttons_error/angry.jpg'
+
+# Uploaded URLs are dropped this many seconds before their signature
+# expires, so a message never carries a link that dies right after.
+URL_EXPIRY_MARGIN_SECONDS = 3600
+
+
+def get_url_expiry(url: str) -> float:
+    """
+    Get the expiry time of a signed Discord CDN URL.
+
+    Args:
+        url (str): The attachment URL.
+
+    Returns:
+        float: Unix time the URL expires at,
+        infinity if the URL isn't signed.
+    """
+    expires = parse_qs(urlparse(url).query).get('ex')
+    if not expires:
+        return float('inf')
+    try:
+        return int(expires[0], 16)
+    except ValueError:
+        return 0.0
+
+
+class AssetManager:
+    """
+    In-memory cache of the bot's images and of their uploaded URLs.
+
+    An image is read from disk once, in a worker thread, and then
+    served from memory. After it is uploaded, its CDN URL is reused
+    so the next messages link to it instead of uploading it again.
+    The URL lives only as long as the message it was uploaded with,
+    so it has to be forgotten when that message is deleted.
+
+    Attributes:
+        _data (Dict[str, bytes]): Image bytes keyed by path.
+        _urls (Dict[str, Tuple[str, float]]): CDN URLs of the uploaded
+        images and their expiry times keyed by path.
+    """
+
+    def __init__(self) -> None:
+        """
+        Initialize the AssetManager.
+        """
+        self._data: Dict[str, bytes] = {}
+        self._urls: Dict[str, Tuple[str, float]] = {}
+
+    @staticmethod
+    def _read(path: str) -> bytes:
+        """
+        Read an image from disk.
+
+        Args:
+            path (str): Path to the image.
+
+        Returns:
+            bytes: The image bytes.
+        """
+        with open(path, 'rb') as image_file:
+            return image_file.read()
+
+    async def load(self, path: str) -> bytes:
+        """
+        Get the bytes of an image, reading it on first use.
+
+        Args:
+            path (str): Path to the image.
+
+        Returns:
+            bytes: The image bytes.
+        """
+        data = self._data.get(path)
+        if data is None:
+            data = await asyncio.to_thread(self._read, path)
+            self._data[path] = data
+        return data
+
+    async def file(self, path: str) -> discord.File:
+        """
+        Build an attachment of an image.
+
+        Args:
+            path (str): Path to the image.
+
+        Returns:
+            discord.File: The attachment named after the image file.
+        """
+        return discord.File(
+            io.BytesIO(await self.load(path)),
+            filename=os.path.basename(path)
+        )
+
+    def url(self, path: str) -> Optional[str]:
+        """
+        Get the CDN URL of an uploaded image.
+
+        Args:
+            path (str): Path to the image.
+
+        Returns:
+            Optional[str]: The URL if the image was uploaded
+            and the URL doesn't expire soon, else None.
+        """
+        cached = self._urls.get(path)
+        if cached is None:
+            return None
+
+        url, expires_at = cached
+        if time.time() > expires_at - URL_EXPIRY_MARGIN_SECONDS:
+            del self._urls[path]
+            return None
+        return url
+
+    def forget(self, path: str) -> None:
+        """
+        Drop the CDN URL of an image whose message was deleted,
+        Discord purges the attachments of deleted messages.
+
+        Args:
+            path (str): Path to the image.
+        """
+        self._urls.pop(path, None)
+
+    def remember(self, path: str, message: discord.Message) -> None:
+        """
+        Store the CDN URL of an image uploaded with a message.
+
+        Args:
+            path (str): Path to the image.
+            message (discord.Message): The message with the image
+            attachment.
+        """
+        filename = os.path.basename(path)
+        for attachment in message.attachments:
+            if attachment.filename == filename:
+                self._urls[path] = (
+                    attachment.url,
+                    get_url_expiry(attachment.url)
+                )
+                return
+
+
+assets = AssetManager()
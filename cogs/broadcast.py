@@ -0,0 +1,135 @@
+import asyncio
+
+import io
+
+import logging
+
+from typing import List, NamedTuple, Optional, Sequence, Tuple
+
+import discord
+
+from settings.settings import BROADCAST_CONCURRENCY
+
+REPORT_LENGTH_LIMIT = 2000
+
+
+class AttachmentPayload(NamedTuple):
+    """
+    Downloaded attachment that can be sent any number of times.
+    """
+    filename: str
+    data: bytes
+    spoiler: bool
+    description: Optional[str]
+
+    def to_file(self) -> discord.File:
+        """
+        Build a new file to send from the downloaded data.
+
+        Returns:
+            discord.File: The file.
+        """
+        return discord.File(
+            io.BytesIO(self.data),
+            filename=self.filename,
+            spoiler=self.spoiler,
+            description=self.description
+        )
+
+
+async def download_attachments(
+    attachments: Sequence[discord.Attachment]
+) -> List[AttachmentPayload]:
+    """
+    Download the attachments concurrently into memory.
+
+    Args:
+        attachments (Sequence[discord.Attachment]): The attachments.
+
+    Returns:
+        List[AttachmentPayload]: The downloaded attachments
+        in the original order.
+    """
+    data = await asyncio.gather(
+        *(attachment.read() for attachment in attachments)
+    )
+    return [
+        AttachmentPayload(
+            filename=attachment.filename,
+            data=attachment_data,
+            spoiler=attachment.is_spoiler(),
+            description=attachment.description
+        )
+        for attachment, attachment_data in zip(attachments, data)
+    ]
+
+
+async def broadcast(
+    channels: Sequence[discord.abc.Messageable],
+    content: Optional[str],
+    attachments: Sequence[AttachmentPayload],
+    concurrency: int = BROADCAST_CONCURRENCY
+) -> List[Tuple[discord.abc.Messageable, Optional[str]]]:
+    """
+    Send the same message to several channels concurrently.
+
+    Every channel is its own Discord route bucket, so discord.py
+    rate-limits the sends independently. The semaphore keeps
+    the burst under the global rate limit.
+
+    Args:
+        channels (Sequence[discord.abc.Messageable]): The channels.
+        content (Optional[str]): The message content.
+        attachments (Sequence[AttachmentPayload]): The attachments.
+        concurrency (int): Maximum number of concurrent sends.
+
+    Returns:
+        List[Tuple[discord.abc.Messageable, Optional[str]]]: Every
+        channel with the error that occurred, None if the message
+        was sent.
+    """
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+
+    async def send(channel: discord.abc.Messageable) -> Optional[str]:
+        async with semaphore:
+            try:
+                await channel.send(
+                    content=content,
+                    files=[attachment.to_file() for attachment in attachments]
+                )
+            except discord.HTTPException as error:
+                logging.warning(
+                    f'[Broadcast] Failed to send to {channel.id}: {error}'
+                )
+                return str(error)
+        return None
+
+    errors = await asyncio.gather(*(send(channel) for channel in channels))
+    return list(zip(channels, errors))
+
+
+def split_report(
+    lines: Sequence[str],
+    limit: int = REPORT_LENGTH_LIMIT
+) -> List[str]:
+    """
+    Join the report lines into messages that fit Discord's length limit.
+
+    Args:
+        lines (Sequence[str]): The report lines.
+        limit (int): Maximum message length.
+
+    Returns:
+        List[str]: The messages.
+    """
+    messages = []
+    current = ''
+    for line in lines:
+        line = line[:limit]
+        if current and len(current) + len(line) + 1 > limit:
+            messages.append(current)
+            current = ''
+        current = f'{current}\n{line}' if current else line
+    if current:
+        messages.append(current)
+    return messages
@@ -23,3 +23,9 @@ voice_channel_permissions = {
 text_channel_permissions = {
     'embed_links': True
 }
+
+extensions = {
+    'cogs.player_cog': 'Плеер',
+    'cogs.user_interaction_cog': 'Пользователи',
+    'cogs.admin_cog': 'Админ-команды',
+}
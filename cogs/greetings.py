@@ -0,0 +1,193 @@
+import asyncio
+
+import logging
+
+import time
+
+from typing import Dict, List, Optional
+
+import discord
+from discord.ext import commands
+
+from cogs.answers import USER_INTERACTION_ANSWERS
+
+from database.guild_config import guild_config_cache
+
+from settings.settings import (
+    GREETINGS_BURST_WINDOW_SECONDS,
+    GREETINGS_BURST_MAX_MEMBERS,
+)
+
+
+def get_current_hour_greeting() -> str:
+    """
+    Get the greeting for the current time of day.
+
+    Returns:
+        str: The greeting.
+    """
+    current_hour = time.localtime().tm_hour
+    if 6 <= current_hour < 12:
+        return 'Ohayou'
+    if 12 <= current_hour < 18:
+        return 'Konnichiwa'
+    if 18 <= current_hour < 23:
+        return 'Konbanwa'
+    return 'Oyasumi nasai'
+
+
+class GreetingBatcher:
+    """
+    Greets new members, coalescing join bursts into one message.
+
+    The first join in a guild is greeted right away and starts
+    a window, members joining during it are greeted together
+    when it ends. A full batch is greeted at once, so a single
+    join is never delayed. The greetings channel of every guild
+    is read from the guild config cache.
+
+    Attributes:
+        bot (commands.Bot): The bot instance.
+        window (float): Seconds to wait for more joins,
+        0 greets every member separately.
+        max_members (int): Maximum number of members in one greeting.
+        _channels (Dict[int, discord.abc.Messageable]): Fetched
+        channels that were missing from the client cache.
+        _pending (Dict[int, List[discord.Member]]): Members waiting
+        for a greeting keyed by guild ID.
+        _flush_tasks (Dict[int, asyncio.Task]): Tasks ending
+        the windows keyed by guild ID.
+    """
+
+    def __init__(
+        self,
+        bot: commands.Bot,
+        window: float = GREETINGS_BURST_WINDOW_SECONDS,
+        max_members: int = GREETINGS_BURST_MAX_MEMBERS
+    ) -> None:
+        """
+        Initialize the GreetingBatcher.
+
+        Args:
+            bot (commands.Bot): The bot instance.
+            window (float): Seconds to wait for more joins.
+            max_members (int): Maximum number of members in one greeting.
+        """
+        self.bot = bot
+        self.window = max(0.0, window)
+        self.max_members = max(1, max_members)
+        self._channels: Dict[int, discord.abc.Messageable] = {}
+        self._pending: Dict[int, List[discord.Member]] = {}
+        self._flush_tasks: Dict[int, asyncio.Task] = {}
+
+    async def get_channel(
+        self,
+        guild_id: int
+    ) -> Optional[discord.abc.Messageable]:
+        """
+        Resolve the greetings channel of a guild,
+        from the cache when possible.
+
+        Args:
+            guild_id (int): ID of the guild.
+
+        Returns:
+            Optional[discord.abc.Messageable]: The channel
+            if it is configured, else None.
+        """
+        channel_id = guild_config_cache.get(guild_id).greetings_channel_id
+        if not channel_id:
+            return None
+
+        channel = (
+            self.bot.get_channel(channel_id)
+            or self._channels.get(channel_id)
+        )
+        if channel is None:
+            channel = await self.bot.fetch_channel(channel_id)
+            self._channels[channel_id] = channel
+        return channel
+
+    async def add(self, member: discord.Member) -> None:
+        """
+        Queue a greeting for the member.
+
+        Args:
+            member (discord.Member): The member who joined.
+        """
+        guild_id = member.guild.id
+        pending = self._pending.setdefault(guild_id, [])
+        pending.append(member)
+
+        if self.window and len(pending) < self.max_members:
+            if guild_id in self._flush_tasks:
+                return
+            self._flush_tasks[guild_id] = asyncio.create_task(
+                self._flush_later(guild_id)
+            )
+            await self.flush(guild_id)
+            return
+
+        flush_task = self._flush_tasks.pop(guild_id, None)
+        if flush_task is not None:
+            flush_task.cancel()
+        await self.flush(guild_id)
+
+    async def _flush_later(self, guild_id: int) -> None:
+        """
+        Greet the pending members of a guild when the window ends.
+
+        Args:
+            guild_id (int): ID of the guild.
+        """
+        await asyncio.sleep(self.window)
+        self._flush_tasks.pop(guild_id, None)
+        await self.flush(guild_id)
+
+    async def flush(self, guild_id: int) -> None:
+        """
+        Greet the pending members of a guild, one message per full batch.
+
+        Args:
+            guild_id (int): ID of the guild.
+        """
+        pending = self._pending.pop(guild_id, [])
+        for batch in discord.utils.as_chunks(pending, self.max_members):
+            try:
+                channel = await self.get_channel(guild_id)
+                if channel is None:
+                    return
+                await channel.send(
+                    USER_INTERACTION_ANSWERS['greetings'].format(
+                        nickname=', '.join(member.mention for member in batch),
+                        current_hour=get_current_hour_greeting()
+                    ),
+                    suppress_embeds=True
+                )
+            except discord.HTTPException as error:
+                logging.error(
+                    f'[Greetings] Failed to greet {len(batch)} '
+                    f'members of {guild_id}: {error}'
+                )
+
+    async def close(self) -> None:
+        """
+        Stop waiting for the windows and greet the pending members.
+
+        A guild that can't be greeted is logged and skipped,
+        so the members of the other guilds are still greeted.
+        """
+        flush_tasks = list(self._flush_tasks.values())
+        self._flush_tasks.clear()
+        for flush_task in flush_tasks:
+            flush_task.cancel()
+        await asyncio.gather(*flush_tasks, return_exceptions=True)
+
+        for guild_id in list(self._pending):
+            try:
+                await self.flush(guild_id)
+            except (discord.Forbidden, discord.HTTPException) as error:
+                logging.error(
+                    f'[Greetings] Failed to greet the pending members '
+                    f'of {guild_id}: {error}'
+                )
@@ -0,0 +1,259 @@
+import random
+
+from typing import Dict, List, Optional, Set
+
+import discord
+
+
+async def ensure_members_cached(guild: discord.Guild) -> None:
+    """
+    Request the guild's members if they are not cached yet.
+
+    Note:
+        In lean mode members are not chunked at startup,
+        so a guild is chunked on the first use of its member list.
+
+    Args:
+        guild (discord.Guild): The guild.
+    """
+    if not guild.chunked:
+        await guild.chunk(cache=True)
+
+
+class EligibleMembersIndex:
+    """
+    Per-guild index of members that are not bots and have a role.
+
+    Member IDs are kept both in a list and in a position map,
+    so adding, removing and random sampling take constant time.
+
+    Attributes:
+        _members (Dict[int, List[int]]): Eligible member IDs
+        keyed by guild ID.
+        _positions (Dict[int, Dict[int, int]]): Positions of the member
+        IDs in `_members` keyed by guild ID.
+    """
+
+    def __init__(self) -> None:
+        """
+        Initialize the EligibleMembersIndex.
+        """
+        self._members: Dict[int, List[int]] = {}
+        self._positions: Dict[int, Dict[int, int]] = {}
+
+    @staticmethod
+    def is_eligible(member: discord.Member) -> bool:
+        """
+        Check if the member can be shown in the bot's waifu list.
+
+        Args:
+            member (discord.Member): The member to check.
+
+        Returns:
+            bool: True if the member is not a bot and has a role.
+        """
+        return not member.bot and len(member.roles) > 1
+
+    def build(self, guild: discord.Guild) -> None:
+        """
+        Index every cached member of the guild.
+
+        Args:
+            guild (discord.Guild): The guild to index.
+        """
+        members = [
+            member.id for member in guild.members
+            if self.is_eligible(member)
+        ]
+        self._members[guild.id] = members
+        self._positions[guild.id] = {
+            member_id: position
+            for position, member_id in enumerate(members)
+        }
+
+    def invalidate(self, guild_id: int) -> None:
+        """
+        Drop the index of the guild, it is rebuilt on the next use.
+
+        Args:
+            guild_id (int): ID of the guild.
+        """
+        self._members.pop(guild_id, None)
+        self._positions.pop(guild_id, None)
+
+    def _add(self, guild_id: int, member_id: int) -> None:
+        """
+        Add the member to the guild's index.
+
+        Args:
+            guild_id (int): ID of the guild.
+            member_id (int): ID of the member.
+        """
+        positions = self._positions[guild_id]
+        if member_id in positions:
+            return
+        positions[member_id] = len(self._members[guild_id])
+        self._members[guild_id].append(member_id)
+
+    def discard(self, guild_id: int, member_id: int) -> None:
+        """
+        Remove the member from the guild's index.
+
+        Args:
+            guild_id (int): ID of the guild.
+            member_id (int): ID of the member.
+        """
+        positions = self._positions.get(guild_id)
+        if positions is None or member_id not in positions:
+            return
+
+        members = self._members[guild_id]
+        position = positions.pop(member_id)
+        last_member_id = members.pop()
+        if last_member_id != member_id:
+            members[position] = last_member_id
+            positions[last_member_id] = position
+
+    def update(self, member: discord.Member) -> None:
+        """
+        Add or remove the member depending on their eligibility.
+
+        Args:
+            member (discord.Member): The member to update.
+        """
+        if member.guild.id not in self._members:
+            return
+
+        if self.is_eligible(member):
+            self._add(member.guild.id, member.id)
+        else:
+            self.discard(member.guild.id, member.id)
+
+    def sample(
+        self,
+        guild: discord.Guild,
+        count: int,
+        exclude_id: Optional[int] = None
+    ) -> List[discord.Member]:
+        """
+        Pick random eligible members of the guild.
+
+        Args:
+            guild (discord.Guild): The guild to pick members from.
+            count (int): Maximum number of members to pick.
+            exclude_id (Optional[int]): ID of a member that
+            must not be picked.
+
+        Returns:
+            List[discord.Member]: The picked members.
+        """
+        if guild.id not in self._members:
+            self.build(guild)
+
+        members = self._members[guild.id]
+        picked = random.sample(members, min(len(members), count + 1))
+
+        return [
+            member for member in (
+                guild.get_member(member_id)
+                for member_id in picked
+                if member_id != exclude_id
+            )
+            if member
+        ][:count]
+
+
+def normalize_role_name(name: str) -> str:
+    """
+    Normalize a role name for case and whitespace insensitive lookups.
+
+    Args:
+        name (str): The role name.
+
+    Returns:
+        str: The case-folded name with collapsed whitespace.
+    """
+    return ' '.join(name.split()).casefold()
+
+
+class RoleNameIndex:
+    """
+    Per-guild index of roles by their normalized name.
+
+    Attributes:
+        _roles (Dict[int, Dict[str, Set[int]]]): Role IDs keyed
+        by guild ID and normalized role name.
+    """
+
+    def __init__(self) -> None:
+        """
+        Initialize the RoleNameIndex.
+        """
+        self._roles: Dict[int, Dict[str, Set[int]]] = {}
+
+    def build(self, guild: discord.Guild) -> None:
+        """
+        Index every role of the guild.
+
+        Args:
+            guild (discord.Guild): The guild to index.
+        """
+        roles: Dict[str, Set[int]] = {}
+        for role in guild.roles:
+            roles.setdefault(normalize_role_name(role.name), set()).add(
+                role.id
+            )
+        self._roles[guild.id] = roles
+
+    def add(self, role: discord.Role) -> None:
+        """
+        Add the role to its guild's index.
+
+        Args:
+            role (discord.Role): The role to add.
+        """
+        roles = self._roles.get(role.guild.id)
+        if roles is None:
+            return
+        roles.setdefault(normalize_role_name(role.name), set()).add(role.id)
+
+    def discard(self, role: discord.Role) -> None:
+        """
+        Remove the role from its guild's index.
+
+        Args:
+            role (discord.Role): The role to remove.
+        """
+        roles = self._roles.get(role.guild.id)
+        if roles is None:
+            return
+
+        name = normalize_role_name(role.name)
+        role_ids = roles.get(name)
+        if not role_ids:
+            return
+        role_ids.discard(role.id)
+        if not role_ids:
+            del roles[name]
+
+    def get(self, guild: discord.Guild, name: str) -> Optional[discord.Role]:
+        """
+        Get a role of the guild by its name.
+
+        Args:
+            guild (discord.Guild): The guild to search in.
+            name (str): The role name, case and surrounding
+            whitespace are ignored.
+
+        Returns:
+            Optional[discord.Role]: The oldest role with this name
+            if it exists, else None.
+        """
+        if guild.id not in self._roles:
+            self.build(guild)
+
+        role_ids = self._roles[guild.id].get(normalize_role_name(name))
+        if not role_ids:
+            return None
+
+        return guild.get_role(min(role_ids))
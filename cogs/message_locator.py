@@ -0,0 +1,169 @@
+import asyncio
+
+import logging
+
+from typing import List, Optional, Set
+
+import discord
+
+from database.cache import LRUCache
+
+from settings.settings import (
+    MESSAGE_LOCATOR_CACHE_SIZE,
+    MESSAGE_LOCATOR_CONCURRENCY,
+)
+
+
+class MessageLocator:
+    """
+    Finds a guild message by its ID without knowing its channel.
+
+    The channel of every seen message is remembered in a bounded cache,
+    so a known message takes a single fetch. Unknown messages are
+    searched in all readable text channels concurrently, the remaining
+    searches are cancelled as soon as the message is found.
+
+    Attributes:
+        _channels (LRUCache): Channel IDs keyed by message ID.
+        _semaphore (asyncio.Semaphore): Limits concurrent REST calls.
+    """
+
+    def __init__(
+        self,
+        cache_size: int = MESSAGE_LOCATOR_CACHE_SIZE,
+        concurrency: int = MESSAGE_LOCATOR_CONCURRENCY
+    ) -> None:
+        """
+        Initialize the MessageLocator.
+
+        Args:
+            cache_size (int): Maximum number of remembered messages.
+            concurrency (int): Maximum number of concurrent REST calls.
+        """
+        self._channels = LRUCache(maxsize=cache_size)
+        self._semaphore = asyncio.Semaphore(max(1, concurrency))
+
+    def remember(self, message: discord.Message) -> None:
+        """
+        Remember the channel of a message.
+
+        Args:
+            message (discord.Message): The message.
+        """
+        self._channels.set(message.id, message.channel.id)
+
+    def forget(self, message_id: int) -> None:
+        """
+        Forget the channel of a deleted message.
+
+        Args:
+            message_id (int): ID of the message.
+        """
+        self._channels.pop(message_id)
+
+    async def _fetch(
+        self,
+        channel: discord.abc.Messageable,
+        message_id: int
+    ) -> Optional[discord.Message]:
+        """
+        Fetch a message from a channel.
+
+        Args:
+            channel (discord.abc.Messageable): The channel to search in.
+            message_id (int): ID of the message.
+
+        Returns:
+            Optional[discord.Message]: The message if it is in
+            the channel, else None.
+        """
+        async with self._semaphore:
+            try:
+                return await channel.fetch_message(message_id)
+            except (discord.NotFound, discord.Forbidden):
+                return None
+            except discord.HTTPException as error:
+                logging.warning(
+                    f'[MessageLocator] Failed to search {channel.id} '
+                    f'for {message_id}: {error}'
+                )
+                return None
+
+    def _candidates(
+        self,
+        guild: discord.Guild,
+        message_id: int,
+        channel_hint_id: Optional[int]
+    ) -> List[discord.abc.Messageable]:
+        """
+        Get the channels that likely contain the message.
+
+        Args:
+            guild (discord.Guild): The guild to search in.
+            message_id (int): ID of the message.
+            channel_hint_id (Optional[int]): ID of a channel
+            to search first.
+
+        Returns:
+            List[discord.abc.Messageable]: The hinted channel
+            and the remembered channel, if they exist.
+        """
+        candidates = []
+        for channel_id in (channel_hint_id, self._channels.get(message_id)):
+            if not channel_id:
+                continue
+            channel = guild.get_channel_or_thread(channel_id)
+            if (
+                isinstance(channel, discord.abc.Messageable)
+                and channel not in candidates
+            ):
+                candidates.append(channel)
+        return candidates
+
+    async def locate(
+        self,
+        guild: discord.Guild,
+        message_id: int,
+        channel_hint_id: Optional[int] = None
+    ) -> Optional[discord.Message]:
+        """
+        Find a message of the guild by its ID.
+
+        Args:
+            guild (discord.Guild): The guild to search in.
+            message_id (int): ID of the message.
+            channel_hint_id (Optional[int]): ID of a channel
+            to search first.
+
+        Returns:
+            Optional[discord.Message]: The message if found, else None.
+        """
+        searched: Set[int] = set()
+        for channel in self._candidates(guild, message_id, channel_hint_id):
+            searched.add(channel.id)
+            message = await self._fetch(channel, message_id)
+            if message:
+                self.remember(message)
+                return message
+
+        tasks = [
+            asyncio.create_task(self._fetch(channel, message_id))
+            for channel in guild.text_channels
+            if channel.id not in searched
+            and channel.permissions_for(guild.me).read_message_history
+        ]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                message = await next_done
+                if message:
+                    self.remember(message)
+                    return message
+        finally:
+            for task in tasks:
+                task.cancel()
+
+        logging.info(
+            f'[MessageLocator] Message {message_id} was not found '
+            f'in {len(tasks) + len(searched)} channels'
+        )
+        return None
@@ -0,0 +1,226 @@
+import asyncio
+
+import logging
+
+import time
+
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+# Commands are coroutine functions without arguments.
+PlayerCommand = Callable[[], Awaitable[Any]]
+
+
+class PlayerActor:
+    """
+    Runs the commands of one guild's player one at a time.
+
+    Every control button and every enqueue of the guild goes through
+    the actor's queue, so the commands run in the order they came in,
+    no matter which controls message they came from.
+
+    Attributes:
+        guild_id (int): ID of the guild.
+        processed (int): Number of commands run.
+        max_wait (float): Longest time in seconds a command waited
+        in the queue.
+        total_wait (float): Time in seconds all the commands waited
+        in the queue.
+        stopped (bool): Whether the actor was stopped and takes
+        no more commands.
+        _queue (asyncio.Queue): The pending commands with their
+        futures and enqueue times, None stops the actor.
+        _task (Optional[asyncio.Task]): Task running the commands.
+    """
+
+    def __init__(self, guild_id: int) -> None:
+        """
+        Initialize the PlayerActor.
+
+        Args:
+            guild_id (int): ID of the guild.
+        """
+        self.guild_id = guild_id
+        self.processed = 0
+        self.max_wait = 0.0
+        self.total_wait = 0.0
+        self.stopped = False
+        self._queue: asyncio.Queue[
+            Optional[Tuple[PlayerCommand, asyncio.Future, float]]
+        ] = asyncio.Queue()
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def pending(self) -> int:
+        """
+        Number of commands waiting in the queue.
+        """
+        return self._queue.qsize()
+
+    def start(self) -> None:
+        """
+        Start running the queued commands.
+        """
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(
+                self._run(),
+                name=f'player-actor-{self.guild_id}'
+            )
+
+    async def submit(self, command: PlayerCommand) -> Any:
+        """
+        Queue a command and wait for its result.
+
+        Args:
+            command (PlayerCommand): The command to run.
+
+        Returns:
+            Any: The result of the command.
+
+        Raises:
+            RuntimeError: If the actor is stopped.
+            Exception: Any exception raised by the command.
+        """
+        if self.stopped:
+            raise RuntimeError(f'Player of guild {self.guild_id} is stopped')
+        self.start()
+        future = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait((command, future, time.perf_counter()))
+        return await future
+
+    def post(self, command: PlayerCommand) -> None:
+        """
+        Queue a command without waiting for it.
+
+        Note:
+            The command is dropped if the actor is stopped.
+
+        Args:
+            command (PlayerCommand): The command to run.
+        """
+        if self.stopped:
+            return
+        self.start()
+        future = asyncio.get_running_loop().create_future()
+        future.add_done_callback(self._log_failure)
+        self._queue.put_nowait((command, future, time.perf_counter()))
+
+    def _log_failure(self, future: asyncio.Future) -> None:
+        """
+        Log the exception of a command nobody waits for.
+
+        Args:
+            future (asyncio.Future): The future of the command.
+        """
+        if not future.cancelled() and future.exception():
+            logging.warning(
+                f'[Player] Command in guild {self.guild_id} failed: '
+                f'{future.exception()}'
+            )
+
+    async def stop(self) -> None:
+        """
+        Run the commands queued so far and stop.
+        """
+        self.stopped = True
+        if self._task is None or self._task.done():
+            return
+        self._queue.put_nowait(None)
+        if self._task is not asyncio.current_task():
+            await self._task
+
+    async def _run(self) -> None:
+        """
+        Run the queued commands one at a time until stopped.
+        """
+        while True:
+            item = await self._queue.get()
+            if item is None:
+                return
+
+            command, future, queued_at = item
+            wait = time.perf_counter() - queued_at
+            self.processed += 1
+            self.total_wait += wait
+            self.max_wait = max(self.max_wait, wait)
+
+            if future.cancelled():
+                continue
+            try:
+                result = await command()
+            except asyncio.CancelledError:
+                future.cancel()
+                raise
+            except Exception as error:
+                future.set_exception(error)
+            else:
+                future.set_result(result)
+
+
+class PlayerActors:
+    """
+    The player actors of every guild.
+
+    Attributes:
+        _actors (Dict[int, PlayerActor]): Actors keyed by guild ID.
+    """
+
+    def __init__(self) -> None:
+        """
+        Initialize the PlayerActors.
+        """
+        self._actors: Dict[int, PlayerActor] = {}
+
+    def get(self, guild_id: int) -> PlayerActor:
+        """
+        Get the actor of the guild, creating it if needed.
+
+        Args:
+            guild_id (int): ID of the guild.
+
+        Returns:
+            PlayerActor: The guild's actor.
+        """
+        actor = self._actors.get(guild_id)
+        if actor is None:
+            actor = self._actors[guild_id] = PlayerActor(guild_id=guild_id)
+        return actor
+
+    async def stop(self, guild_id: int) -> None:
+        """
+        Stop and forget the actor of the guild.
+
+        Args:
+            guild_id (int): ID of the guild.
+        """
+        actor = self._actors.pop(guild_id, None)
+        if actor:
+            await actor.stop()
+
+    async def stop_all(self) -> None:
+        """
+        Stop and forget every actor.
+        """
+        actors, self._actors = self._actors, {}
+        for actor in actors.values():
+            await actor.stop()
+
+    def stats(self) -> Dict[str, float]:
+        """
+        Get the contention of the actors.
+
+        Returns:
+            Dict[str, float]: Number of commands waiting in the queues
+            and the longest queue wait in milliseconds.
+        """
+        return {
+            'pending': sum(
+                actor.pending for actor in self._actors.values()
+            ),
+            'max_wait_ms': round(
+                max(
+                    (actor.max_wait for actor in self._actors.values()),
+                    default=0.0
+                ) * 1000,
+                1
+            ),
+        }
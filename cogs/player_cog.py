@@ -1,11 +1,17 @@
 import asyncio
 
+import json
+
 import logging
 
+import os
+
 from typing import (
     cast,
     Any,
     Callable,
+    Dict,
+    List,
     Optional,
 )
 
@@ -18,11 +24,7 @@ import random
 import discord
 from discord import app_commands, Interaction
 from discord.ext import commands
-from discord.errors import (
-    Forbidden,
-    InteractionResponded,
-    NotFound
-)
+from discord.errors import Forbidden, NotFound
 
 import wavelink
 from wavelink.exceptions import LavalinkLoadException
@@ -32,7 +34,31 @@ from error_handlers.errors import (
     error_handler,
 )
 
-from cogs.answers import PLAYER_BUTTONS_ERROR
+from cogs.answers import (
+    PLAYER_BUTTONS_ERROR,
+    PLAYER_BUTTONS_THROTTLED,
+    SHUTDOWN_ANSWER,
+)
+from cogs.assets import assets, ANGRY_IMAGE, HEADPHONES_IMAGE
+from cogs.player_actor import PlayerActors
+from cogs.throttle import Cooldown
+
+from settings.settings import (
+    CLUSTER_ID,
+    PLAYER_SNAPSHOT_PATH,
+    REJECTION_DM_CACHE_SIZE,
+    REJECTION_DM_WINDOW_SECONDS,
+    SEEK_COALESCE_WINDOW_SECONDS,
+)
+
+# Distance of one rewind or fast forward press in milliseconds.
+SEEK_STEP_MS = 10000
+
+# At most one rejection DM per user and window.
+rejection_dm_cooldown = Cooldown(
+    window=REJECTION_DM_WINDOW_SECONDS,
+    maxsize=REJECTION_DM_CACHE_SIZE
+)
 
 
 def same_channel_check(func: Callable) -> Callable:
@@ -40,6 +66,11 @@ def same_channel_check(func: Callable) -> Callable:
     Decorator to check if the user
     is in the same voice channel as the bot.
 
+    Note:
+        A rejected user gets a DM at most once
+        per `REJECTION_DM_WINDOW_SECONDS`, further clicks
+        are answered with a short ephemeral message.
+
     Args:
         func (Callable): The function to wrap.
 
@@ -66,17 +97,28 @@ def same_channel_check(func: Callable) -> Callable:
                 and user_voice_channel == bot_voice_channel:
             return await func(self, interaction, *args, **kwargs)
         else:
-            await interaction.response.edit_message(view=self)
+            if not rejection_dm_cooldown.acquire(interaction.user.id):
+                await interaction.response.send_message(
+                    PLAYER_BUTTONS_THROTTLED,
+                    ephemeral=True,
+                    delete_after=10.0
+                )
+                return
+
+            await interaction.response.defer()
+            # The DM deletes itself and its attachment with it,
+            # so the image is uploaded every time from memory.
             try:
                 await interaction.user.send(
                     random.choice(PLAYER_BUTTONS_ERROR),
-                    file=discord.File(
-                        'bot_images/player/buttons_error/angry.jpg'
-                    ),
+                    file=await assets.file(ANGRY_IMAGE),
                     delete_after=60.0
                 )
             except Forbidden:
-                pass
+                await interaction.followup.send(
+                    random.choice(PLAYER_BUTTONS_ERROR),
+                    ephemeral=True
+                )
             return
 
     return wrapper
@@ -86,30 +128,161 @@ class PlayerControls(discord.ui.View):
     """
     A class representing the music control UI for a Discord bot.
 
+    The view is persistent: its buttons have stable custom IDs,
+    a single instance is registered with `bot.add_view` when the cog
+    loads and resolves the guild's player when a button is clicked.
+    Messages are sent with a stopped copy from `render`,
+    so discord.py doesn't keep a view object per message.
+
     Attributes:
-        player (wavelink.Player): The player instance.
-        volume (int): The current volume of the player.
-        embed (discord.Embed): The embed associated with the controls.
+        cog (PlayerCog): The player cog, owner of the player actors.
+        seek_offsets (Dict[int, int]): Net offset in milliseconds
+        of the rewind and fast forward presses not applied yet
+        keyed by guild ID.
+        seek_tasks (Dict[int, asyncio.Task]): Tasks applying
+        the pending offsets keyed by guild ID.
     """
 
-    def __init__(self, player: wavelink.Player, embed: discord.Embed) -> None:
+    def __init__(self, cog: 'PlayerCog', paused: bool = False) -> None:
         """
         Initialize the MusicControls view.
 
         Args:
-            player (wavelink.Player): The player instance.
-            embed (discord.Embed): The embed associated with the controls.
+            cog (PlayerCog): The player cog.
+            paused (bool): Whether the pause button shows
+            the paused state.
         """
         super().__init__(timeout=None)
-        self.player: wavelink.Player = player
-        self.embed: discord.Embed = embed
+        self.cog = cog
+        self.seek_offsets: Dict[int, int] = {}
+        self.seek_tasks: Dict[int, asyncio.Task] = {}
 
-        self.lock: asyncio.Lock = asyncio.Lock()
+        if paused:
+            self.pause.emoji = discord.PartialEmoji.from_str(
+                '<:botplay:1250613903470100490>')
+            self.pause.style = discord.ButtonStyle.success
+
+    def render(self, paused: bool = False) -> 'PlayerControls':
+        """
+        Build the controls to send with a player message.
+
+        Args:
+            paused (bool): Whether the player is paused.
+
+        Returns:
+            PlayerControls: A stopped copy of the controls, clicks
+            on it are handled by the registered instance.
+        """
+        view = PlayerControls(cog=self.cog, paused=paused)
+        # `stop` is shadowed by the stop button.
+        discord.ui.View.stop(view)
+        return view
+
+    @staticmethod
+    def get_player(interaction: Interaction) -> Optional[wavelink.Player]:
+        """
+        Get the player of the interaction's guild.
+
+        Args:
+            interaction (Interaction): The interaction context.
+
+        Returns:
+            Optional[wavelink.Player]: The player if the bot
+            is connected, else None.
+        """
+        voice_client = interaction.guild.voice_client
+        if isinstance(voice_client, wavelink.Player):
+            return voice_client
+        return None
+
+    async def interaction_check(self, interaction: Interaction) -> bool:
+        """
+        Reject presses while the bot shuts down and remove
+        the controls from messages of players that are gone.
+
+        Note:
+            Button presses don't go through the command tree,
+            so the shutdown is checked here as well.
+
+        Args:
+            interaction (Interaction): The interaction context.
+
+        Returns:
+            bool: True if the bot is running and the guild
+            has a player, else False.
+        """
+        lifecycle = getattr(self.cog.bot, 'lifecycle', None)
+        if lifecycle is not None and lifecycle.closing:
+            await interaction.response.send_message(
+                SHUTDOWN_ANSWER,
+                ephemeral=True
+            )
+            return False
+
+        if interaction.guild and self.get_player(interaction):
+            return True
+
+        await interaction.response.edit_message(view=None)
+        return False
+
+    def queue_seek(self, guild_id: int, offset: int) -> None:
+        """
+        Add a press to the pending seek of the guild.
+
+        Note:
+            Presses within `SEEK_COALESCE_WINDOW_SECONDS` of the first
+            one are summed up and sent to Lavalink as a single seek.
+
+        Args:
+            guild_id (int): ID of the guild.
+            offset (int): Offset of the press in milliseconds.
+        """
+        self.seek_offsets[guild_id] = (
+            self.seek_offsets.get(guild_id, 0) + offset
+        )
+        if guild_id not in self.seek_tasks:
+            self.seek_tasks[guild_id] = asyncio.create_task(
+                self.apply_seek(guild_id)
+            )
+
+    async def apply_seek(self, guild_id: int) -> None:
+        """
+        Apply the net offset of the guild's coalesced presses.
+
+        Note:
+            Seeking past the end of the track skips to the next one
+            if the queue is not empty.
+
+        Args:
+            guild_id (int): ID of the guild.
+        """
+        await asyncio.sleep(SEEK_COALESCE_WINDOW_SECONDS)
+        self.seek_tasks.pop(guild_id, None)
+        offset = self.seek_offsets.pop(guild_id, 0)
+
+        guild = self.cog.bot.get_guild(guild_id)
+        player = guild.voice_client if guild else None
+        if not offset or not isinstance(player, wavelink.Player):
+            return
+
+        async def seek() -> None:
+            if not player.current:
+                return
+
+            new_position = max(0, player.position + offset)
+            if new_position >= player.current.length:
+                if player.queue:
+                    await player.skip()
+            else:
+                await player.seek(new_position)
+
+        self.cog.actors.get(guild_id).post(seek)
 
     @discord.ui.button(
         emoji=discord.PartialEmoji.from_str(
             '<:botrewind:1250613904933912687>'),
-        style=discord.ButtonStyle.blurple
+        style=discord.ButtonStyle.blurple,
+        custom_id='player:rewind'
     )
     @same_channel_check
     async def rewind(
@@ -124,15 +297,13 @@ class PlayerControls(discord.ui.View):
             interaction (Interaction): The interaction context.
             button (discord.ui.Button): The button that was pressed.
         """
-        async with self.lock:
-            current_position = self.player.position
-            new_position = max(0, current_position - 10000)
-            await self.player.seek(new_position)
-            await interaction.response.edit_message(view=self)
+        await interaction.response.defer()
+        self.queue_seek(interaction.guild.id, -SEEK_STEP_MS)
 
     @discord.ui.button(
         emoji=discord.PartialEmoji.from_str('<:botstop:1250613906532204564>'),
-        style=discord.ButtonStyle.blurple
+        style=discord.ButtonStyle.blurple,
+        custom_id='player:stop'
     )
     @same_channel_check
     async def stop(
@@ -143,18 +314,28 @@ class PlayerControls(discord.ui.View):
         """
         Handle the stop button interaction.
 
+        Note:
+            The interaction is deferred before waiting for the actor,
+            like the other buttons.
+
         Args:
             interaction (Interaction): The interaction context.
             button (discord.ui.Button): The button that was pressed.
         """
-        async with self.lock:
-            self.player.queue.clear()
-            await self.player.stop(force=False)
-            await self.player.disconnect()
+        player = self.get_player(interaction)
+        await interaction.response.defer()
+
+        async def stop() -> None:
+            player.queue.clear()
+            await player.stop(force=False)
+            await player.disconnect()
+
+        await self.cog.actors.get(interaction.guild.id).submit(stop)
 
     @discord.ui.button(
         emoji=discord.PartialEmoji.from_str('<:botpause:1250613901842845696>'),
-        style=discord.ButtonStyle.blurple
+        style=discord.ButtonStyle.blurple,
+        custom_id='player:pause'
     )
     @same_channel_check
     async def pause(
@@ -165,27 +346,32 @@ class PlayerControls(discord.ui.View):
         """
         Handle the play/pause button interaction.
 
+        Note:
+            The interaction is deferred first, the actor may be busy
+            with other commands for longer than Discord waits
+            for a response.
+
         Args:
             interaction (Interaction): The interaction context.
             button (discord.ui.Button): The button that was pressed.
         """
-        async with self.lock:
-            await self.player.pause(not self.player.paused)
+        player = self.get_player(interaction)
+        await interaction.response.defer()
 
-            if self.player.paused:
-                button.emoji = discord.PartialEmoji.from_str(
-                    '<:botplay:1250613903470100490>')
-                button.style = discord.ButtonStyle.success
-            else:
-                button.emoji = discord.PartialEmoji.from_str(
-                    '<:botpause:1250613901842845696>')
-                button.style = discord.ButtonStyle.blurple
-            await interaction.response.edit_message(view=self)
+        async def toggle_pause() -> bool:
+            await player.pause(not player.paused)
+            return player.paused
+
+        paused = await self.cog.actors.get(interaction.guild.id).submit(
+            toggle_pause
+        )
+        await interaction.edit_original_response(view=self.render(paused))
 
     @discord.ui.button(
         emoji=discord.PartialEmoji.from_str(
             '<:botfastforward:1250613898374152252>'),
-        style=discord.ButtonStyle.blurple
+        style=discord.ButtonStyle.blurple,
+        custom_id='player:fast_forward'
     )
     @same_channel_check
     async def fast_forward(
@@ -200,28 +386,13 @@ class PlayerControls(discord.ui.View):
             interaction (Interaction): The interaction context.
             button (discord.ui.Button): The button that was pressed.
         """
-        async with self.lock:
-            current_position = self.player.position
-            new_position = current_position + 10000
-            try:
-                if new_position >= self.player.current.length:
-                    if self.player.queue:
-                        await self.player.skip()
-                else:
-                    await self.player.seek(new_position)
-            except AttributeError:
-                await interaction.response.edit_message(view=None)
-
-            try:
-                await interaction.response.edit_message(view=self)
-            except NotFound:
-                await interaction.response.edit_message(view=self)
-            except InteractionResponded:
-                await self.player.disconnect()
+        await interaction.response.defer()
+        self.queue_seek(interaction.guild.id, SEEK_STEP_MS)
 
     @discord.ui.button(
         emoji=discord.PartialEmoji.from_str('<:botskip:1250613899733110960>'),
-        style=discord.ButtonStyle.blurple
+        style=discord.ButtonStyle.blurple,
+        custom_id='player:skip'
     )
     @same_channel_check
     async def skip(
@@ -232,22 +403,33 @@ class PlayerControls(discord.ui.View):
         """
         Handle the skip button interaction.
 
+        Note:
+            The interaction is deferred before waiting for the actor,
+            like the other buttons.
+
         Args:
             interaction (Interaction): The interaction context.
             button (discord.ui.Button): The button that was pressed.
         """
-        async with self.lock:
-            if self.player.queue:
-                await self.player.skip()
-                await interaction.response.edit_message(view=self)
+        player = self.get_player(interaction)
+        await interaction.response.defer()
+
+        async def skip() -> None:
+            if player.queue:
+                await player.skip()
             else:
-                await self.player.stop()
-                await self.player.disconnect()
+                await player.stop()
+                await player.disconnect()
+
+        await self.cog.actors.get(interaction.guild.id).submit(skip)
 
 
 class PlayerCog(commands.Cog):
     """
     A cog containing commands for music playback in voice channels.
+
+    Every command changing a guild's player runs through the guild's
+    `PlayerActor`, one at a time and in the order they came in.
     """
 
     def __init__(self, bot: commands.Bot) -> None:
@@ -263,7 +445,166 @@ class PlayerCog(commands.Cog):
         self.message: Optional[discord.Message] = None
         self.embed: Optional[discord.Embed] = None
         self.track_volume: int = 100
-        self.view: type[PlayerControls] = PlayerControls
+        self.actors: PlayerActors = PlayerActors()
+        self.controls: PlayerControls = PlayerControls(cog=self)
+
+    def export_state(self) -> Dict[str, Any]:
+        """
+        Hand off the live state before the cog is reloaded.
+
+        Returns:
+            Dict[str, Any]: The player message, its channel and embed,
+            the track volume and the player actors with the commands
+            they have queued. The players themselves live
+            in the voice clients and are not affected by a reload.
+        """
+        return {
+            'actors': self.actors,
+            'channel': self.channel,
+            'message': self.message,
+            'embed': self.embed,
+            'track_volume': self.track_volume,
+        }
+
+    def import_state(self, state: Dict[str, Any]) -> None:
+        """
+        Take over the live state of the reloaded cog.
+
+        Args:
+            state (Dict[str, Any]): The state from `export_state`.
+        """
+        self.actors = state['actors']
+        self.channel = state['channel']
+        self.message = state['message']
+        self.embed = state['embed']
+        self.track_volume = state['track_volume']
+
+    async def cog_load(self) -> None:
+        """
+        Take over the state handed off by a reload
+        and register the persistent controls.
+
+        Note:
+            The controls of a reloaded cog replace the old ones,
+            since they have the same custom IDs.
+        """
+        state = self.bot.handed_off_states.pop(self.qualified_name, None)
+        if state:
+            self.import_state(state)
+        self.bot.add_view(self.controls)
+
+    def snapshot_players(self) -> List[Dict[str, Any]]:
+        """
+        Describe every playing player so it can be restored after restart.
+
+        Returns:
+            List[Dict[str, Any]]: Guild and channel IDs, the current
+            track with its position and the queued tracks of each player.
+        """
+        snapshot = []
+        for voice_client in self.bot.voice_clients:
+            player = voice_client
+            if not isinstance(player, wavelink.Player) or not player.current:
+                continue
+
+            text_channel_id = None
+            if self.channel and self.channel.guild == player.guild:
+                text_channel_id = self.channel.id
+
+            snapshot.append({
+                'guild_id': player.guild.id,
+                'voice_channel_id': player.channel.id,
+                'text_channel_id': text_channel_id,
+                'track': player.current.raw_data,
+                'position': player.position,
+                'paused': player.paused,
+                'volume': player.volume,
+                'queue': [track.raw_data for track in player.queue],
+            })
+        return snapshot
+
+    async def shutdown(self) -> None:
+        """
+        Save the players to the snapshot file and remove the player message.
+
+        Note:
+            Called by the lifecycle manager before Lavalink is closed,
+            the players are restored by `restore_players`
+            once a node is ready again. The commands already queued
+            run before the snapshot is taken.
+        """
+        await self.actors.stop_all()
+        snapshot = self.snapshot_players()
+        path = PLAYER_SNAPSHOT_PATH.format(cluster_id=CLUSTER_ID)
+        if snapshot:
+            os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+            with open(path, 'w') as snapshot_file:
+                json.dump(snapshot, snapshot_file)
+            logging.info(
+                f'[Player] Saved {len(snapshot)} player(s) to {path}'
+            )
+
+        if self.message:
+            try:
+                await self.message.delete()
+            except (NotFound, Forbidden):
+                pass
+            assets.forget(HEADPHONES_IMAGE)
+            self.message = self.channel = self.embed = None
+
+    async def restore_players(self) -> None:
+        """
+        Reconnect the players saved by `shutdown` and resume their tracks.
+        """
+        path = PLAYER_SNAPSHOT_PATH.format(cluster_id=CLUSTER_ID)
+        if not os.path.exists(path):
+            return
+
+        with open(path) as snapshot_file:
+            snapshot = json.load(snapshot_file)
+        os.remove(path)
+
+        restored = 0
+        for state in snapshot:
+            guild = self.bot.get_guild(state['guild_id'])
+            if not guild or guild.voice_client:
+                continue
+            destination = guild.get_channel(state['voice_channel_id'])
+            if not isinstance(destination, discord.VoiceChannel):
+                continue
+
+            text_channel = guild.get_channel(state['text_channel_id'] or 0)
+            if text_channel:
+                self.channel = text_channel
+
+            async def resume() -> None:
+                player: wavelink.Player = await destination.connect(
+                    cls=wavelink.Player,
+                    self_deaf=True,
+                )
+                player.autoplay = wavelink.AutoPlayMode.partial
+                player.inactive_timeout = 60
+                for track in state['queue']:
+                    player.queue.put(wavelink.Playable(track))
+                await player.play(
+                    wavelink.Playable(state['track']),
+                    start=state['position'],
+                    volume=state['volume'],
+                    paused=state['paused']
+                )
+
+            try:
+                await self.actors.get(guild.id).submit(resume)
+            except (discord.DiscordException, wavelink.WavelinkException) \
+                    as error:
+                logging.warning(
+                    f'[Player] Could not restore the player '
+                    f'of guild {guild.id}: {error}'
+                )
+                continue
+            restored += 1
+
+        logging.info(f'[Player] Restored {restored} player(s)')
 
     @commands.Cog.listener()
     async def on_voice_state_update(
@@ -281,11 +622,13 @@ class PlayerCog(commands.Cog):
             after (discord.VoiceState): The state after the update.
         """
         if member == self.bot.user and before.channel and not after.channel:
+            await self.actors.stop(member.guild.id)
             if self.message:
                 try:
                     await self.message.delete()
                 except NotFound:
                     pass
+                assets.forget(HEADPHONES_IMAGE)
                 self.message = self.channel = self.embed = None
 
     @commands.Cog.listener()
@@ -297,6 +640,7 @@ class PlayerCog(commands.Cog):
             node (wavelink.Node): The wavelink node that became ready.
         """
         logging.info(f'Node {node.node.uri} ready.')
+        await self.restore_players()
 
     @commands.Cog.listener()
     async def on_wavelink_track_start(
@@ -328,10 +672,7 @@ class PlayerCog(commands.Cog):
             )
         author = track.author if track.artist else track.author
 
-        footer_icon = discord.File(
-            'bot_images/player/headphones.png',
-            filename='headphones.png'
-        )
+        footer_icon_url = assets.url(HEADPHONES_IMAGE)
         embed = discord.Embed(
             title='Сейчас играет',
             description=description,
@@ -366,21 +707,34 @@ class PlayerCog(commands.Cog):
                 'Если очередь воспроизведения пустая,\n'
                 'то через 1 минуту я сама покину голосовой канал!'
             ),
-            icon_url='attachment://headphones.png'
+            icon_url=footer_icon_url or 'attachment://headphones.png'
         )
         self.embed = embed
 
-        view = self.view(player=player, embed=embed)
-
         if not self.message:
             self.message = await self.channel.send(
                 embed=embed,
-                view=view,
-                file=footer_icon
+                view=self.controls.render(paused=player.paused),
+                files=(
+                    [] if footer_icon_url
+                    else [await assets.file(HEADPHONES_IMAGE)]
+                )
             )
+            assets.remember(HEADPHONES_IMAGE, self.message)
         else:
             await asyncio.sleep(0.2)
-            await self.message.edit(embed=embed)
+            has_icon = footer_icon_url or any(
+                attachment.filename == os.path.basename(HEADPHONES_IMAGE)
+                for attachment in self.message.attachments
+            )
+            if has_icon:
+                await self.message.edit(embed=embed)
+            else:
+                self.message = await self.message.edit(
+                    embed=embed,
+                    attachments=[await assets.file(HEADPHONES_IMAGE)]
+                )
+                assets.remember(HEADPHONES_IMAGE, self.message)
 
     @commands.Cog.listener()
     async def on_wavelink_inactive_player(
@@ -393,7 +747,7 @@ class PlayerCog(commands.Cog):
         Args:
             player (wavelink.Player): The inactive player.
         """
-        await player.disconnect()
+        self.actors.get(player.guild.id).post(player.disconnect)
 
     @app_commands.command(
         name='play',
@@ -416,6 +770,11 @@ class PlayerCog(commands.Cog):
         """
         Play a song.
 
+        Note:
+            The interaction is deferred once the track is found,
+            connecting and starting the player through a busy actor
+            may take longer than Discord waits for a response.
+
         Args:
             interaction (Interaction): The interaction context.
             song (str): The song to search for and play.
@@ -443,32 +802,43 @@ class PlayerCog(commands.Cog):
             )
             return
 
-        if not interaction.guild.voice_client:
-            await destination.connect(
-                cls=wavelink.Player,
-                self_deaf=True,
+        await interaction.response.defer(ephemeral=True)
+        track: wavelink.Playable = tracks[0]
+        actor = self.actors.get(interaction.guild.id)
+
+        async def enqueue() -> bool:
+            if not interaction.guild.voice_client:
+                await destination.connect(
+                    cls=wavelink.Player,
+                    self_deaf=True,
+                )
+
+            player: wavelink.Player = cast(
+                wavelink.Player,
+                interaction.guild.voice_client
             )
 
+            player.autoplay = wavelink.AutoPlayMode.partial
+            player.inactive_timeout = 60
+
+            await player.queue.put_wait(track)
+
+            if player.playing:
+                return False
+            await player.play(player.queue.get(), volume=self.track_volume)
+            return True
+
+        started = await actor.submit(enqueue)
         player: wavelink.Player = cast(
             wavelink.Player,
             interaction.guild.voice_client
         )
 
-        player.autoplay = wavelink.AutoPlayMode.partial
-        player.inactive_timeout = 60
-
-        track: wavelink.Playable = tracks[0]
-
-        await player.queue.put_wait(track)
-
-        view = self.view(player=player, embed=self.embed)
-
-        if not player.playing:
-            await player.play(player.queue.get(), volume=self.track_volume)
-            await interaction.response.send_message(
+        if started:
+            answer = await interaction.followup.send(
                 f'Включила **{track.title}**!',
                 ephemeral=True,
-                delete_after=10.0
+                wait=True
             )
         else:
             queue = ''.join(
@@ -487,12 +857,13 @@ class PlayerCog(commands.Cog):
                 value=f'{queue}',
                 inline=False
             )
-            await self.message.edit(embed=self.embed, view=view)
-            await interaction.response.send_message(
+            await self.message.edit(embed=self.embed)
+            answer = await interaction.followup.send(
                 f'Добавила в очередь **{track.title}**!',
                 ephemeral=True,
-                delete_after=10.0
+                wait=True
             )
+        await answer.delete(delay=10.0)
 
     @play.error
     async def play_error(self, interaction: Interaction, error) -> None:
@@ -504,3 +875,13 @@ class PlayerCog(commands.Cog):
             error (Exception): The error that occurred.
         """
         await error_handler(interaction, error)
+
+
+async def setup(bot: commands.Bot) -> None:
+    """
+    Load the PlayerCog extension.
+
+    Args:
+        bot (commands.Bot): The bot instance.
+    """
+    await bot.add_cog(PlayerCog(bot=bot))
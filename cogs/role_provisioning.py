@@ -0,0 +1,373 @@
+import asyncio
+
+import logging
+
+import random
+
+import time
+
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    Optional,
+    Set,
+    Tuple,
+)
+
+import aiohttp
+
+import discord
+
+from tortoise.exceptions import BaseORMException
+
+from cogs.config import (
+    general_permissions,
+    voice_channel_permissions,
+    text_channel_permissions
+)
+
+from database.guild_config import guild_config_cache
+from database.user.db_handler import add_managed_role
+
+from error_handlers.custom_exceptions import RoleProvisioningError
+
+from settings.settings import (
+    ROLE_PROVISIONING_CONCURRENCY,
+    ROLE_PROVISIONING_RETRIES,
+)
+
+ROLE_STEP = 'role'
+REGISTER_STEP = 'register'
+ASSIGN_STEP = 'assign'
+
+# Transient REST failures retried by a step.
+RETRIED_ERRORS = (
+    discord.HTTPException,
+    aiohttp.ClientError,
+    asyncio.TimeoutError,
+)
+# Errors a step can fail with, reported as RoleProvisioningError.
+STEP_ERRORS = (*RETRIED_ERRORS, BaseORMException)
+
+
+def overwrite_step(category_id: int) -> str:
+    """
+    Build the step key for a category permission overwrite.
+
+    Args:
+        category_id (int): ID of the category.
+
+    Returns:
+        str: The step key.
+    """
+    return f'overwrite:{category_id}'
+
+
+class ProvisioningState:
+    """
+    Progress of a single role grant.
+
+    Attributes:
+        role_name (str): The name of the role being granted.
+        role_id (Optional[int]): ID of the created role, once created.
+        completed (Set[str]): Keys of the steps that are already done.
+    """
+
+    def __init__(self, role_name: str) -> None:
+        """
+        Initialize the ProvisioningState.
+
+        Args:
+            role_name (str): The name of the role being granted.
+        """
+        self.role_name: str = role_name
+        self.role_id: Optional[int] = None
+        self.completed: Set[str] = set()
+
+
+class RoleProvisioner:
+    """
+    Creates a user's role, assigns it and sets the category
+    permission overwrites concurrently.
+
+    Every overwrite targets its own category, so each request goes
+    to a separate Discord route bucket and discord.py rate-limits
+    them independently. The semaphore keeps the burst under
+    the global rate limit.
+
+    Note:
+        Unfinished grants are kept in memory only. They survive
+        an in-place reload of the cog, which hands the provisioner
+        over, but not a restart. A role created before a restart
+        is still registered as managed, so it is cleaned up
+        with the rest of the member's roles.
+
+    Attributes:
+        retries (int): How many times a failed step is attempted.
+        _semaphore (asyncio.Semaphore): Limits concurrent REST calls.
+        _states (Dict[Tuple[int, int], ProvisioningState]): Unfinished
+        grants keyed by guild ID and user ID.
+    """
+
+    def __init__(
+        self,
+        concurrency: int = ROLE_PROVISIONING_CONCURRENCY,
+        retries: int = ROLE_PROVISIONING_RETRIES
+    ) -> None:
+        """
+        Initialize the RoleProvisioner.
+
+        Args:
+            concurrency (int): Maximum number of concurrent REST calls.
+            retries (int): How many times a failed step is attempted.
+        """
+        self.retries = max(1, retries)
+        self._semaphore = asyncio.Semaphore(max(1, concurrency))
+        self._states: Dict[Tuple[int, int], ProvisioningState] = {}
+
+    def pending(
+        self,
+        guild_id: int,
+        user_id: int
+    ) -> Optional[ProvisioningState]:
+        """
+        Get the state of an interrupted grant.
+
+        Args:
+            guild_id (int): ID of the guild.
+            user_id (int): Discord ID of the user.
+
+        Returns:
+            Optional[ProvisioningState]: The state if the grant
+            was interrupted, else None.
+        """
+        return self._states.get((guild_id, user_id))
+
+    async def _call_with_retry(
+        self,
+        step: str,
+        func: Callable[..., Awaitable[Any]],
+        *args: Any,
+        **kwargs: Any
+    ) -> Any:
+        """
+        Call a REST method, retrying transient failures
+        with exponential backoff.
+
+        Args:
+            step (str): The step key, used for logging.
+            func (Callable[..., Awaitable[Any]]): The method to call.
+
+        Returns:
+            Any: The result of the call.
+
+        Raises:
+            discord.HTTPException: If the request was rejected
+            or every attempt failed.
+            aiohttp.ClientError: If every attempt failed
+            on the connection.
+            asyncio.TimeoutError: If every attempt timed out.
+        """
+        for attempt in range(1, self.retries + 1):
+            try:
+                async with self._semaphore:
+                    return await func(*args, **kwargs)
+            except (discord.Forbidden, discord.NotFound):
+                raise
+            except RETRIED_ERRORS as error:
+                if attempt == self.retries:
+                    raise
+                delay = 2 ** (attempt - 1) + random.random()
+                logging.warning(
+                    f'[Role provisioning] Step {step} failed '
+                    f'(attempt {attempt}/{self.retries}): {error}. '
+                    f'Retrying in {delay:.1f}s'
+                )
+                await asyncio.sleep(delay)
+
+    async def _ensure_role(
+        self,
+        member: discord.Member,
+        state: ProvisioningState
+    ) -> discord.Role:
+        """
+        Create the role and register it as managed by the bot,
+        or reuse the one created by an interrupted grant.
+
+        Note:
+            The role is recorded as soon as Discord created it,
+            so a failed registration is retried on its own
+            instead of creating a second role.
+
+        Args:
+            member (discord.Member): The member the role is created for.
+            state (ProvisioningState): The grant state.
+
+        Returns:
+            discord.Role: The role.
+        """
+        guild = member.guild
+        role = None
+        if ROLE_STEP in state.completed:
+            role = guild.get_role(state.role_id)
+            if role is None:
+                state.completed.clear()
+            elif role.name != state.role_name:
+                role = await self._call_with_retry(
+                    ROLE_STEP,
+                    role.edit,
+                    name=state.role_name
+                )
+
+        if role is None:
+            role = await self._call_with_retry(
+                ROLE_STEP,
+                guild.create_role,
+                name=state.role_name,
+                color=discord.Color(random.randint(0, 0xFFFFFF)),
+                hoist=True
+            )
+            state.role_id = role.id
+            state.completed.add(ROLE_STEP)
+
+        if REGISTER_STEP not in state.completed:
+            await add_managed_role(
+                discord_id=member.id,
+                guild_id=guild.id,
+                role_id=role.id
+            )
+            state.completed.add(REGISTER_STEP)
+        return role
+
+    async def _set_overwrite(
+        self,
+        state: ProvisioningState,
+        category: discord.CategoryChannel,
+        role: discord.Role,
+        permissions: Dict[str, bool]
+    ) -> None:
+        """
+        Set the permission overwrite for the role on a category.
+
+        Args:
+            state (ProvisioningState): The grant state.
+            category (discord.CategoryChannel): The category.
+            role (discord.Role): The role to set the overwrite for.
+            permissions (Dict[str, bool]): The permissions to set.
+        """
+        step = overwrite_step(category.id)
+        await self._call_with_retry(
+            step,
+            category.set_permissions,
+            role,
+            **permissions
+        )
+        state.completed.add(step)
+
+    def _overwrite_targets(self, guild_id: int) -> Dict[int, Dict[str, bool]]:
+        """
+        Build the permissions to set for every category
+        configured for the guild.
+
+        Args:
+            guild_id (int): ID of the guild.
+
+        Returns:
+            Dict[int, Dict[str, bool]]: Permissions keyed by category ID.
+        """
+        settings = guild_config_cache.get(guild_id)
+        targets = {}
+        for category_id in settings.voice_categories_id:
+            targets[category_id] = {
+                **general_permissions,
+                **voice_channel_permissions
+            }
+        for category_id in settings.text_categories_id:
+            targets[category_id] = {
+                **targets.get(category_id, general_permissions),
+                **text_channel_permissions
+            }
+        return targets
+
+    async def provision(
+        self,
+        member: discord.Member,
+        role_name: str
+    ) -> discord.Role:
+        """
+        Create the role for the member and grant it access
+        to the configured categories. Steps that were completed
+        by an interrupted grant are skipped, a role it created
+        is renamed if the member asked for another name.
+
+        Args:
+            member (discord.Member): The member to grant the role to.
+            role_name (str): The name of the role to create.
+
+        Returns:
+            discord.Role: The granted role.
+
+        Raises:
+            RoleProvisioningError: If some of the steps failed.
+            The completed steps are kept so the grant can be resumed.
+        """
+        started = time.perf_counter()
+        guild = member.guild
+        key = (guild.id, member.id)
+        state = self._states.setdefault(key, ProvisioningState(role_name))
+        state.role_name = role_name
+
+        try:
+            role = await self._ensure_role(member, state)
+
+            if ASSIGN_STEP not in state.completed:
+                await self._call_with_retry(
+                    ASSIGN_STEP,
+                    member.add_roles,
+                    role
+                )
+                state.completed.add(ASSIGN_STEP)
+        except STEP_ERRORS as error:
+            raise RoleProvisioningError(
+                f'Could not create the role for {member.id}: {error}'
+            ) from error
+
+        tasks = []
+        targets = self._overwrite_targets(guild_id=guild.id)
+        for category_id, permissions in targets.items():
+            if overwrite_step(category_id) in state.completed:
+                continue
+            category = guild.get_channel(category_id)
+            if not category:
+                logging.warning(
+                    f'[Role provisioning] Category {category_id} '
+                    f'not found in guild {guild.id}'
+                )
+                continue
+            tasks.append(
+                self._set_overwrite(state, category, role, permissions)
+            )
+
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+        errors = [result for result in results if result is not None]
+        elapsed = time.perf_counter() - started
+
+        if errors:
+            for error in errors:
+                logging.error(
+                    f'[Role provisioning] Overwrite failed '
+                    f'for {member.id}: {error}'
+                )
+            raise RoleProvisioningError(
+                f'{len(errors)} of {len(tasks)} permission overwrites '
+                f'failed for {member.id} after {elapsed:.2f}s'
+            )
+
+        del self._states[key]
+        logging.info(
+            f'[Role provisioning] Granted role {role.id} to {member.id} '
+            f'with {len(tasks)} overwrite(s) in {elapsed:.2f}s'
+        )
+        return role
@@ -0,0 +1,45 @@
+import time
+
+from typing import Hashable
+
+from database.cache import LRUCache
+
+
+class Cooldown:
+    """
+    Per-key cooldown kept in a bounded map.
+
+    Attributes:
+        window (float): Seconds a key stays on cooldown.
+        _started (LRUCache): Times the cooldowns started keyed by key,
+        the least recently used keys are evicted when the map is full.
+    """
+
+    def __init__(self, window: float, maxsize: int) -> None:
+        """
+        Initialize the Cooldown.
+
+        Args:
+            window (float): Seconds a key stays on cooldown.
+            maxsize (int): Maximum number of keys remembered.
+        """
+        self.window = window
+        self._started = LRUCache(maxsize=maxsize)
+
+    def acquire(self, key: Hashable) -> bool:
+        """
+        Start the key's cooldown unless it is already running.
+
+        Args:
+            key (Hashable): The key, e.g. a user ID.
+
+        Returns:
+            bool: True if the key was not on cooldown, else False.
+        """
+        now = time.monotonic()
+        started = self._started.get(key)
+        if started is not None and now - started < self.window:
+            return False
+
+        self._started.set(key, now)
+        return True
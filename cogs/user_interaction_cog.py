@@ -1,3 +1,5 @@
+import asyncio
+
 import re
 
 import time
@@ -6,7 +8,7 @@ import random
 
 from urllib.parse import urlparse
 
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Set
 
 from collections import deque
 
@@ -16,32 +18,46 @@ import aiohttp
 
 import discord
 from discord import app_commands, Interaction, ButtonStyle
-from discord.ext import commands
-from discord.errors import Forbidden
+from discord.ext import commands, tasks
+
+from tortoise.exceptions import IntegrityError
 
+from database.cache import waifu_render_cache
 from database.user.db_handler import (
+    UserWaifu,
     add_waifu_to_user,
     check_user_waifu_link_exists,
     get_user_waifus,
-    get_user,
+    get_user_id,
     get_waifu_by_url,
-    check_user_waifu_connection,
     set_true_love,
     remove_true_love,
     count_waifus,
     remove_user_and_userwaifulinks,
+    get_user_managed_roles,
+    remove_managed_role,
+    get_user_discord_ids,
+    remove_users_and_userwaifulinks,
+    get_managed_roles,
+    remove_managed_role_ids,
 )
 
-from cogs.config import (
-    general_permissions,
-    voice_channel_permissions,
-    text_channel_permissions
+from cogs.greetings import GreetingBatcher
+from cogs.indexes import (
+    EligibleMembersIndex,
+    RoleNameIndex,
+    ensure_members_cached,
 )
+from cogs.role_provisioning import RoleProvisioner
+
+from error_handlers.custom_exceptions import RoleProvisioningError
 
 from settings.settings import (
-    DISCORD_VOICE_CATEGORIES_ID,
-    DISCORD_TEXT_CATEGORIES_ID,
-    GREETINGS_CHANNEL,
+    CLUSTER_ID,
+    CLUSTER_COUNT,
+    MEMBERS_RECONCILIATION_INTERVAL_HOURS,
+    MEMBERS_RECONCILIATION_BATCH_SIZE,
+    MEMBERS_RECONCILIATION_TIMEOUT_SECONDS,
 )
 
 from cogs.answers import (
@@ -175,16 +191,28 @@ class ServerUsers(discord.ui.UserSelect):
     """
     A custom user selection menu for selecting users from the server.
 
+    Attributes:
+        member_index (EligibleMembersIndex): Index of the members
+        that can appear in the chatbot's "waifus" list.
+
     Methods:
         show_bots_waifu(interaction: Interaction):
         Generates a list of the chatbot's "waifus".
         callback(interaction: Interaction): Handles the interaction
         when a user is selected.
+        get_waifus_embed(user: discord.User): Gets the cached embed
+        with the user's list of waifus.
+        render_waifus(user: discord.User, waifus: List[UserWaifu]):
+        Builds the embed with the user's list of waifus.
     """
 
-    def __init__(self):
+    def __init__(self, member_index: EligibleMembersIndex):
         """
         Initialize the ServerUsers user selection menu.
+
+        Args:
+            member_index (EligibleMembersIndex): Index of the members
+            that can appear in the chatbot's "waifus" list.
         """
 
         super().__init__(
@@ -192,6 +220,7 @@ class ServerUsers(discord.ui.UserSelect):
             min_values=1,
             max_values=1
         )
+        self.member_index = member_index
 
     async def show_bots_waifu(
             self,
@@ -212,17 +241,12 @@ class ServerUsers(discord.ui.UserSelect):
         invoking_user = interaction.user
         random_response = random.sample(WAIFU_RESPONSE, 4)
 
-        all_guild_users = [
-            user for user in interaction.guild.members
-            if not user.bot
-            and any(role != user.guild.default_role for role in user.roles)
-            and user.id != invoking_user.id
-        ]
-
-        if len(all_guild_users) > 4:
-            selected_guild_users = random.sample(all_guild_users, 4)
-        else:
-            selected_guild_users = all_guild_users
+        await ensure_members_cached(interaction.guild)
+        selected_guild_users = self.member_index.sample(
+            guild=interaction.guild,
+            count=4,
+            exclude_id=invoking_user.id
+        )
 
         user_and_response = dict(
             zip(selected_guild_users, random_response)
@@ -289,10 +313,9 @@ class ServerUsers(discord.ui.UserSelect):
             None
         """
         selected_user = self.values[0]
+        embed = await self.get_waifus_embed(user=selected_user)
 
-        waifus = await get_user_waifus(discord_id=selected_user.id)
-
-        if not waifus:
+        if not embed:
             if (selected_user.bot
                     and selected_user.id == interaction.message.author.id):
                 await self.show_bots_waifu(
@@ -313,14 +336,64 @@ class ServerUsers(discord.ui.UserSelect):
             )
             return
 
+        await interaction.response.send_message(
+            embed=embed,
+        )
+
+    async def get_waifus_embed(
+            self,
+            user: discord.User
+    ) -> Optional[discord.Embed]:
+        """
+        Get the embed with the user's list of waifus.
+
+        The embed is cached per user and rebuilt only when the user's
+        waifus or names change. It isn't cached if the cache was
+        invalidated while the waifus were fetched, as it may be stale.
+
+        Args:
+            user (discord.User): The user whose waifus to show.
+
+        Returns:
+            Optional[discord.Embed]: The embed if the user
+            has waifus, else None.
+        """
+        names = (user.display_name, user.global_name)
+        cached = waifu_render_cache.get(user.id)
+        if cached and cached[0] == names:
+            return cached[1]
+
+        generation = waifu_render_cache.generation
+        waifus = await get_user_waifus(discord_id=user.id)
+        embed = self.render_waifus(user=user, waifus=waifus) \
+            if waifus else None
+        if waifu_render_cache.generation == generation:
+            waifu_render_cache.set(user.id, (names, embed))
+
+        return embed
+
+    def render_waifus(
+            self,
+            user: discord.User,
+            waifus: List[UserWaifu]
+    ) -> discord.Embed:
+        """
+        Build the embed with the user's list of waifus.
+
+        Args:
+            user (discord.User): The user whose waifus to show.
+            waifus (List[UserWaifu]): The user's waifus.
+
+        Returns:
+            discord.Embed: The embed.
+        """
         embed = discord.Embed(
             title=f'Список вайфу пользователя '
-            f'{selected_user.display_name}',
+            f'{user.display_name}',
             color=0x9966cc
         )
 
-        for number, waifu_link in enumerate(waifus, start=1):
-            waifu = waifu_link.waifu
+        for number, waifu in enumerate(waifus, start=1):
             field_value = (
                 f'Ссылка: https://shikimori.one{waifu.url}\n'
                 f'Еще известна, как: {waifu.alt_name}\n'
@@ -328,11 +401,11 @@ class ServerUsers(discord.ui.UserSelect):
                 f'Shikimori ID: {waifu.shikimori_id}'
             )
 
-            if waifu_link.true_love:
+            if waifu.true_love:
                 field_value = (
                     f'`❤️ TRUE LOVE ❤️` '
                     f'Выбрана самой любимой вайфу у '
-                    f'{selected_user.global_name}\n{field_value}'
+                    f'{user.global_name}\n{field_value}'
                 )
 
             embed.add_field(
@@ -346,9 +419,7 @@ class ServerUsers(discord.ui.UserSelect):
             'вызовом команды /true_love'
         )
 
-        await interaction.response.send_message(
-            embed=embed,
-        )
+        return embed
 
 
 class UserInteractionCog(commands.Cog):
@@ -372,6 +443,69 @@ class UserInteractionCog(commands.Cog):
             ''',
             re.X
         )
+        self.role_provisioner = RoleProvisioner()
+        self.member_index = EligibleMembersIndex()
+        self.role_index = RoleNameIndex()
+        self.greetings = GreetingBatcher(bot=bot)
+        self.reconciled_at: Optional[float] = None
+        self._members_run: Optional[float] = None
+        self._members: Set[int] = set()
+
+    def export_state(self) -> Dict[str, Any]:
+        """
+        Hand off the live state before the cog is reloaded.
+
+        Returns:
+            Dict[str, Any]: Unfinished role grants, member and role
+            indexes and the time of the last reconciliation.
+        """
+        return {
+            'role_provisioner': self.role_provisioner,
+            'member_index': self.member_index,
+            'role_index': self.role_index,
+            'reconciled_at': self.reconciled_at,
+        }
+
+    def import_state(self, state: Dict[str, Any]) -> None:
+        """
+        Take over the live state of the reloaded cog.
+
+        Args:
+            state (Dict[str, Any]): The state from `export_state`.
+        """
+        self.role_provisioner = state['role_provisioner']
+        self.member_index = state['member_index']
+        self.role_index = state['role_index']
+        self.reconciled_at = state['reconciled_at']
+
+    async def cog_load(self) -> None:
+        """
+        Take over the state handed off by a reload
+        and start the background tasks when the cog is loaded.
+        """
+        state = self.bot.handed_off_states.pop(self.qualified_name, None)
+        if state:
+            self.import_state(state)
+        if self.bot.ipc:
+            self.bot.ipc.register(
+                'filter_members',
+                self.handle_filter_members_call
+            )
+        self.reconcile_members.start()
+
+    async def shutdown(self) -> None:
+        """
+        Greet the members still waiting for a greeting
+        before the bot shuts down.
+        """
+        await self.greetings.close()
+
+    async def cog_unload(self) -> None:
+        """
+        Stop the background tasks when the cog is unloaded.
+        """
+        self.reconcile_members.cancel()
+        await self.greetings.close()
 
     async def is_role_exist(
             self,
@@ -388,10 +522,7 @@ class UserInteractionCog(commands.Cog):
         Returns:
             Optional[discord.Role]: The role if it exists, else None.
         """
-        return discord.utils.get(
-            interaction.guild.roles,
-            name=role.lower().strip()
-        )
+        return self.role_index.get(guild=interaction.guild, name=role)
 
     async def get_character(
         self,
@@ -433,37 +564,17 @@ class UserInteractionCog(commands.Cog):
         Returns:
             None
         """
-        new_role = await interaction.guild.create_role(
-            name=role_name.lower().strip(),
-            color=discord.Color(random.randint(0, 0xFFFFFF)),
-            hoist=True
-        )
-        new_role.hoist
-
-        await interaction.user.add_roles(new_role)
-
-        voice_categories_id = DISCORD_VOICE_CATEGORIES_ID.split(',')
-        text_categories_id = DISCORD_TEXT_CATEGORIES_ID.split(',')
-
-        for voice_category_id in voice_categories_id:
-            voice_category = interaction.guild.get_channel(
-                int(voice_category_id)
-            )
-            await voice_category.set_permissions(
-                new_role,
-                **general_permissions,
-                **voice_channel_permissions
-            )
-
-        for text_сategory_id in text_categories_id:
-            text_category = interaction.guild.get_channel(
-                int(text_сategory_id)
+        try:
+            await self.role_provisioner.provision(
+                member=interaction.user,
+                role_name=role_name.lower().strip()
             )
-            await text_category.set_permissions(
-                new_role,
-                **general_permissions,
-                **text_channel_permissions
+        except RoleProvisioningError as error:
+            logging.error(error)
+            await interaction.followup.send(
+                USER_INTERACTION_ANSWERS['role_provisioning_err']
             )
+            return
 
         await interaction.followup.send(
             USER_INTERACTION_ANSWERS[
@@ -549,24 +660,306 @@ class UserInteractionCog(commands.Cog):
                 discord_id=discord_id,
                 waifu_data=data
             )
+        await self.bot.forget_users_everywhere([discord_id])
 
         await self.create_role_and_permission(
             interaction=interaction,
             role_name=role
         )
 
-    async def remove_unused_roles(self) -> None:
+    async def delete_managed_roles(
+        self,
+        guild: discord.Guild,
+        member_id: int
+    ) -> None:
         """
-        Remove roles that are not assigned to any member in the guild.
+        Remove the roles the bot created for the member.
+
+        Note:
+            A role is unregistered only once it is deleted on Discord
+            or found to be gone already, so a failed deletion
+            is retried by the next reconciliation.
+
+        Args:
+            guild (discord.Guild): The guild of the member.
+            member_id (int): ID of the member whose roles to remove.
 
         Returns:
             None
         """
-        guilds = self.bot.guilds
-        for guild in guilds:
-            for role in guild.roles:
-                if len(role.members) == 0:
-                    await role.delete()
+        role_ids = await get_user_managed_roles(
+            discord_id=member_id,
+            guild_id=guild.id
+        )
+        for role_id in role_ids:
+            role = guild.get_role(role_id)
+            if role:
+                try:
+                    await role.delete(reason='Role owner left the server')
+                except discord.NotFound:
+                    pass
+                except discord.HTTPException as error:
+                    logging.error(
+                        f'Could not delete role {role_id}: {error}'
+                    )
+                    continue
+            await remove_managed_role(role_id=role_id)
+
+    async def fetch_member_ids(self) -> Dict[int, Set[int]]:
+        """
+        Stream the members of every guild the bot is in, page by page.
+
+        Returns:
+            Dict[int, Set[int]]: Member IDs keyed by guild ID.
+
+        Raises:
+            discord.HTTPException: If fetching the members failed.
+        """
+        member_ids_by_guild = {}
+        for guild in self.bot.guilds:
+            member_ids = set()
+            async for member in guild.fetch_members(limit=None):
+                member_ids.add(member.id)
+            member_ids_by_guild[guild.id] = member_ids
+
+        return member_ids_by_guild
+
+    async def exclude_remote_members(self, discord_ids: Set[int]) -> Set[int]:
+        """
+        Keep only the users who are not members of the guilds
+        of the other clusters.
+
+        Note:
+            The other clusters are asked in batches. If one of them
+            doesn't answer, nobody is kept, so users are never removed
+            on a partial view of the guilds.
+
+        Args:
+            discord_ids (Set[int]): Discord IDs of the users
+            who are not members of this cluster's guilds.
+
+        Returns:
+            Set[int]: Discord IDs of the users who are not members
+            of any guild.
+        """
+        if self.bot.ipc is None or not discord_ids:
+            return discord_ids
+
+        remaining = set(discord_ids)
+        for batch in discord.utils.as_chunks(
+            discord_ids,
+            MEMBERS_RECONCILIATION_BATCH_SIZE
+        ):
+            try:
+                replies = await self.bot.ipc.request(
+                    'filter_members',
+                    {
+                        'run': self.reconciled_at,
+                        'requested_by': CLUSTER_ID,
+                        'discord_ids': batch,
+                    },
+                    timeout=MEMBERS_RECONCILIATION_TIMEOUT_SECONDS
+                )
+            except (ConnectionError, asyncio.TimeoutError) as error:
+                logging.error(
+                    f'[Reconciliation] Could not reach the clusters: '
+                    f'{error!r}'
+                )
+                return set()
+
+            failed = set(range(CLUSTER_COUNT)) - {
+                cluster_id
+                for cluster_id, reply in replies.items()
+                if 'error' not in reply
+            }
+            if failed:
+                logging.error(
+                    f'[Reconciliation] Clusters {sorted(failed)} did not '
+                    f'report their members, keeping the users'
+                )
+                return set()
+
+            for reply in replies.values():
+                remaining.difference_update(reply['data'])
+
+        return remaining
+
+    async def handle_filter_members_call(
+        self,
+        payload: Dict[str, Any]
+    ) -> List[int]:
+        """
+        Answers which of the users asked about by the reconciling
+        cluster are members of this cluster's guilds.
+
+        Note:
+            The members are fetched once per reconciliation run
+            and reused for the following batches of the run.
+
+        Args:
+            payload (Dict[str, Any]): The call arguments with the run,
+            the requesting cluster and the Discord IDs of the users.
+
+        Returns:
+            List[int]: Discord IDs of the users who are members.
+        """
+        if payload['requested_by'] == CLUSTER_ID:
+            return []
+
+        if self._members_run != payload['run']:
+            self._members = set().union(
+                *(await self.fetch_member_ids()).values()
+            )
+            self._members_run = payload['run']
+
+        return [
+            discord_id
+            for discord_id in payload['discord_ids']
+            if discord_id in self._members
+        ]
+
+    async def remove_orphaned_roles(
+        self,
+        guild: discord.Guild,
+        member_ids: Set[int]
+    ) -> int:
+        """
+        Remove the managed roles of the guild whose owner left.
+
+        Note:
+            A role is unregistered once it is deleted on Discord
+            or found to be gone already. Roles that could not be
+            deleted stay registered for the next reconciliation.
+
+        Args:
+            guild (discord.Guild): The guild.
+            member_ids (Set[int]): IDs of the guild's members.
+
+        Returns:
+            int: Number of roles deleted on Discord.
+        """
+        orphaned_roles = [
+            role_id
+            for discord_id, role_id in await get_managed_roles(
+                guild_id=guild.id
+            )
+            if discord_id not in member_ids
+        ]
+
+        deleted = 0
+        for batch in discord.utils.as_chunks(
+            orphaned_roles,
+            MEMBERS_RECONCILIATION_BATCH_SIZE
+        ):
+            unregistered = []
+            for role_id in batch:
+                role = guild.get_role(role_id)
+                if role:
+                    try:
+                        await role.delete(reason='Role owner left the server')
+                        deleted += 1
+                    except discord.NotFound:
+                        pass
+                    except discord.HTTPException as error:
+                        logging.error(
+                            f'[Reconciliation] Could not delete '
+                            f'role {role_id}: {error}'
+                        )
+                        continue
+                unregistered.append(role_id)
+            if unregistered:
+                await remove_managed_role_ids(role_ids=unregistered)
+
+        return deleted
+
+    @tasks.loop(hours=MEMBERS_RECONCILIATION_INTERVAL_HOURS)
+    async def reconcile_members(self) -> None:
+        """
+        Remove the users, user-waifu links and managed roles
+        of members who left while the bot was offline.
+
+        Note:
+            Every cluster removes the orphaned roles of its own guilds.
+            Users are removed by the first cluster only, once every
+            cluster confirmed they are not members of its guilds.
+
+        Returns:
+            None
+        """
+        self.reconciled_at = time.monotonic()
+        started = time.perf_counter()
+        try:
+            member_ids_by_guild = await self.fetch_member_ids()
+        except discord.HTTPException as error:
+            logging.error(f'[Reconciliation] Could not fetch members: {error}')
+            return
+
+        member_ids = set().union(*member_ids_by_guild.values())
+        if not member_ids:
+            return
+
+        removed_users = 0
+        if CLUSTER_ID == 0:
+            orphaned_users = await self.exclude_remote_members(
+                await get_user_discord_ids() - member_ids
+            )
+            for batch in discord.utils.as_chunks(
+                orphaned_users,
+                MEMBERS_RECONCILIATION_BATCH_SIZE
+            ):
+                removed_users += await remove_users_and_userwaifulinks(
+                    discord_ids=batch
+                )
+                await self.bot.forget_users_everywhere(batch)
+
+        removed_roles = 0
+        for guild in self.bot.guilds:
+            try:
+                removed_roles += await self.remove_orphaned_roles(
+                    guild=guild,
+                    member_ids=member_ids_by_guild[guild.id]
+                )
+            except Exception as error:
+                logging.exception(
+                    f'[Reconciliation] Could not reconcile the roles '
+                    f'of guild {guild.id}: {error}'
+                )
+
+        logging.info(
+            f'[Reconciliation] Removed {removed_users} user(s) and '
+            f'{removed_roles} role(s) in '
+            f'{time.perf_counter() - started:.2f}s'
+        )
+
+    @reconcile_members.error
+    async def reconcile_members_error(self, error: Exception) -> None:
+        """
+        Log an unexpected reconciliation error and restart the loop,
+        so a single failure doesn't stop reconciliation until restart.
+
+        Args:
+            error (Exception): The error that stopped the loop.
+        """
+        logging.exception(
+            f'[Reconciliation] Failed, retrying next interval: {error}',
+            exc_info=error
+        )
+        self.reconcile_members.restart()
+
+    @reconcile_members.before_loop
+    async def before_reconcile_members(self) -> None:
+        """
+        Wait until the bot is ready before the first reconciliation.
+        After a reload, wait for the rest of the interval instead
+        of reconciling again right away.
+        """
+        await self.bot.wait_until_ready()
+        if self.reconciled_at is not None:
+            await asyncio.sleep(max(
+                0.0,
+                MEMBERS_RECONCILIATION_INTERVAL_HOURS * 3600
+                - (time.monotonic() - self.reconciled_at)
+            ))
 
     @commands.Cog.listener()
     async def on_member_join(self, member: discord.Member) -> None:
@@ -579,50 +972,111 @@ class UserInteractionCog(commands.Cog):
         Returns:
             None
         """
-        current_hour = time.localtime().tm_hour
-        if 6 <= current_hour < 12:
-            current_hour = 'Ohayou'
-        elif 12 <= current_hour < 18:
-            current_hour = 'Konnichiwa'
-        elif 18 <= current_hour < 23:
-            current_hour = 'Konbanwa'
-        else:
-            current_hour = 'Oyasumi nasai'
-        nickname = member.mention
-        greetings_channel = await self.bot.fetch_channel(GREETINGS_CHANNEL)
-        await greetings_channel.send(
-            USER_INTERACTION_ANSWERS[
-                'greetings'
-            ].format(
-                nickname=nickname,
-                current_hour=current_hour
-            ),
-            suppress_embeds=True
-        )
+        self.member_index.update(member)
+        await self.greetings.add(member)
 
     @commands.Cog.listener()
-    async def on_member_remove(
+    async def on_raw_member_remove(
         self,
-        member: discord.Member,
+        payload: discord.RawMemberRemoveEvent,
     ) -> None:
         """
         Event handler for when a member leaves the server.
 
+        Note:
+            The raw event is dispatched even if the member
+            was not cached, which is the usual case in lean mode.
+
         Args:
-            member (discord.Member): The member who left the server.
+            payload (discord.RawMemberRemoveEvent): The event payload.
 
         Returns:
             None
         """
+        member_id = payload.user.id
+        self.member_index.discard(
+            guild_id=payload.guild_id,
+            member_id=member_id
+        )
 
-        try:
-            await self.remove_unused_roles()
-        except Forbidden as error:
-            logging.exception(error)
+        guild = self.bot.get_guild(payload.guild_id)
+        if guild:
+            await self.delete_managed_roles(
+                guild=guild,
+                member_id=member_id
+            )
 
         await remove_user_and_userwaifulinks(
-            discord_id=member.id
+            discord_id=member_id
         )
+        await self.bot.forget_users_everywhere([member_id])
+
+    @commands.Cog.listener()
+    async def on_member_update(
+        self,
+        before: discord.Member,
+        after: discord.Member
+    ) -> None:
+        """
+        Event handler for when a member is updated.
+
+        Args:
+            before (discord.Member): The member before the update.
+            after (discord.Member): The member after the update.
+
+        Returns:
+            None
+        """
+        if before.roles != after.roles:
+            self.member_index.update(after)
+
+    @commands.Cog.listener()
+    async def on_guild_role_create(self, role: discord.Role) -> None:
+        """
+        Event handler for when a role is created.
+
+        Args:
+            role (discord.Role): The created role.
+
+        Returns:
+            None
+        """
+        self.role_index.add(role)
+
+    @commands.Cog.listener()
+    async def on_guild_role_update(
+        self,
+        before: discord.Role,
+        after: discord.Role
+    ) -> None:
+        """
+        Event handler for when a role is updated.
+
+        Args:
+            before (discord.Role): The role before the update.
+            after (discord.Role): The role after the update.
+
+        Returns:
+            None
+        """
+        if before.name != after.name:
+            self.role_index.discard(before)
+            self.role_index.add(after)
+
+    @commands.Cog.listener()
+    async def on_guild_role_delete(self, role: discord.Role) -> None:
+        """
+        Event handler for when a role is deleted.
+
+        Args:
+            role (discord.Role): The deleted role.
+
+        Returns:
+            None
+        """
+        self.role_index.discard(role)
+        self.member_index.invalidate(guild_id=role.guild.id)
+        await remove_managed_role(role_id=role.id)
 
     @app_commands.command(
         name='grant_permission',
@@ -681,6 +1135,17 @@ class UserInteractionCog(commands.Cog):
         )
 
         if existing_wiafu_list:
+            pending_grant = self.role_provisioner.pending(
+                guild_id=interaction.guild.id,
+                user_id=discord_id
+            )
+            if pending_grant:
+                await self.create_role_and_permission(
+                    interaction=interaction,
+                    role_name=pending_grant.role_name
+                )
+                return
+
             await interaction.followup.send(
                 USER_INTERACTION_ANSWERS['adding_waifu_err']
             )
@@ -735,7 +1200,7 @@ class UserInteractionCog(commands.Cog):
         Returns:
             None
         """
-        select = ServerUsers()
+        select = ServerUsers(member_index=self.member_index)
         view = discord.ui.View()
 
         view.add_item(select)
@@ -771,16 +1236,15 @@ class UserInteractionCog(commands.Cog):
         """
         waifu_url = urlparse(waifu_url)
         discord_id = interaction.user.id
-        user = await get_user(discord_id=discord_id)
-        waifu = await get_waifu_by_url(waifu_url=waifu_url.path)
 
-        if not user:
+        if await get_user_id(discord_id=discord_id) is None:
             await interaction.response.send_message(
                 USER_INTERACTION_ANSWERS['true_love_no_user_err'],
                 ephemeral=True
             )
             return
 
+        waifu = await get_waifu_by_url(waifu_url=waifu_url.path)
         if not waifu:
             await interaction.response.send_message(
                 USER_INTERACTION_ANSWERS['true_love_url_err'],
@@ -788,24 +1252,32 @@ class UserInteractionCog(commands.Cog):
             )
             return
 
-        user_waifu_connection = await check_user_waifu_connection(
-            user=user,
-            waifu=waifu
-        )
-        if not user_waifu_connection:
+        try:
+            is_set = await set_true_love(
+                discord_id=discord_id,
+                waifu_id=waifu.id
+            )
+        except IntegrityError:
+            await interaction.response.send_message(
+                USER_INTERACTION_ANSWERS['unexpected_error'],
+                ephemeral=True
+            )
+            return
+
+        if not is_set:
             await interaction.response.send_message(
                 USER_INTERACTION_ANSWERS['user_waifu_no_connection'],
                 ephemeral=True
             )
             return
 
-        await set_true_love(user=user, waifu=waifu)
         await interaction.response.send_message(
             USER_INTERACTION_ANSWERS[
                 'added_true_love'
             ].format(waifu=waifu.waifu_name_rus),
             ephemeral=True
         )
+        await self.bot.forget_users_everywhere([discord_id])
 
     @app_commands.command(
         name='delete_true_love',
@@ -823,21 +1295,18 @@ class UserInteractionCog(commands.Cog):
         Returns:
             None
         """
-        discord_id = interaction.user.id
-        user = await get_user(discord_id=discord_id)
-
-        if not user:
+        if not await remove_true_love(discord_id=interaction.user.id):
             await interaction.response.send_message(
                 USER_INTERACTION_ANSWERS['delete_true_love_user_err'],
                 ephemeral=True
             )
             return
 
-        await remove_true_love(user=user)
         await interaction.response.send_message(
             USER_INTERACTION_ANSWERS['deleted_true_love'],
             ephemeral=True
         )
+        await self.bot.forget_users_everywhere([interaction.user.id])
 
     @app_commands.command(
         name='top_waifu',
@@ -938,8 +1407,8 @@ class UserInteractionCog(commands.Cog):
         """
 
         role_name = role_name.lower().strip()
-        guild_role = discord.utils.get(
-            interaction.guild.roles,
+        guild_role = self.role_index.get(
+            guild=interaction.guild,
             name=role_name
         )
 
@@ -1039,8 +1508,8 @@ class UserInteractionCog(commands.Cog):
 
         old_role_name = old_role_name.lower().strip()
         new_role_name = new_role_name.lower().strip()
-        guild_role = discord.utils.get(
-            interaction.guild.roles,
+        guild_role = self.role_index.get(
+            guild=interaction.guild,
             name=old_role_name
         )
 
@@ -1109,3 +1578,13 @@ class UserInteractionCog(commands.Cog):
                 ],
                 ephemeral=True
             )
+
+
+async def setup(bot: commands.Bot) -> None:
+    """
+    Load the UserInteractionCog extension.
+
+    Args:
+        bot (commands.Bot): The bot instance.
+    """
+    await bot.add_cog(UserInteractionCog(bot=bot))
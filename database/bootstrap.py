@@ -0,0 +1,93 @@
+import logging
+
+from typing import Any, Dict, Optional, Union
+
+from tortoise import Tortoise
+from tortoise.backends.base.config_generator import expand_db_url
+
+from settings.settings import (
+    SQLITE_SYNCHRONOUS,
+    SQLITE_CACHE_SIZE,
+    SQLITE_MMAP_SIZE,
+    DATABASE_POOL_MIN_SIZE,
+    DATABASE_POOL_MAX_SIZE,
+)
+
+SQLITE_PRAGMAS = (
+    'journal_mode',
+    'synchronous',
+    'cache_size',
+    'mmap_size',
+    'temp_store',
+    'busy_timeout',
+    'foreign_keys',
+)
+
+POSTGRES_ENGINES = (
+    'tortoise.backends.asyncpg',
+    'tortoise.backends.psycopg',
+)
+
+
+def build_connection_config(
+    db_url: Optional[str]
+) -> Union[Optional[str], Dict[str, Any]]:
+    """
+    Builds the Tortoise connection config for the database URL.
+
+    SQLite connections get WAL journaling and tuned synchronous,
+    cache and mmap pragmas. Postgres connections get explicit pool
+    sizes. Parameters given in the URL query take precedence.
+
+    Args:
+        db_url (Optional[str]): The database URL.
+
+    Returns:
+        Union[Optional[str], Dict[str, Any]]: The connection config,
+        or the URL itself if it is not set.
+    """
+    if not db_url:
+        return db_url
+
+    config = expand_db_url(db_url)
+    credentials = config['credentials']
+
+    if config['engine'] == 'tortoise.backends.sqlite':
+        credentials.setdefault('journal_mode', 'WAL')
+        credentials.setdefault('synchronous', SQLITE_SYNCHRONOUS)
+        credentials.setdefault('cache_size', SQLITE_CACHE_SIZE)
+        credentials.setdefault('mmap_size', SQLITE_MMAP_SIZE)
+        credentials.setdefault('temp_store', 'MEMORY')
+        credentials.setdefault('busy_timeout', 5000)
+    elif config['engine'] in POSTGRES_ENGINES:
+        credentials.setdefault('minsize', DATABASE_POOL_MIN_SIZE)
+        credentials.setdefault('maxsize', DATABASE_POOL_MAX_SIZE)
+
+    return config
+
+
+async def log_database_settings() -> None:
+    """
+    Logs the settings the database connection actually runs with.
+    """
+    connection = Tortoise.get_connection('default')
+    dialect = connection.capabilities.dialect
+
+    if dialect == 'sqlite':
+        settings = {}
+        for pragma in SQLITE_PRAGMAS:
+            rows = await connection.execute_query_dict(f'PRAGMA {pragma}')
+            settings[pragma] = next(iter(rows[0].values())) if rows else None
+    elif dialect == 'postgres':
+        settings = {
+            'pool_minsize': connection.pool_minsize,
+            'pool_maxsize': connection.pool_maxsize,
+        }
+    else:
+        settings = {}
+
+    logging.info(
+        f'[Database] {dialect}: ' + ', '.join(
+            f'{name}={value}' for name, value in settings.items()
+        )
+    )
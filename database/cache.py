@@ -0,0 +1,86 @@
+from collections import OrderedDict
+
+from typing import Any, Hashable
+
+from settings.settings import WAIFU_RENDER_CACHE_SIZE, USER_CACHE_SIZE
+
+
+class LRUCache:
+    """
+    A bounded mapping that evicts the least recently used entries.
+
+    Attributes:
+        maxsize (int): Maximum number of entries.
+        generation (int): Number of invalidations so far, compared
+        before and after loading a value to detect that it was
+        invalidated while it was being loaded.
+        _data (OrderedDict): Cached entries, the most recently
+        used ones at the end.
+    """
+
+    def __init__(self, maxsize: int) -> None:
+        """
+        Initialize the LRUCache.
+
+        Args:
+            maxsize (int): Maximum number of entries.
+        """
+        self.maxsize = max(1, maxsize)
+        self.generation = 0
+        self._data: OrderedDict = OrderedDict()
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._data
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """
+        Get a cached value and mark it as recently used.
+
+        Args:
+            key (Hashable): The key.
+            default (Any): Value returned if the key is not cached.
+
+        Returns:
+            Any: The cached value or the default.
+        """
+        if key not in self._data:
+            return default
+        self._data.move_to_end(key)
+        return self._data[key]
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """
+        Cache a value, evicting the least recently used entry if full.
+
+        Args:
+            key (Hashable): The key.
+            value (Any): The value.
+        """
+        self._data[key] = value
+        self._data.move_to_end(key)
+        if len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def pop(self, key: Hashable) -> None:
+        """
+        Remove a cached value if present.
+
+        Args:
+            key (Hashable): The key.
+        """
+        self.generation += 1
+        self._data.pop(key, None)
+
+    def clear(self) -> None:
+        """
+        Remove every cached value.
+        """
+        self.generation += 1
+        self._data.clear()
+
+
+waifu_render_cache = LRUCache(maxsize=WAIFU_RENDER_CACHE_SIZE)
+user_id_cache = LRUCache(maxsize=USER_CACHE_SIZE)
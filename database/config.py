@@ -1,7 +1,9 @@
 from settings.settings import DATABASE_URL
 
+from database.bootstrap import build_connection_config
+
 TORTOISE_ORM = {
-    'connections': {'default': DATABASE_URL},
+    'connections': {'default': build_connection_config(DATABASE_URL)},
     'apps': {
         'models': {
             'models': ['database.user.models', 'aerich.models'],
@@ -9,3 +11,5 @@ TORTOISE_ORM = {
         },
     },
 }
+
+MIGRATIONS_LOCATION = './migrations'
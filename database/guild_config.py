@@ -0,0 +1,192 @@
+import logging
+
+from typing import (
+    Any,
+    Dict,
+    FrozenSet,
+    Iterable,
+    NamedTuple,
+    Optional,
+    Tuple,
+)
+
+from database.user.models import GuildConfig
+
+from settings.settings import (
+    DISCORD_VOICE_CATEGORIES_ID,
+    DISCORD_TEXT_CATEGORIES_ID,
+    GREETINGS_CHANNEL,
+    MESSAGE_NOT_ALLOWED_TEXT_CHANNELS_ID,
+)
+
+GUILD_CONFIG_FIELDS = (
+    'voice_categories_id',
+    'text_categories_id',
+    'greetings_channel_id',
+    'restricted_channels_id',
+)
+
+
+def parse_ids(ids: Optional[str]) -> Tuple[int, ...]:
+    """
+    Parse a comma separated list of Discord IDs.
+
+    Args:
+        ids (Optional[str]): Comma separated IDs.
+
+    Returns:
+        Tuple[int, ...]: IDs without duplicates, in the original order.
+    """
+    if not ids:
+        return ()
+
+    return tuple(dict.fromkeys(
+        int(discord_id)
+        for discord_id in ids.split(',')
+        if discord_id.strip()
+    ))
+
+
+class GuildSettings(NamedTuple):
+    """
+    Resolved settings of a guild.
+    """
+    voice_categories_id: Tuple[int, ...]
+    text_categories_id: Tuple[int, ...]
+    greetings_channel_id: Optional[int]
+    restricted_channels_id: FrozenSet[int]
+
+
+DEFAULT_GUILD_SETTINGS = GuildSettings(
+    voice_categories_id=parse_ids(DISCORD_VOICE_CATEGORIES_ID),
+    text_categories_id=parse_ids(DISCORD_TEXT_CATEGORIES_ID),
+    greetings_channel_id=int(GREETINGS_CHANNEL) if GREETINGS_CHANNEL else None,
+    restricted_channels_id=frozenset(
+        parse_ids(MESSAGE_NOT_ALLOWED_TEXT_CHANNELS_ID)
+    ),
+)
+
+
+def resolve_settings(config: GuildConfig) -> GuildSettings:
+    """
+    Resolve a stored config, filling empty fields with the defaults.
+
+    Args:
+        config (GuildConfig): The stored config.
+
+    Returns:
+        GuildSettings: The settings of the guild.
+    """
+    default = DEFAULT_GUILD_SETTINGS
+    return GuildSettings(
+        voice_categories_id=(
+            tuple(config.voice_categories_id)
+            if config.voice_categories_id is not None
+            else default.voice_categories_id
+        ),
+        text_categories_id=(
+            tuple(config.text_categories_id)
+            if config.text_categories_id is not None
+            else default.text_categories_id
+        ),
+        greetings_channel_id=(
+            config.greetings_channel_id
+            if config.greetings_channel_id is not None
+            else default.greetings_channel_id
+        ),
+        restricted_channels_id=(
+            frozenset(config.restricted_channels_id)
+            if config.restricted_channels_id is not None
+            else default.restricted_channels_id
+        ),
+    )
+
+
+class GuildConfigCache:
+    """
+    In-memory copy of every guild's settings.
+
+    The configs are loaded once at startup, lookups never query
+    the database. Edits go through `update`, which stores the config
+    and refreshes the cached settings of the guild.
+
+    Attributes:
+        _settings (Dict[int, GuildSettings]): Settings keyed
+        by guild ID, guilds without a stored config are missing.
+    """
+
+    def __init__(self) -> None:
+        """
+        Initialize the GuildConfigCache.
+        """
+        self._settings: Dict[int, GuildSettings] = {}
+
+    def get(self, guild_id: int) -> GuildSettings:
+        """
+        Get the settings of a guild.
+
+        Args:
+            guild_id (int): ID of the guild.
+
+        Returns:
+            GuildSettings: The stored settings, the defaults
+            from the environment variables if there are none.
+        """
+        return self._settings.get(guild_id, DEFAULT_GUILD_SETTINGS)
+
+    async def load(self) -> None:
+        """
+        Load the configs of every guild.
+        """
+        self._settings = {
+            config.guild_id: resolve_settings(config)
+            for config in await GuildConfig.all()
+        }
+        logging.info(f'[GuildConfig] Loaded {len(self._settings)} configs')
+
+    async def reload(self, guild_ids: Iterable[int]) -> None:
+        """
+        Reload the configs of the guilds, e.g. after another process
+        edited them.
+
+        Args:
+            guild_ids (Iterable[int]): IDs of the guilds.
+        """
+        guild_ids = list(guild_ids)
+        for guild_id in guild_ids:
+            self._settings.pop(guild_id, None)
+        for config in await GuildConfig.filter(guild_id__in=guild_ids):
+            self._settings[config.guild_id] = resolve_settings(config)
+
+    async def update(
+        self,
+        guild_id: int,
+        **fields: Any
+    ) -> GuildSettings:
+        """
+        Store the given fields of a guild's config.
+
+        Args:
+            guild_id (int): ID of the guild.
+            **fields (Any): Values of the GuildConfig fields,
+            None resets a field to the default.
+
+        Returns:
+            GuildSettings: The new settings of the guild.
+
+        Raises:
+            ValueError: If an unknown field is given.
+        """
+        unknown = set(fields) - set(GUILD_CONFIG_FIELDS)
+        if unknown:
+            raise ValueError(f'Unknown guild config fields: {unknown}')
+
+        config, _ = await GuildConfig.update_or_create(
+            guild_id=guild_id,
+            defaults=fields
+        )
+        self._settings[guild_id] = resolve_settings(config)
+        return self._settings[guild_id]
+
+
+guild_config_cache = GuildConfigCache()
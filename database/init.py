@@ -1,30 +1,206 @@
-from tortoise import Tortoise, run_async
+import os
+
+import logging
+
+from pathlib import Path
+
+from types import ModuleType
+
+from typing import List, Optional
+
+from tortoise import BaseDBAsyncClient, Tortoise, run_async
+from tortoise.exceptions import OperationalError
+from tortoise.transactions import in_transaction
+
+from aerich import Command
+from aerich.migrate import Migrate
+from aerich.models import Aerich
+from aerich.utils import (
+    get_app_connection,
+    get_app_connection_name,
+    get_models_describe,
+    import_py_file,
+)
 
 from database import config
+from database.bootstrap import log_database_settings
+
+from error_handlers.custom_exceptions import SchemaVersionError
+
+MIGRATIONS_APP = 'models'
+
+
+def get_latest_migration() -> Optional[str]:
+    """
+    Gets the name of the newest migration file shipped with the bot.
+
+    Returns:
+        Optional[str]: The migration file name, None if there are none.
+    """
+    location = os.path.join(config.MIGRATIONS_LOCATION, MIGRATIONS_APP)
+    if not os.path.isdir(location):
+        return None
+
+    migrations = [
+        file_name for file_name in os.listdir(location)
+        if file_name.endswith('.py') and file_name.split('_', 1)[0].isdigit()
+    ]
+    if not migrations:
+        return None
+
+    return max(migrations, key=lambda file_name: int(file_name.split('_')[0]))
+
+
+async def get_applied_migration() -> Optional[str]:
+    """
+    Gets the name of the newest migration applied to the database.
+
+    Returns:
+        Optional[str]: The migration file name, None if the database
+        has not been migrated yet.
+    """
+    try:
+        applied = await Aerich.filter(
+            app=MIGRATIONS_APP
+        ).order_by('-id').first()
+    except OperationalError:
+        return None
+
+    return applied.version if applied else None
+
+
+async def apply_migration(
+    connection: BaseDBAsyncClient,
+    migration: ModuleType,
+    version_file: str
+) -> None:
+    """
+    Applies a migration and records it as applied.
+
+    Args:
+        connection (BaseDBAsyncClient): The connection
+        or transaction to run the migration on.
+        migration (ModuleType): The migration module.
+        version_file (str): The migration file name.
+    """
+    await connection.execute_script(await migration.upgrade(connection))
+    await Aerich.create(
+        version=version_file,
+        app=MIGRATIONS_APP,
+        content=get_models_describe(MIGRATIONS_APP),
+        using_db=connection
+    )
+
+
+async def migrate() -> List[str]:
+    """
+    Applies the migrations the database is missing.
+
+    Note:
+        Every migration runs in its own transaction, except on
+        Postgres for the ones declaring `RUN_IN_TRANSACTION = False`,
+        which build their indexes concurrently without blocking
+        writes. SQLite can't build indexes concurrently,
+        so it always runs them in a transaction.
+        Tortoise is initialized by aerich and left open.
+
+    Returns:
+        List[str]: File names of the applied migrations.
+    """
+    command = Command(
+        tortoise_config=config.TORTOISE_ORM,
+        app=MIGRATIONS_APP,
+        location=config.MIGRATIONS_LOCATION
+    )
+    await command.init()
+    connection = get_app_connection(config.TORTOISE_ORM, MIGRATIONS_APP)
+    postgres = connection.capabilities.dialect == 'postgres'
+
+    applied = []
+    for version_file in Migrate.get_all_version_files():
+        try:
+            exists = await Aerich.exists(
+                version=version_file,
+                app=MIGRATIONS_APP
+            )
+        except OperationalError:
+            exists = False
+        if exists:
+            continue
+
+        migration = import_py_file(
+            Path(Migrate.migrate_location, version_file)
+        )
+        if postgres and not getattr(migration, 'RUN_IN_TRANSACTION', True):
+            await apply_migration(connection, migration, version_file)
+        else:
+            async with in_transaction(
+                get_app_connection_name(config.TORTOISE_ORM, MIGRATIONS_APP)
+            ) as transaction:
+                await apply_migration(transaction, migration, version_file)
+        logging.info(f'[Database] Applied migration {version_file}')
+        applied.append(version_file)
+
+    return applied
 
 
 async def init() -> None:
     """
-    Initializes Tortoise ORM and generates database schemas.
+    Initializes Tortoise ORM and checks the database schema version.
 
     Note:
         This function initializes Tortoise ORM
-        with the provided database URL and modules,
-        and generates the database schemas.
+        with the tuned connection config and modules,
+        and logs the effective database settings.
+        It doesn't migrate: the migrations are applied once
+        by `upgrade_schema` before the bot processes start,
+        so several processes never race to upgrade the schema.
 
     Raises:
         tortoise.exceptions.ConfigurationError:
         If there's a configuration error.
+        SchemaVersionError: If the database is behind
+        the shipped migrations.
     """
-    await Tortoise.init(
-        db_url=config.DATABASE_URL,
-        modules={'models': ['database.user.models', 'aerich.models']}
-    )
+    await Tortoise.init(config=config.TORTOISE_ORM)
+
+    latest = get_latest_migration()
+    applied = await get_applied_migration()
+
+    if latest and applied != latest:
+        await Tortoise.close_connections()
+        raise SchemaVersionError(
+            f'Schema version {applied} is behind {latest}, '
+            f'run `python -m database.init` to apply the migrations'
+        )
+
+    logging.info(f'[Database] Schema version {applied} is up to date')
+    await log_database_settings()
+
+
+async def upgrade_schema() -> None:
+    """
+    Applies the missing migrations, if the database is behind.
+    """
+    await Tortoise.init(config=config.TORTOISE_ORM)
+    applied = await get_applied_migration()
+    latest = get_latest_migration()
+    await Tortoise.close_connections()
+
+    if latest and applied != latest:
+        logging.info(
+            f'[Database] Schema version {applied} is behind {latest}, '
+            f'applying migrations'
+        )
+        await migrate()
+    else:
+        logging.info(f'[Database] Schema version {applied} is up to date')
 
-    await Tortoise.generate_schemas()
+    await Tortoise.close_connections()
 
 if __name__ == '__main__':
     """
-    Entry point for initializing the database and generating schemas.
+    Entry point for applying the migrations before the bot starts.
     """
-    run_async(init())
+    logging.basicConfig(level=logging.INFO)
+    run_async(upgrade_schema())
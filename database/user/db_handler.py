@@ -1,6 +1,91 @@
-from typing import Dict, Any, Optional, List
+from typing import (
+    Dict,
+    Any,
+    Optional,
+    List,
+    Set,
+    Tuple,
+    Iterable,
+    NamedTuple,
+)
 
-from database.user.models import User, Waifu, UserWaifuLink
+from tortoise.transactions import in_transaction
+
+from database.cache import waifu_render_cache, user_id_cache
+from database.user.models import User, Waifu, UserWaifuLink, ManagedRole
+
+from settings.settings import CLUSTER_COUNT
+
+
+class UserWaifu(NamedTuple):
+    """
+    Lightweight row describing a waifu in a user's list.
+    """
+    true_love: bool
+    waifu_name_rus: str
+    url: str
+    alt_name: str
+    japanese_name: str
+    shikimori_id: int
+
+
+def _cache_user_id(discord_id: int, user_id: Optional[int]) -> None:
+    """
+    Caches the primary key of a user, or that the user doesn't exist.
+
+    Note:
+        Misses are cached only when the bot runs in a single process,
+        otherwise a user created by another cluster would stay
+        missing here until evicted.
+
+    Args:
+        discord_id (int): Discord ID of the user.
+        user_id (Optional[int]): Primary key of the User,
+        None if there is none.
+    """
+    if user_id is None and CLUSTER_COUNT > 1:
+        user_id_cache.pop(discord_id)
+        return
+    user_id_cache.set(discord_id, user_id)
+
+
+def forget_users(discord_ids: Iterable[int]) -> None:
+    """
+    Drops the cached lookups and renders of users,
+    after another cluster changed them.
+
+    Args:
+        discord_ids (Iterable[int]): Discord IDs of the users.
+    """
+    for discord_id in discord_ids:
+        user_id_cache.pop(discord_id)
+        waifu_render_cache.pop(discord_id)
+
+
+async def get_user_id(discord_id: int) -> Optional[int]:
+    """
+    Resolves a Discord ID to the primary key of its User.
+
+    Note:
+        Results are kept in a bounded LRU cache, including misses
+        in a single process, so repeated lookups of the same user
+        skip the database.
+
+    Args:
+        discord_id (int): Discord ID of the user.
+
+    Returns:
+        Optional[int]: Primary key of the User if found, None if not.
+    """
+    if discord_id in user_id_cache:
+        return user_id_cache.get(discord_id)
+
+    user_id = await User.filter(
+        discord_id=discord_id
+    ).first().values_list('id', flat=True)
+    _cache_user_id(discord_id=discord_id, user_id=user_id)
+
+    return user_id
 
 
 async def add_waifu_to_user(
@@ -19,14 +104,18 @@ async def add_waifu_to_user(
         a UserWaifuLink for the user and existing waifu.
         If the waifu doesn't exist, creates a new waifu and UserWaifuLink.
     """
-    user, _ = await User.get_or_create(discord_id=discord_id)
+    user_id = await get_user_id(discord_id=discord_id)
+    if user_id is None:
+        user, _ = await User.get_or_create(discord_id=discord_id)
+        user_id = user.id
+        _cache_user_id(discord_id=discord_id, user_id=user_id)
 
     waifu_id = waifu_data['id']
     existing_waifu = await Waifu.filter(shikimori_id=str(waifu_id)).first()
 
     if existing_waifu:
         await UserWaifuLink.create(
-            user_id=user.id,
+            user_id=user_id,
             waifu_id=existing_waifu.id,
             is_true_love_set=False
         )
@@ -42,11 +131,13 @@ async def add_waifu_to_user(
         )
 
         await UserWaifuLink.create(
-            user_id=user.id,
+            user_id=user_id,
             waifu_id=waifu.id,
             is_true_love_set=False
         )
 
+    waifu_render_cache.pop(discord_id)
+
 
 async def check_user_waifu_link_exists(discord_id: int) -> Optional[bool]:
     """
@@ -59,48 +150,42 @@ async def check_user_waifu_link_exists(discord_id: int) -> Optional[bool]:
         Optional[bool]: True if a link exists,
         False if not, None if user doesn't exist.
     """
-    user = await User.filter(discord_id=discord_id).first()
-    if user:
-        return await UserWaifuLink.filter(user_id=user.id).exists()
+    user_id = await get_user_id(discord_id=discord_id)
+    if user_id is not None:
+        return await UserWaifuLink.filter(user_id=user_id).exists()
     else:
         return None
 
 
-async def get_user_waifus(discord_id: int) -> Optional[List[UserWaifuLink]]:
+async def get_user_waifus(discord_id: int) -> Optional[List[UserWaifu]]:
     """
-    Gets a list of waifus associated with a user.
+    Gets a list of waifus associated with a user in a single joined query.
 
     Args:
         discord_id (int): Discord ID of the user.
 
     Returns:
-        Optional[List[UserWaifuLink]]: List of UserWaifuLink
-        instances if waifus found, None if not.
+        Optional[List[UserWaifu]]: List of UserWaifu
+        rows if waifus found, None if not.
     """
-    user = await User.get_or_none(discord_id=discord_id)
-    if not user:
+    user_id = await get_user_id(discord_id=discord_id)
+    if user_id is None:
         return None
 
     waifus = await UserWaifuLink.filter(
-        user_id=user.id
-    ).prefetch_related('waifu').all()
+        user_id=user_id
+    ).order_by('id').values_list(
+        'true_love',
+        'waifu__waifu_name_rus',
+        'waifu__url',
+        'waifu__alt_name',
+        'waifu__japanese_name',
+        'waifu__shikimori_id'
+    )
     if not waifus:
         return None
 
-    return waifus
-
-
-async def get_user(discord_id: int) -> Optional[User]:
-    """
-    Gets a User instance by Discord ID.
-
-    Args:
-        discord_id (int): Discord ID of the user.
-
-    Returns:
-        Optional[User]: User instance if found, None if not.
-    """
-    return await User.get_or_none(discord_id=discord_id)
+    return [UserWaifu(*waifu) for waifu in waifus]
 
 
 async def get_waifu_by_url(waifu_url: str) -> Optional[Waifu]:
@@ -116,47 +201,72 @@ async def get_waifu_by_url(waifu_url: str) -> Optional[Waifu]:
     return await Waifu.filter(url=waifu_url).first()
 
 
-async def check_user_waifu_connection(
-        user: User,
-        waifu: Waifu
-) -> Optional[UserWaifuLink]:
+async def set_true_love(discord_id: int, waifu_id: int) -> Optional[bool]:
     """
-    Checks if a connection exists between a user and a waifu.
+    Sets the "true love" status between a user and a waifu.
+
+    Note:
+        The current true love link is cleared and the new one is set
+        in a single transaction, touching only the two affected rows.
+        The partial unique index on the user's true love link
+        rejects a second true love from a concurrent call.
+        A single `SET true_love = (waifu_id = ?)` statement is not
+        used, the unique index is checked row by row and would fail
+        when the new link is updated before the old one.
 
     Args:
-        user (User): User instance.
-        waifu (Waifu): Waifu instance.
+        discord_id (int): Discord ID of the user.
+        waifu_id (int): Primary key of the waifu.
 
     Returns:
-        Optional[UserWaifuLink]: UserWaifuLink instance
-        if connection exists, None if not.
-    """
-    return await UserWaifuLink.get_or_none(user=user.id, waifu=waifu.id)
-
+        Optional[bool]: True if the status was set, False if the user
+        has no such waifu, None if the user is not found.
 
-async def set_true_love(user: User, waifu: Waifu) -> None:
+    Raises:
+        tortoise.exceptions.IntegrityError: If a concurrent call
+        set another true love for the user first.
     """
-    Sets the "true love" status between a user and a waifu.
+    user_id = await get_user_id(discord_id=discord_id)
+    if user_id is None:
+        return None
 
-    Args:
-        user (User): User instance.
-        waifu (Waifu): Waifu instance.
-    """
-    await UserWaifuLink.filter(user=user.id).update(true_love=False)
-    await UserWaifuLink.filter(
-        user=user.id,
-        waifu=waifu.id
-    ).update(true_love=True)
+    async with in_transaction() as connection:
+        await UserWaifuLink.filter(
+            user_id=user_id,
+            true_love=True
+        ).exclude(waifu_id=waifu_id).update(true_love=False)
+        updated = await UserWaifuLink.filter(
+            user_id=user_id,
+            waifu_id=waifu_id
+        ).update(true_love=True)
+        if not updated:
+            await connection.rollback()
+            return False
+
+    waifu_render_cache.pop(discord_id)
+    return True
 
 
-async def remove_true_love(user: User) -> None:
+async def remove_true_love(discord_id: int) -> bool:
     """
     Removes the "true love" status for a user.
 
     Args:
-        user (User): User instance.
+        discord_id (int): Discord ID of the user.
+
+    Returns:
+        bool: True if the user is found, False if not.
     """
-    await UserWaifuLink.filter(user=user.id).update(true_love=False)
+    user_id = await get_user_id(discord_id=discord_id)
+    if user_id is None:
+        return False
+
+    await UserWaifuLink.filter(
+        user_id=user_id,
+        true_love=True
+    ).update(true_love=False)
+    waifu_render_cache.pop(discord_id)
+    return True
 
 
 async def count_waifus() -> Optional[List[List[Any]]]:
@@ -200,8 +310,119 @@ async def remove_user_and_userwaifulinks(discord_id: int) -> None:
     Args:
         discord_id (int): Discord ID of the user.
     """
-    user = await User.get_or_none(discord_id=discord_id)
+    user_id = await get_user_id(discord_id=discord_id)
+
+    if user_id is not None:
+        await UserWaifuLink.filter(user_id=user_id).delete()
+        await User.filter(id=user_id).delete()
+    _cache_user_id(discord_id=discord_id, user_id=None)
+    waifu_render_cache.pop(discord_id)
+
+
+async def get_user_discord_ids() -> Set[int]:
+    """
+    Gets the Discord IDs of all stored users.
 
-    if user:
-        await UserWaifuLink.filter(user_id=user.id).delete()
-        await user.delete()
+    Returns:
+        Set[int]: Discord IDs of the users.
+    """
+    return set(await User.all().values_list('discord_id', flat=True))
+
+
+async def remove_users_and_userwaifulinks(discord_ids: Iterable[int]) -> int:
+    """
+    Removes several users and all their user-waifu links at once.
+
+    Args:
+        discord_ids (Iterable[int]): Discord IDs of the users.
+
+    Returns:
+        int: Number of removed users.
+    """
+    discord_ids = list(discord_ids)
+    for discord_id in discord_ids:
+        _cache_user_id(discord_id=discord_id, user_id=None)
+        waifu_render_cache.pop(discord_id)
+
+    user_ids = await User.filter(
+        discord_id__in=discord_ids
+    ).values_list('id', flat=True)
+    if not user_ids:
+        return 0
+
+    async with in_transaction():
+        await UserWaifuLink.filter(user_id__in=user_ids).delete()
+        await User.filter(id__in=user_ids).delete()
+
+    return len(user_ids)
+
+
+async def add_managed_role(
+        discord_id: int,
+        guild_id: int,
+        role_id: int
+) -> None:
+    """
+    Registers a role created by the bot for a user.
+
+    Args:
+        discord_id (int): Discord ID of the role owner.
+        guild_id (int): ID of the guild the role belongs to.
+        role_id (int): Discord ID of the role.
+    """
+    await ManagedRole.update_or_create(
+        role_id=role_id,
+        defaults={'discord_id': discord_id, 'guild_id': guild_id}
+    )
+
+
+async def get_user_managed_roles(discord_id: int, guild_id: int) -> List[int]:
+    """
+    Gets the roles created by the bot for a user in a guild.
+
+    Args:
+        discord_id (int): Discord ID of the role owner.
+        guild_id (int): ID of the guild the roles belong to.
+
+    Returns:
+        List[int]: Discord IDs of the roles.
+    """
+    return list(await ManagedRole.filter(
+        discord_id=discord_id,
+        guild_id=guild_id
+    ).values_list('role_id', flat=True))
+
+
+async def remove_managed_role(role_id: int) -> None:
+    """
+    Unregisters a role created by the bot.
+
+    Args:
+        role_id (int): Discord ID of the role.
+    """
+    await ManagedRole.filter(role_id=role_id).delete()
+
+
+async def get_managed_roles(guild_id: int) -> List[Tuple[int, int]]:
+    """
+    Gets the roles created by the bot in a guild.
+
+    Args:
+        guild_id (int): ID of the guild.
+
+    Returns:
+        List[Tuple[int, int]]: Pairs of owner Discord ID and role ID.
+    """
+    return await ManagedRole.filter(
+        guild_id=guild_id
+    ).values_list('discord_id', 'role_id')
+
+
+async def remove_managed_role_ids(role_ids: Iterable[int]) -> None:
+    """
+    Unregisters several roles created by the bot at once.
+
+    Args:
+        role_ids (Iterable[int]): Discord IDs of the roles.
+    """
+    await ManagedRole.filter(role_id__in=list(role_ids)).delete()
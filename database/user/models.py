@@ -16,7 +16,7 @@ class User(Model):
         __str__(): Returns a string representation of the user.
     """
     id = fields.IntField(pk=True)
-    discord_id = fields.IntField(unique=True)
+    discord_id = fields.BigIntField(unique=True)
 
     waifu_links = fields.ReverseRelation["UserWaifuLink"]
 
@@ -30,7 +30,7 @@ class Waifu(Model):
 
     Attributes:
         id (int): Primary key for the Waifu.
-        shikimori_id (int): Identifier for the waifu on Shikimori.
+        shikimori_id (int): Unique identifier for the waifu on Shikimori.
         waifu_name (str): Name of the waifu.
         waifu_name_rus (str): Russian name of the waifu.
         image (str): URL of the waifu's image.
@@ -44,11 +44,11 @@ class Waifu(Model):
         __str__(): Returns a string representation of the waifu.
     """
     id = fields.IntField(pk=True)
-    shikimori_id = fields.IntField()
+    shikimori_id = fields.IntField(unique=True)
     waifu_name = fields.CharField(max_length=255)
     waifu_name_rus = fields.CharField(max_length=255)
     image = fields.CharField(max_length=255)
-    url = fields.CharField(max_length=255)
+    url = fields.CharField(max_length=255, index=True)
     alt_name = fields.TextField(max_length=1000)
     japanese_name = fields.CharField(max_length=255)
 
@@ -72,13 +72,20 @@ class UserWaifuLink(Model):
     Meta:
         unique_together: Ensures that each user
         can have only one link to each waifu.
+        A partial unique index on `user` for true love links,
+        created by a migration, ensures that each user
+        has at most one true love.
 
     Methods:
         __str__(): Returns a string representation of the link.
     """
     id = fields.IntField(pk=True)
     user = fields.ForeignKeyField("models.User", related_name="waifu_links")
-    waifu = fields.ForeignKeyField("models.Waifu", related_name="user_links")
+    waifu = fields.ForeignKeyField(
+        "models.Waifu",
+        related_name="user_links",
+        index=True
+    )
     true_love = fields.BooleanField(default=False)
 
     class Meta:
@@ -86,3 +93,58 @@ class UserWaifuLink(Model):
 
     def __str__(self):
         return f"{self.user.discord_id} - {self.waifu.waifu_name}"
+
+
+class ManagedRole(Model):
+    """
+    Model class representing a role created by the bot for a user.
+
+    Attributes:
+        id (int): Primary key for the ManagedRole.
+        discord_id (int): Discord ID of the role owner.
+        guild_id (int): ID of the guild the role belongs to.
+        role_id (int): Discord ID of the role.
+
+    Methods:
+        __str__(): Returns a string representation of the managed role.
+    """
+    id = fields.IntField(pk=True)
+    discord_id = fields.BigIntField(index=True)
+    guild_id = fields.BigIntField(index=True)
+    role_id = fields.BigIntField(unique=True)
+
+    def __str__(self):
+        return f"{self.discord_id} - {self.role_id}"
+
+
+class GuildConfig(Model):
+    """
+    Model class representing the settings of a guild.
+
+    Empty fields fall back to the global settings
+    from the environment variables.
+
+    Attributes:
+        id (int): Primary key for the GuildConfig.
+        guild_id (int): Discord ID of the guild.
+        voice_categories_id (list): IDs of the voice categories
+        the granted roles get access to.
+        text_categories_id (list): IDs of the text categories
+        the granted roles get access to.
+        greetings_channel_id (int): ID of the channel
+        new members are greeted in.
+        restricted_channels_id (list): IDs of the channels
+        where members' messages are deleted.
+
+    Methods:
+        __str__(): Returns a string representation of the config.
+    """
+    id = fields.IntField(pk=True)
+    guild_id = fields.BigIntField(unique=True)
+    voice_categories_id = fields.JSONField(null=True)
+    text_categories_id = fields.JSONField(null=True)
+    greetings_channel_id = fields.BigIntField(null=True)
+    restricted_channels_id = fields.JSONField(null=True)
+
+    def __str__(self):
+        return str(self.guild_id)
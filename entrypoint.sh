@@ -1,19 +1,20 @@
 #!/bin/sh
 
-# Определение переменных
-FILE=data/db.*
-DIR=migrations
+# Запись конфигурации aerich (pyproject.toml не попадает в образ)
+aerich init -t database.config.TORTOISE_ORM
 
-# Проверка наличия файла и директории
-if [ -n "$FILE" ] && [ -n "$DIR" ]; then
-  echo "Db files with wildcard $FILE and $DIR folder exist."
-  echo "Starting bot"
-  python3 main.py
+# Применение миграций: создает базу при первом запуске
+# и обновляет схему существующей базы. Каждая миграция идет
+# в своей транзакции, индексы в Postgres строятся без блокировок
+echo "Applying DB migrations"
+python3 -m database.init
+
+# При CLUSTER_COUNT > 1 бот запускается в нескольких процессах,
+# каждый со своим диапазоном шардов
+if [ "${CLUSTER_COUNT:-1}" -gt 1 ]; then
+    echo "Starting bot clusters"
+    python3 -m cluster.launcher
 else
-  echo "Db files with wildcard $FILE and $DIR folder does not exist."
-  echo "Initializing DB"
-  aerich init -t database.config.TORTOISE_ORM
-  aerich init-db
-  echo "Starting bot"
-  python3 main.py
+    echo "Starting bot"
+    python3 main.py
 fi
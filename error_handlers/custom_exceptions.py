@@ -7,3 +7,11 @@ class UserVoiceChannelError(CheckFailure):
 
 class DifferentVoiceChannelsError(CheckFailure):
     pass
+
+
+class RoleProvisioningError(Exception):
+    pass
+
+
+class SchemaVersionError(Exception):
+    pass
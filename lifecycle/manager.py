@@ -0,0 +1,206 @@
+import asyncio
+
+import logging
+
+import signal
+
+import time
+
+from typing import List, Optional
+
+import discord
+from discord import app_commands, Interaction
+from discord.ext import commands
+
+import wavelink
+
+from tortoise import Tortoise
+
+from cogs.answers import SHUTDOWN_ANSWER
+
+from settings.settings import SHUTDOWN_DRAIN_TIMEOUT_SECONDS
+
+# Names discord.py gives to the tasks running command handlers,
+# component callbacks and event listeners.
+DRAINED_TASK_PREFIXES = (
+    'CommandTree-invoker',
+    'discord-ui-view-dispatch-',
+    'discord-ui-modal-dispatch-',
+    'discord.py: on_',
+)
+
+
+class DrainingCommandTree(app_commands.CommandTree):
+    """
+    Command tree that rejects new commands while the bot shuts down.
+    """
+
+    async def interaction_check(self, interaction: Interaction) -> bool:
+        """
+        Check if the bot still accepts commands.
+
+        Args:
+            interaction (Interaction): The interaction context.
+
+        Returns:
+            bool: False if the bot is shutting down, else True.
+        """
+        lifecycle = getattr(self.client, 'lifecycle', None)
+        if lifecycle is None or not lifecycle.closing:
+            return True
+
+        await interaction.response.send_message(
+            SHUTDOWN_ANSWER,
+            ephemeral=True
+        )
+        return False
+
+
+class LifecycleManager:
+    """
+    Shuts the bot down gracefully on SIGTERM or SIGINT.
+
+    The shutdown goes through these steps in order:
+        1. New commands are rejected by `DrainingCommandTree`.
+        2. Running command handlers, component callbacks and
+        event listeners get `drain_timeout` seconds to finish,
+        the rest is cancelled.
+        3. Cogs flush their state through their `shutdown` hook,
+        the players are saved to a snapshot and the pending greetings
+        are sent, then the cogs are unloaded, stopping their
+        background tasks.
+        4. Lavalink, the IPC connection, Tortoise and the gateway
+        are closed.
+
+    Attributes:
+        bot (commands.Bot): The bot instance.
+        drain_timeout (float): Seconds to wait for the handlers.
+        closing (bool): Whether the shutdown has started.
+        _shutdown (Optional[asyncio.Future]): The shutdown sequence.
+    """
+
+    def __init__(
+        self,
+        bot: commands.Bot,
+        drain_timeout: float = SHUTDOWN_DRAIN_TIMEOUT_SECONDS
+    ) -> None:
+        """
+        Initialize the LifecycleManager.
+
+        Args:
+            bot (commands.Bot): The bot instance.
+            drain_timeout (float): Seconds to wait for the handlers.
+        """
+        self.bot = bot
+        self.drain_timeout = drain_timeout
+        self.closing = False
+        self._shutdown: Optional[asyncio.Future] = None
+
+    def install_signal_handlers(self) -> None:
+        """
+        Start the shutdown on SIGTERM and SIGINT.
+        """
+        loop = asyncio.get_running_loop()
+        for signal_number in (signal.SIGTERM, signal.SIGINT):
+            loop.add_signal_handler(signal_number, self.request_shutdown)
+
+    def request_shutdown(self) -> None:
+        """
+        Start the shutdown without waiting for it.
+        """
+        asyncio.ensure_future(self.shutdown())
+
+    async def shutdown(self) -> None:
+        """
+        Shut the bot down, or wait for the running shutdown to finish.
+        """
+        if self._shutdown is None:
+            self._shutdown = asyncio.ensure_future(self._shutdown_sequence())
+        await asyncio.shield(self._shutdown)
+
+    def in_flight(self) -> List[asyncio.Task]:
+        """
+        Get the running handler tasks.
+
+        Returns:
+            List[asyncio.Task]: Unfinished tasks of command handlers,
+            component callbacks and event listeners.
+        """
+        current = asyncio.current_task()
+        return [
+            task for task in asyncio.all_tasks()
+            if task is not current
+            and not task.done()
+            and task.get_name().startswith(DRAINED_TASK_PREFIXES)
+        ]
+
+    async def drain(self) -> None:
+        """
+        Wait for the running handlers, cancel them after the deadline.
+        """
+        tasks = self.in_flight()
+        if not tasks:
+            return
+
+        logging.info(f'[Lifecycle] Draining {len(tasks)} handler(s)')
+        _, pending = await asyncio.wait(tasks, timeout=self.drain_timeout)
+        for task in pending:
+            logging.warning(
+                f'[Lifecycle] Cancelling {task.get_name()} '
+                f'after {self.drain_timeout}s'
+            )
+            task.cancel()
+        if pending:
+            await asyncio.wait(pending, timeout=1)
+
+    async def flush(self) -> None:
+        """
+        Let the cogs flush their state and unload the extensions.
+        """
+        for cog in list(self.bot.cogs.values()):
+            if not hasattr(cog, 'shutdown'):
+                continue
+            try:
+                await cog.shutdown()
+            except Exception as error:
+                logging.exception(error)
+
+        for extension in list(self.bot.extensions):
+            try:
+                await self.bot.unload_extension(extension)
+            except commands.ExtensionError as error:
+                logging.exception(error)
+
+    async def close_connections(self) -> None:
+        """
+        Close Lavalink, the IPC connection, Tortoise and the gateway.
+        """
+        await wavelink.Pool.close()
+        wavelink_session = getattr(self.bot, 'wavelink_session', None)
+        if wavelink_session is not None:
+            await wavelink_session.close()
+
+        ipc = getattr(self.bot, 'ipc', None)
+        if ipc is not None:
+            await ipc.close()
+
+        await Tortoise.close_connections()
+        await self.bot.close()
+
+    async def _shutdown_sequence(self) -> None:
+        """
+        Run the shutdown steps in order.
+        """
+        self.closing = True
+        started = time.perf_counter()
+        logging.info('[Lifecycle] Shutting down')
+
+        for step in (self.drain, self.flush, self.close_connections):
+            try:
+                await step()
+            except (Exception, discord.DiscordException) as error:
+                logging.exception(error)
+
+        logging.info(
+            f'[Lifecycle] Shut down in {time.perf_counter() - started:.2f}s'
+        )
@@ -4,82 +4,466 @@ import asyncio
 
 import logging
 
+import resource
+
+import time
+
 from datetime import datetime
 
+from typing import Any, Dict, List, Optional
+
+import aiohttp
+
 import discord
 from discord.ext import commands
 
 import wavelink
 from wavelink import NodeStatus
 
-from tortoise import run_async, Tortoise
+from cluster.ipc import IPCClient
 
+from database.guild_config import guild_config_cache
 from database.init import init
+from database.user.db_handler import forget_users
 
-from cogs.player_cog import PlayerCog
-from cogs.user_interaction_cog import UserInteractionCog
-from cogs.admin_cog import AdminCog
+from cogs.config import extensions
+
+from lifecycle.manager import DrainingCommandTree, LifecycleManager
 
 from settings.settings import (
     BOT_TOKEN,
+    LEAN_MODE,
+    SHARD_COUNT,
+    SHARD_IDS,
+    CLUSTER_ID,
+    IPC_SECRET,
     WAVELINK_URI,
     WAVELINK_PASSWORD,
-    MESSAGE_NOT_ALLOWED_TEXT_CHANNELS_ID,
 )
 
+STARTED_AT = time.perf_counter()
+
+
+def get_rss_mib() -> float:
+    """
+    Gets the resident memory of the process.
+
+    Returns:
+        float: The current resident set size in MiB, the peak one
+        if the current size is not available.
+    """
+    try:
+        with open('/proc/self/statm') as statm:
+            pages = int(statm.read().split()[1])
+        return pages * resource.getpagesize() / 2 ** 20
+    except (OSError, IndexError, ValueError):
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 2 ** 10
+
+
+def get_lean_intents() -> discord.Intents:
+    """
+    Builds the minimal intents the bot works with.
+
+    Returns:
+        discord.Intents: Guilds and voice states for the player,
+        members for the role logic, guild messages and message content
+        for the restricted channels filter and the message locator.
+    """
+    intents = discord.Intents.none()
+    intents.guilds = True
+    intents.voice_states = True
+    intents.members = True
+    intents.guild_messages = True
+    intents.message_content = True
+    return intents
+
+
+def get_lean_member_cache_flags() -> discord.MemberCacheFlags:
+    """
+    Builds the member cache flags the lean mode relies on.
+
+    Note:
+        Nothing is cached at startup since the guilds aren't chunked.
+        `voice` keeps the members in voice channels, Wavelink counts
+        them through `VoiceChannel.members` to leave empty channels.
+        `joined` keeps the members who join while online, so a guild
+        chunked on first use by `ensure_members_cached` stays complete
+        for the eligible members index of /show_bots_waifu
+        instead of being chunked again after every join.
+        Other cogs read members from interactions, events
+        or the REST API and need no cached members.
+
+    Returns:
+        discord.MemberCacheFlags: The voice and joined flags only.
+    """
+    flags = discord.MemberCacheFlags.none()
+    flags.voice = True
+    flags.joined = True
+    return flags
+
+
+def parse_shard_ids(shard_ids: Optional[str]) -> Optional[List[int]]:
+    """
+    Parses the comma separated shard IDs of this process.
+
+    Args:
+        shard_ids (Optional[str]): Comma separated shard IDs.
+
+    Returns:
+        Optional[List[int]]: The shard IDs, None to run all shards.
+    """
+    if not shard_ids:
+        return None
+
+    return [
+        int(shard_id)
+        for shard_id in shard_ids.split(',')
+        if shard_id.strip()
+    ]
+
 
-class DiscordBot(commands.Bot):
+class DiscordBot(commands.AutoShardedBot):
     """
-    Custom Discord bot class inheriting from `commands.Bot`.
+    Custom Discord bot class inheriting from `commands.AutoShardedBot`.
+
+    By default the process runs every shard Discord recommends.
+    When started by `cluster.launcher`, it runs only its shard range
+    and talks to the other clusters through the launcher's IPC hub.
 
     Attributes:
         intents (discord.Intents): The intents for the bot's functionality.
+        lean (bool): Whether the bot runs with the minimal intents,
+        caches only members in voice channels or joined while online
+        and chunks guild members on first use instead of at startup.
+        ipc (Optional[IPCClient]): Connection to the other clusters,
+        None if the bot runs in a single process.
+        handed_off_states (Dict[str, Dict[str, Any]]): Live state
+        of the cogs being reloaded keyed by cog name, taken over
+        by the new cogs in `cog_load`.
+        lifecycle (LifecycleManager): Graceful shutdown of the bot.
+        wavelink_session (Optional[aiohttp.ClientSession]): HTTP session
+        of the Wavelink node, closed by the lifecycle manager.
 
     Methods:
         connect_nodes(): Connects to the Wavelink nodes.
-        setup_hook(): Sets up cogs and syncs commands.
+        setup_hook(): Initializes the database, sets up cogs
+        and syncs commands.
         on_ready(): Event handler when the bot is ready.
         on_message(message): Event handler for incoming messages.
-        close_connections(): Closes connections and resources
-        when the bot is shutting down.
+        get_metrics(): Gets the metrics of this process.
+        handle_metrics_call(payload): Answers a metrics call
+        of another cluster.
+        handle_reload_guild_config_call(payload): Reloads a guild config
+        edited by another cluster.
+        update_guild_config(guild_id, **fields): Stores a guild config
+        and refreshes it in every cluster.
+        handle_forget_users_call(payload): Drops the cached users
+        changed by another cluster.
+        forget_users_everywhere(discord_ids): Drops the cached users
+        in every cluster.
+        collect_metrics(): Gets the metrics of every cluster.
+        reload_cog(extension): Reloads a cog extension in place.
+        reload_cog_everywhere(extension): Reloads a cog extension
+        in every cluster.
     """
 
-    def __init__(self):
+    def __init__(self, lean: bool = LEAN_MODE):
+        self.lean = lean
+        self.ipc = IPCClient(cluster_id=CLUSTER_ID) if IPC_SECRET else None
+        self.handed_off_states: Dict[str, Dict[str, Any]] = {}
+        self.lifecycle = LifecycleManager(bot=self)
+        self.wavelink_session: Optional[aiohttp.ClientSession] = None
+        sharding = {
+            'shard_count': SHARD_COUNT,
+            'shard_ids': parse_shard_ids(SHARD_IDS),
+        }
+
+        if lean:
+            intents = get_lean_intents()
+            super().__init__(
+                intents=intents,
+                command_prefix='!',
+                member_cache_flags=get_lean_member_cache_flags(),
+                chunk_guilds_at_startup=False,
+                tree_cls=DrainingCommandTree,
+                **sharding
+            )
+            return
+
         intents = discord.Intents.all()
         intents.voice_states = True
         intents.message_content = True
         intents.guilds = True
 
-        super().__init__(intents=intents, command_prefix='!')
+        super().__init__(
+            intents=intents,
+            command_prefix='!',
+            tree_cls=DrainingCommandTree,
+            **sharding
+        )
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """
+        Gets the metrics of this process.
+
+        Returns:
+            Dict[str, Any]: Shards, guilds, members, voice players,
+            player commands waiting and the longest wait of one,
+            gateway latency and resident memory.
+        """
+        player_cog = self.get_cog('PlayerCog')
+        player_stats = (
+            player_cog.actors.stats() if player_cog
+            else {'pending': 0, 'max_wait_ms': 0.0}
+        )
+        return {
+            'shard_ids': sorted(self.shards),
+            'guilds': len(self.guilds),
+            'members': sum(
+                guild.member_count or 0 for guild in self.guilds
+            ),
+            'players': len(self.voice_clients),
+            'player_commands_pending': player_stats['pending'],
+            'player_wait_ms': player_stats['max_wait_ms'],
+            'latency_ms': round(self.latency * 1000, 1),
+            'rss_mib': round(get_rss_mib(), 1),
+        }
+
+    async def handle_metrics_call(
+        self,
+        payload: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """
+        Answers a metrics call of another cluster.
+
+        Args:
+            payload (Dict[str, Any]): The call arguments, unused.
+
+        Returns:
+            Dict[str, Any]: The metrics of this process.
+        """
+        return self.get_metrics()
+
+    async def handle_reload_guild_config_call(
+        self,
+        payload: Dict[str, Any]
+    ) -> None:
+        """
+        Reloads a guild config edited by another cluster.
+
+        Args:
+            payload (Dict[str, Any]): The call arguments
+            with the guild ID.
+        """
+        await guild_config_cache.reload([payload['guild_id']])
+
+    async def update_guild_config(
+        self,
+        guild_id: int,
+        **fields: Any
+    ) -> None:
+        """
+        Stores a guild config and refreshes it in every cluster.
+
+        Args:
+            guild_id (int): ID of the guild.
+            **fields (Any): Values of the GuildConfig fields,
+            None resets a field to the default.
+        """
+        await guild_config_cache.update(guild_id, **fields)
+        if self.ipc:
+            await self.ipc.request(
+                'reload_guild_config',
+                {'guild_id': guild_id}
+            )
+
+    async def handle_forget_users_call(
+        self,
+        payload: Dict[str, Any]
+    ) -> None:
+        """
+        Drops the cached users changed by another cluster.
+
+        Args:
+            payload (Dict[str, Any]): The call arguments
+            with the Discord IDs of the users.
+        """
+        forget_users(payload['discord_ids'])
+
+    async def forget_users_everywhere(self, discord_ids: List[int]) -> None:
+        """
+        Drops the cached users in every cluster after they were
+        created, changed or removed.
+
+        Note:
+            The change is already stored, so a cluster that can't be
+            reached is only logged, its cached users stay stale
+            until evicted.
+
+        Args:
+            discord_ids (List[int]): Discord IDs of the users.
+        """
+        if self.ipc is None or not discord_ids:
+            return
+
+        try:
+            await self.ipc.request(
+                'forget_users',
+                {'discord_ids': list(discord_ids)}
+            )
+        except (ConnectionError, asyncio.TimeoutError) as error:
+            logging.warning(f'[IPC] Could not forget users: {error!r}')
+
+    async def reload_cog(self, extension: str) -> float:
+        """
+        Reloads a cog extension in place.
+
+        Note:
+            Only the extension module is reloaded, the helper modules
+            it imports are not, so the handed off state stays
+            compatible with the new cogs. If the new module fails
+            to load, discord.py restores the old one, which takes
+            the state back.
+
+        Args:
+            extension (str): The extension to reload.
+
+        Returns:
+            float: The reload time in milliseconds.
+
+        Raises:
+            discord.ext.commands.ExtensionError: If the reload failed.
+        """
+        started = time.perf_counter()
+        for cog in list(self.cogs.values()):
+            if cog.__module__ == extension and hasattr(cog, 'export_state'):
+                self.handed_off_states[cog.qualified_name] = (
+                    cog.export_state()
+                )
+        try:
+            await self.reload_extension(extension)
+        finally:
+            self.handed_off_states.clear()
+
+        elapsed = round((time.perf_counter() - started) * 1000, 1)
+        logging.info(f'[Reload] Reloaded {extension} in {elapsed}ms')
+        return elapsed
+
+    async def handle_reload_cog_call(
+        self,
+        payload: Dict[str, Any]
+    ) -> float:
+        """
+        Reloads a cog extension on request of another cluster.
+
+        Args:
+            payload (Dict[str, Any]): The call arguments
+            with the extension name.
+
+        Returns:
+            float: The reload time in milliseconds.
+        """
+        return await self.reload_cog(payload['extension'])
+
+    async def reload_cog_everywhere(
+        self,
+        extension: str
+    ) -> Dict[int, Dict[str, Any]]:
+        """
+        Reloads a cog extension in every cluster.
+
+        Args:
+            extension (str): The extension to reload.
+
+        Returns:
+            Dict[int, Dict[str, Any]]: Replies keyed by cluster ID,
+            each with either the reload time or an error.
+        """
+        if self.ipc is None:
+            try:
+                return {CLUSTER_ID: {'data': await self.reload_cog(extension)}}
+            except commands.ExtensionError as error:
+                logging.exception(error)
+                return {CLUSTER_ID: {'error': repr(error)}}
+
+        return await self.ipc.request('reload_cog', {'extension': extension})
+
+    async def collect_metrics(self) -> Dict[int, Dict[str, Any]]:
+        """
+        Gets the metrics of every cluster.
+
+        Returns:
+            Dict[int, Dict[str, Any]]: Replies keyed by cluster ID,
+            each with either data or an error.
+        """
+        if self.ipc is None:
+            return {CLUSTER_ID: {'data': self.get_metrics()}}
+
+        return await self.ipc.request('metrics')
 
     async def connect_nodes(self) -> None:
         """
         Connects to Wavelink nodes.
+
+        Note:
+            The node uses an HTTP session owned by the bot,
+            so the lifecycle manager can close it on shutdown.
+            If the node can't connect, the bot shuts down.
         """
         await self.wait_until_ready()
 
+        if self.wavelink_session is None or self.wavelink_session.closed:
+            self.wavelink_session = aiohttp.ClientSession()
+
         node: wavelink.Node = wavelink.Node(
             uri=WAVELINK_URI,
             password=WAVELINK_PASSWORD,
+            session=self.wavelink_session,
             retries=5
         )
         await wavelink.Pool.connect(client=self, nodes=[node])
 
         if node.status == NodeStatus.DISCONNECTED:
             logging.error('An error occurred while connecting nodes')
-            await node._session.close()
-            await self.close()
+            self.lifecycle.request_shutdown()
 
     async def setup_hook(self) -> None:
         """
-        Sets up cogs and syncs commands.
+        Initializes the database, loads the cog extensions
+        and syncs commands.
+
+        Note:
+            The database is initialized here so the ORM connections
+            live on the bot's own event loop. Its schema version
+            is only checked, the migrations are applied once
+            by the entrypoint before the bot starts.
+            The guild configs are loaded into memory once.
+            In a cluster, the process connects to the IPC hub
+            and only the first cluster syncs the commands.
 
         Raises:
+            SchemaVersionError: If the database is behind
+            the shipped migrations.
             Exception: If an error occurs during command syncing.
         """
-        await self.add_cog(PlayerCog(bot=self))
-        await self.add_cog(UserInteractionCog(bot=self))
-        await self.add_cog(AdminCog(bot=self))
+        await init()
+        await guild_config_cache.load()
+
+        if self.ipc:
+            self.ipc.register('metrics', self.handle_metrics_call)
+            self.ipc.register(
+                'reload_guild_config',
+                self.handle_reload_guild_config_call
+            )
+            self.ipc.register('reload_cog', self.handle_reload_cog_call)
+            self.ipc.register('forget_users', self.handle_forget_users_call)
+            await self.ipc.connect()
+
+        for extension in extensions:
+            await self.load_extension(extension)
+
+        if CLUSTER_ID != 0:
+            return
 
         try:
             synced = await self.tree.sync()
@@ -92,6 +476,13 @@ class DiscordBot(commands.Bot):
         Event handler when the bot is ready.
         """
         logging.info(f'Logged in as {self.user}')
+        logging.info(
+            f'[Startup] Ready in {time.perf_counter() - STARTED_AT:.1f}s, '
+            f'RSS {get_rss_mib():.1f} MiB, '
+            f'{sum(len(guild.members) for guild in self.guilds)} '
+            f'cached members, lean mode {"on" if self.lean else "off"}, '
+            f'shards {sorted(self.shards)} of {self.shard_count}'
+        )
 
         await self.connect_nodes()
 
@@ -109,42 +500,56 @@ class DiscordBot(commands.Bot):
             message (discord.Message): The incoming message.
 
         Note:
-        Deletes the message if it's from a restricted
-        channel and not sent by a bot.
+        Deletes the message if it's from a channel restricted
+        in the guild's config and not sent by a bot.
         """
-        if message.channel.id in [
-            int(channel_id)
-            for channel_id in MESSAGE_NOT_ALLOWED_TEXT_CHANNELS_ID.split(',')
-        ] and not message.author.bot:
-            await message.delete()
+        if not message.guild or message.author.bot:
+            return
 
-    async def close_connections(self) -> None:
-        """
-        Closes connections and resources when the bot is shutting down.
-        """
-        try:
-            node: wavelink.Node = wavelink.Pool.get_node()
-            await node._session.close()
-        except wavelink.exceptions.InvalidNodeException:
-            logging.error('No Nodes established')
-        await Tortoise.close_connections()
-        await self.close()
+        restricted_channels_id = guild_config_cache.get(
+            message.guild.id
+        ).restricted_channels_id
+        if message.channel.id in restricted_channels_id:
+            await message.delete()
 
 
 bot = DiscordBot()
 
 
+async def run_bot() -> None:
+    """
+    Runs the bot until it is stopped, then shuts it down gracefully.
+
+    Note:
+        SIGTERM and SIGINT start the lifecycle manager's shutdown,
+        which drains the running handlers, flushes the cogs' state
+        and closes the connections in order.
+    """
+    async with bot:
+        bot.lifecycle.install_signal_handlers()
+        try:
+            await bot.start(BOT_TOKEN)
+        finally:
+            await bot.lifecycle.shutdown()
+
+
 def main() -> None:
     """
     Main function to start the bot.
 
     Note:
-        Initializes logging, runs database initialization, and starts the bot.
+        Initializes logging and starts the bot.
+        The database is initialized in `DiscordBot.setup_hook`.
     """
     if not os.path.exists('logs'):
         os.makedirs('logs')
 
     log_file_name = datetime.now().strftime('log_%Y_%m_%d_%H_%M.log')
+    if IPC_SECRET:
+        log_file_name = log_file_name.replace(
+            '.log',
+            f'_cluster_{CLUSTER_ID}.log'
+        )
 
     logging.basicConfig(
         level=logging.INFO,
@@ -156,12 +561,11 @@ def main() -> None:
         ]
     )
 
-    run_async(init())
-    bot.run(BOT_TOKEN)
+    try:
+        asyncio.run(run_bot())
+    finally:
+        logging.shutdown()
 
 
 if __name__ == '__main__':
-    try:
-        main()
-    finally:
-        asyncio.run(bot.close_connections())
+    main()
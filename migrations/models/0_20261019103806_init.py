@@ -0,0 +1,99 @@
+from tortoise import BaseDBAsyncClient
+
+CREATE_SQLITE_TABLES = """
+CREATE TABLE IF NOT EXISTS "managedrole" (
+    "id" INTEGER PRIMARY KEY AUTOINCREMENT NOT NULL,
+    "discord_id" BIGINT NOT NULL,
+    "guild_id" BIGINT NOT NULL,
+    "role_id" BIGINT NOT NULL UNIQUE
+) /* Model class representing a role created by the bot for a user. */;
+CREATE INDEX IF NOT EXISTS "idx_managedrole_discord_cf11c0"
+ON "managedrole" ("discord_id");
+CREATE TABLE IF NOT EXISTS "user" (
+    "id" INTEGER PRIMARY KEY AUTOINCREMENT NOT NULL,
+    "discord_id" INT NOT NULL UNIQUE
+) /* Model class representing a Discord user. */;
+CREATE TABLE IF NOT EXISTS "waifu" (
+    "id" INTEGER PRIMARY KEY AUTOINCREMENT NOT NULL,
+    "shikimori_id" INT NOT NULL,
+    "waifu_name" VARCHAR(255) NOT NULL,
+    "waifu_name_rus" VARCHAR(255) NOT NULL,
+    "image" VARCHAR(255) NOT NULL,
+    "url" VARCHAR(255) NOT NULL,
+    "alt_name" TEXT NOT NULL,
+    "japanese_name" VARCHAR(255) NOT NULL
+) /* Model class representing a waifu character. */;
+CREATE TABLE IF NOT EXISTS "userwaifulink" (
+    "id" INTEGER PRIMARY KEY AUTOINCREMENT NOT NULL,
+    "true_love" INT NOT NULL  DEFAULT 0,
+    "user_id" INT NOT NULL REFERENCES "user" ("id") ON DELETE CASCADE,
+    "waifu_id" INT NOT NULL REFERENCES "waifu" ("id") ON DELETE CASCADE,
+    CONSTRAINT "uid_userwaifuli_user_id_e4a4f1" UNIQUE ("user_id", "waifu_id")
+) /* Model class representing a link between a user and a waifu. */;
+CREATE TABLE IF NOT EXISTS "aerich" (
+    "id" INTEGER PRIMARY KEY AUTOINCREMENT NOT NULL,
+    "version" VARCHAR(255) NOT NULL,
+    "app" VARCHAR(100) NOT NULL,
+    "content" JSON NOT NULL
+);"""
+
+CREATE_POSTGRES_TABLES = """
+CREATE TABLE IF NOT EXISTS "managedrole" (
+    "id" SERIAL NOT NULL PRIMARY KEY,
+    "discord_id" BIGINT NOT NULL,
+    "guild_id" BIGINT NOT NULL,
+    "role_id" BIGINT NOT NULL UNIQUE
+);
+CREATE INDEX IF NOT EXISTS "idx_managedrole_discord_cf11c0"
+ON "managedrole" ("discord_id");
+COMMENT ON TABLE "managedrole"
+IS 'Model class representing a role created by the bot for a user.';
+CREATE TABLE IF NOT EXISTS "user" (
+    "id" SERIAL NOT NULL PRIMARY KEY,
+    "discord_id" INT NOT NULL UNIQUE
+);
+COMMENT ON TABLE "user" IS 'Model class representing a Discord user.';
+CREATE TABLE IF NOT EXISTS "waifu" (
+    "id" SERIAL NOT NULL PRIMARY KEY,
+    "shikimori_id" INT NOT NULL,
+    "waifu_name" VARCHAR(255) NOT NULL,
+    "waifu_name_rus" VARCHAR(255) NOT NULL,
+    "image" VARCHAR(255) NOT NULL,
+    "url" VARCHAR(255) NOT NULL,
+    "alt_name" TEXT NOT NULL,
+    "japanese_name" VARCHAR(255) NOT NULL
+);
+COMMENT ON TABLE "waifu" IS 'Model class representing a waifu character.';
+CREATE TABLE IF NOT EXISTS "userwaifulink" (
+    "id" SERIAL NOT NULL PRIMARY KEY,
+    "true_love" BOOL NOT NULL DEFAULT FALSE,
+    "user_id" INT NOT NULL REFERENCES "user" ("id") ON DELETE CASCADE,
+    "waifu_id" INT NOT NULL REFERENCES "waifu" ("id") ON DELETE CASCADE,
+    CONSTRAINT "uid_userwaifuli_user_id_e4a4f1" UNIQUE ("user_id", "waifu_id")
+);
+COMMENT ON TABLE "userwaifulink"
+IS 'Model class representing a link between a user and a waifu.';
+CREATE TABLE IF NOT EXISTS "aerich" (
+    "id" SERIAL NOT NULL PRIMARY KEY,
+    "version" VARCHAR(255) NOT NULL,
+    "app" VARCHAR(100) NOT NULL,
+    "content" JSONB NOT NULL
+);"""
+
+
+async def upgrade(db: BaseDBAsyncClient) -> str:
+    """
+    Creates the initial schema.
+
+    Discord IDs start as INT and the lookup indexes are missing,
+    the next migration widens and adds them on both dialects.
+    """
+    if db.capabilities.dialect == 'postgres':
+        return CREATE_POSTGRES_TABLES
+
+    return CREATE_SQLITE_TABLES
+
+
+async def downgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        """
@@ -0,0 +1,103 @@
+from tortoise import BaseDBAsyncClient
+from tortoise.backends.base.client import BaseTransactionWrapper
+
+# Applied outside a transaction on Postgres by `database.init.migrate`,
+# so the indexes are built concurrently.
+RUN_IN_TRANSACTION = False
+
+# Links pointing to a duplicated waifu are moved to the oldest waifu
+# with the same shikimori_id. If a user ends up linked twice to the same
+# waifu, the true love link (or the oldest one) is kept.
+DEDUPLICATE_WAIFUS = """
+DELETE FROM "userwaifulink" WHERE "id" IN (
+    SELECT "link"."id" FROM "userwaifulink" "link"
+    JOIN "waifu" ON "waifu"."id" = "link"."waifu_id"
+    WHERE EXISTS (
+        SELECT 1 FROM "userwaifulink" "other"
+        JOIN "waifu" "other_waifu" ON "other_waifu"."id" = "other"."waifu_id"
+        WHERE "other"."user_id" = "link"."user_id"
+        AND "other_waifu"."shikimori_id" = "waifu"."shikimori_id"
+        AND (
+            "other"."true_love" > "link"."true_love"
+            OR (
+                "other"."true_love" = "link"."true_love"
+                AND "other"."id" < "link"."id"
+            )
+        )
+    )
+);
+UPDATE "userwaifulink" SET "waifu_id" = (
+    SELECT MIN("canonical"."id") FROM "waifu" "canonical"
+    WHERE "canonical"."shikimori_id" = (
+        SELECT "waifu"."shikimori_id" FROM "waifu"
+        WHERE "waifu"."id" = "userwaifulink"."waifu_id"
+    )
+)
+WHERE "waifu_id" NOT IN (
+    SELECT MIN("id") FROM "waifu" GROUP BY "shikimori_id"
+);
+DELETE FROM "waifu" WHERE "id" <> (
+    SELECT MIN("canonical"."id") FROM "waifu" "canonical"
+    WHERE "canonical"."shikimori_id" = "waifu"."shikimori_id"
+);"""
+
+CREATE_INDEXES = [
+    'CREATE UNIQUE INDEX {concurrently}IF NOT EXISTS '
+    '"uid_waifu_shikimo_65ceda" ON "waifu" ("shikimori_id");',
+    'CREATE INDEX {concurrently}IF NOT EXISTS '
+    '"idx_waifu_url_d1fac2" ON "waifu" ("url");',
+    'CREATE INDEX {concurrently}IF NOT EXISTS '
+    '"idx_userwaifuli_waifu_i_e35972" ON "userwaifulink" ("waifu_id");',
+]
+
+WIDEN_DISCORD_ID = """
+ALTER TABLE "user" ALTER COLUMN "discord_id" TYPE BIGINT;"""
+
+NARROW_DISCORD_ID = """
+ALTER TABLE "user" ALTER COLUMN "discord_id" TYPE INT;"""
+
+DROP_INDEXES = """
+DROP INDEX IF EXISTS "idx_userwaifuli_waifu_i_e35972";
+DROP INDEX IF EXISTS "idx_waifu_url_d1fac2";
+DROP INDEX IF EXISTS "uid_waifu_shikimo_65ceda";"""
+
+
+async def upgrade(db: BaseDBAsyncClient) -> str:
+    """
+    Deduplicates waifus, indexes the lookup columns
+    and widens Discord IDs to BIGINT.
+
+    SQLite already stores integers as 64-bit, so only Postgres
+    needs the column type change. When run outside a transaction
+    on Postgres, the indexes are built concurrently without
+    blocking writes.
+    """
+    postgres = db.capabilities.dialect == 'postgres'
+
+    if postgres and not isinstance(db, BaseTransactionWrapper):
+        await db.execute_script(DEDUPLICATE_WAIFUS)
+        for statement in CREATE_INDEXES:
+            await db.execute_script(
+                statement.format(concurrently='CONCURRENTLY ')
+            )
+        return WIDEN_DISCORD_ID
+
+    script = DEDUPLICATE_WAIFUS + ''.join(
+        f'\n{statement.format(concurrently="")}'
+        for statement in CREATE_INDEXES
+    )
+    if postgres:
+        script += WIDEN_DISCORD_ID
+
+    return script
+
+
+async def downgrade(db: BaseDBAsyncClient) -> str:
+    """
+    Drops the indexes and narrows Discord IDs back to INT.
+    Removed duplicate waifus are not restored.
+    """
+    if db.capabilities.dialect == 'postgres':
+        return DROP_INDEXES + NARROW_DISCORD_ID
+
+    return DROP_INDEXES
@@ -0,0 +1,47 @@
+from tortoise import BaseDBAsyncClient
+from tortoise.backends.base.client import BaseTransactionWrapper
+
+# If a user already has several true loves, the oldest link keeps it.
+DEDUPLICATE_TRUE_LOVES = """
+UPDATE "userwaifulink" SET "true_love" = FALSE
+WHERE "true_love" AND "id" NOT IN (
+    SELECT MIN("id") FROM "userwaifulink"
+    WHERE "true_love" GROUP BY "user_id"
+);"""
+
+CREATE_INDEX = (
+    'CREATE UNIQUE INDEX {concurrently}IF NOT EXISTS '
+    '"uid_userwaifuli_user_id_true_love" ON "userwaifulink" ("user_id") '
+    'WHERE "true_love";'
+)
+
+DROP_INDEX = """
+DROP INDEX IF EXISTS "uid_userwaifuli_user_id_true_love";"""
+
+
+async def upgrade(db: BaseDBAsyncClient) -> str:
+    """
+    Keeps a single true love per user and adds a partial unique index
+    guaranteeing it.
+
+    When run with `aerich upgrade --in-transaction False` on Postgres,
+    the index is built concurrently without blocking writes.
+    """
+    if (
+        db.capabilities.dialect == 'postgres'
+        and not isinstance(db, BaseTransactionWrapper)
+    ):
+        await db.execute_script(DEDUPLICATE_TRUE_LOVES)
+        await db.execute_script(
+            CREATE_INDEX.format(concurrently='CONCURRENTLY ')
+        )
+        return ''
+
+    return DEDUPLICATE_TRUE_LOVES + f'\n{CREATE_INDEX.format(concurrently="")}'
+
+
+async def downgrade(db: BaseDBAsyncClient) -> str:
+    """
+    Drops the partial unique index.
+    """
+    return DROP_INDEX
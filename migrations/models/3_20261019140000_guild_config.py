@@ -0,0 +1,43 @@
+from tortoise import BaseDBAsyncClient
+
+CREATE_SQLITE_TABLE = """
+CREATE TABLE IF NOT EXISTS "guildconfig" (
+    "id" INTEGER PRIMARY KEY AUTOINCREMENT NOT NULL,
+    "guild_id" BIGINT NOT NULL UNIQUE,
+    "voice_categories_id" JSON,
+    "text_categories_id" JSON,
+    "greetings_channel_id" BIGINT,
+    "restricted_channels_id" JSON
+) /* Model class representing the settings of a guild. */;"""
+
+CREATE_POSTGRES_TABLE = """
+CREATE TABLE IF NOT EXISTS "guildconfig" (
+    "id" SERIAL NOT NULL PRIMARY KEY,
+    "guild_id" BIGINT NOT NULL UNIQUE,
+    "voice_categories_id" JSONB,
+    "text_categories_id" JSONB,
+    "greetings_channel_id" BIGINT,
+    "restricted_channels_id" JSONB
+);
+COMMENT ON TABLE "guildconfig"
+IS 'Model class representing the settings of a guild.';"""
+
+DROP_TABLE = """
+DROP TABLE IF EXISTS "guildconfig";"""
+
+
+async def upgrade(db: BaseDBAsyncClient) -> str:
+    """
+    Creates the per-guild settings table.
+    """
+    if db.capabilities.dialect == 'postgres':
+        return CREATE_POSTGRES_TABLE
+
+    return CREATE_SQLITE_TABLE
+
+
+async def downgrade(db: BaseDBAsyncClient) -> str:
+    """
+    Drops the per-guild settings table.
+    """
+    return DROP_TABLE
@@ -0,0 +1,35 @@
+from tortoise import BaseDBAsyncClient
+from tortoise.backends.base.client import BaseTransactionWrapper
+
+# Applied outside a transaction on Postgres by `database.init.migrate`,
+# so the index is built concurrently.
+RUN_IN_TRANSACTION = False
+
+CREATE_INDEX = (
+    'CREATE INDEX {concurrently}IF NOT EXISTS '
+    '"idx_managedrole_guild_i_407d66" ON "managedrole" ("guild_id");'
+)
+
+DROP_INDEX = """
+DROP INDEX IF EXISTS "idx_managedrole_guild_i_407d66";"""
+
+
+async def upgrade(db: BaseDBAsyncClient) -> str:
+    """
+    Indexes the guild of the managed roles,
+    which every reconciliation filters on.
+    """
+    if (
+        db.capabilities.dialect == 'postgres'
+        and not isinstance(db, BaseTransactionWrapper)
+    ):
+        return CREATE_INDEX.format(concurrently='CONCURRENTLY ')
+
+    return CREATE_INDEX.format(concurrently='')
+
+
+async def downgrade(db: BaseDBAsyncClient) -> str:
+    """
+    Drops the guild index of the managed roles.
+    """
+    return DROP_INDEX
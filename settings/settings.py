@@ -8,11 +8,39 @@ if os.path.exists(dotenv_path):
     load_dotenv(dotenv_path)
 
 BOT_TOKEN = os.environ.get('BOT_TOKEN')
+LEAN_MODE = os.environ.get('LEAN_MODE', 'False').lower() in ('1', 'true')
+
+SHARD_COUNT = (
+    int(os.environ['SHARD_COUNT']) if os.environ.get('SHARD_COUNT') else None
+)
+SHARD_IDS = os.environ.get('SHARD_IDS')
+CLUSTER_ID = int(os.environ.get('CLUSTER_ID', 0))
+CLUSTER_COUNT = int(os.environ.get('CLUSTER_COUNT', 1))
+IPC_HOST = os.environ.get('IPC_HOST', '127.0.0.1')
+IPC_PORT = int(os.environ.get('IPC_PORT', 20000))
+IPC_SECRET = os.environ.get('IPC_SECRET')
+IPC_TIMEOUT_SECONDS = float(os.environ.get('IPC_TIMEOUT_SECONDS', 5))
+
+SHUTDOWN_DRAIN_TIMEOUT_SECONDS = float(
+    os.environ.get('SHUTDOWN_DRAIN_TIMEOUT_SECONDS', 10)
+)
+PLAYER_SNAPSHOT_PATH = os.environ.get(
+    'PLAYER_SNAPSHOT_PATH',
+    'data/player_snapshot_{cluster_id}.json'
+)
+SEEK_COALESCE_WINDOW_SECONDS = float(
+    os.environ.get('SEEK_COALESCE_WINDOW_SECONDS', 0.3)
+)
 
 WAVELINK_URI = os.environ.get('WAVELINK_URI')
 WAVELINK_PASSWORD = os.environ.get('WAVELINK_PASSWORD')
 
 DATABASE_URL = os.environ.get('DATABASE_URL')
+SQLITE_SYNCHRONOUS = os.environ.get('SQLITE_SYNCHRONOUS', 'NORMAL')
+SQLITE_CACHE_SIZE = int(os.environ.get('SQLITE_CACHE_SIZE', -65536))
+SQLITE_MMAP_SIZE = int(os.environ.get('SQLITE_MMAP_SIZE', 268435456))
+DATABASE_POOL_MIN_SIZE = int(os.environ.get('DATABASE_POOL_MIN_SIZE', 1))
+DATABASE_POOL_MAX_SIZE = int(os.environ.get('DATABASE_POOL_MAX_SIZE', 10))
 
 DISCORD_VOICE_CATEGORIES_ID = os.environ.get('DISCORD_VOICE_CATEGORIES_ID')
 DISCORD_TEXT_CATEGORIES_ID = os.environ.get('DISCORD_TEXT_CATEGORIES_ID')
@@ -20,6 +48,47 @@ MESSAGE_NOT_ALLOWED_TEXT_CHANNELS_ID = os.environ.get(
     'MESSAGE_NOT_ALLOWED_TEXT_CHANNELS_ID'
 )
 GREETINGS_CHANNEL = os.environ.get('GREETINGS_CHANNEL')
+GREETINGS_BURST_WINDOW_SECONDS = float(
+    os.environ.get('GREETINGS_BURST_WINDOW_SECONDS', 3)
+)
+GREETINGS_BURST_MAX_MEMBERS = int(
+    os.environ.get('GREETINGS_BURST_MAX_MEMBERS', 20)
+)
+
+ROLE_PROVISIONING_CONCURRENCY = int(
+    os.environ.get('ROLE_PROVISIONING_CONCURRENCY', 5)
+)
+ROLE_PROVISIONING_RETRIES = int(
+    os.environ.get('ROLE_PROVISIONING_RETRIES', 3)
+)
+
+MEMBERS_RECONCILIATION_INTERVAL_HOURS = float(
+    os.environ.get('MEMBERS_RECONCILIATION_INTERVAL_HOURS', 6)
+)
+MEMBERS_RECONCILIATION_BATCH_SIZE = int(
+    os.environ.get('MEMBERS_RECONCILIATION_BATCH_SIZE', 500)
+)
+MEMBERS_RECONCILIATION_TIMEOUT_SECONDS = float(
+    os.environ.get('MEMBERS_RECONCILIATION_TIMEOUT_SECONDS', 300)
+)
+
+WAIFU_RENDER_CACHE_SIZE = int(os.environ.get('WAIFU_RENDER_CACHE_SIZE', 1024))
+USER_CACHE_SIZE = int(os.environ.get('USER_CACHE_SIZE', 4096))
+
+MESSAGE_LOCATOR_CACHE_SIZE = int(
+    os.environ.get('MESSAGE_LOCATOR_CACHE_SIZE', 10000)
+)
+MESSAGE_LOCATOR_CONCURRENCY = int(
+    os.environ.get('MESSAGE_LOCATOR_CONCURRENCY', 10)
+)
+BROADCAST_CONCURRENCY = int(os.environ.get('BROADCAST_CONCURRENCY', 5))
+
+REJECTION_DM_WINDOW_SECONDS = float(
+    os.environ.get('REJECTION_DM_WINDOW_SECONDS', 60)
+)
+REJECTION_DM_CACHE_SIZE = int(
+    os.environ.get('REJECTION_DM_CACHE_SIZE', 10000)
+)
 
 if __name__ == '__main__':
     pass